@@ -1,19 +1,145 @@
-from flask import Flask, render_template, request
 import os
+import time
+from flask import Flask, render_template, request, jsonify, g, Response
 import numpy as np
-import pandas as pd
+from src.datascienceproject import logger
+from src.datascienceproject.config.configuration import ConfigurationManager
 from src.datascienceproject.pipeline.pipeline_prediction import PredictionPipeline
+from src.datascienceproject.pipeline.training_jobs import TrainingJobManager
+from src.datascienceproject.utils.logging_setup import configure_logging, logging_stats
+from src.datascienceproject.utils.instrumentation import (PREDICTION_CPU, PREDICTION_LATENCY, PREDICTION_ROWS,
+                                                          REQUEST_LATENCY, current_rss_mb, peak_rss_mb,
+                                                          render_prometheus)
+from src.datascienceproject.utils.shared_metrics import SharedMetrics
 
 app = Flask(__name__)
 
+config_manager = ConfigurationManager()
+configure_logging(config_manager.config.get("logging"))
+serving_config = config_manager.get_serving_config()
+
+# Shared by all requests; the model is loaded lazily and hot-reloaded when retrained
+prediction_pipeline = PredictionPipeline(model_path=serving_config.model_path, scorer_path=serving_config.scorer_path,
+                                         mmap_model=serving_config.mmap_model)
+if serving_config.micro_batching:
+    prediction_pipeline.enable_micro_batching(max_batch_size=serving_config.max_batch_size,
+                                              max_wait_us=serving_config.max_wait_us)
+cache_config = serving_config.prediction_cache
+if cache_config.get("enabled"):
+    prediction_pipeline.enable_prediction_cache(max_entries=cache_config.get("max_entries", 100_000),
+                                                ttl_seconds=cache_config.get("ttl_seconds"),
+                                                decimals=cache_config.get("decimals"))
+
+# Retraining runs in a separate worker process, see /train
+training_jobs = TrainingJobManager(serving_config.training_jobs_dir)
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+    if shared_metrics is not None:
+        # Starts the snapshot thread in each forked worker
+        shared_metrics.start()
+
+@app.after_request
+def record_latency(response):
+    # Label by route pattern, not raw path, to keep the number of series bounded
+    endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    REQUEST_LATENCY.observe(time.perf_counter() - g.request_start, request.method, endpoint, response.status_code)
+    return response
+
+def collect_metrics() -> tuple:
+    """Metrics kept outside the Histogram/Counter objects, as (gauges, counters): name -> (help text, value)."""
+    cache = prediction_pipeline.model_cache.stats()
+    gauges = {
+        "process_resident_memory_mb": ("Resident set size of the web process", current_rss_mb()),
+        "process_peak_resident_memory_mb": ("Peak resident set size of the web process", peak_rss_mb()),
+    }
+    counters = {
+        "model_cache_hits_total": ("Model cache hits", cache["hits"]),
+        "model_cache_loads_total": ("Model (re)loads from disk", cache["loads"]),
+    }
+    log = logging_stats()
+    gauges["log_queue_size"] = ("Log records waiting for the background writer", log["queue_size"])
+    counters["log_records_dropped_total"] = ("Log records dropped by sampling and rate limits",
+                                             log["sampled_out"] + log["rate_limited"])
+    if prediction_pipeline.micro_batcher is not None:
+        gauges["micro_batcher_queued"] = ("Rows waiting in the micro-batching queue",
+                                          prediction_pipeline.micro_batcher.stats()["queued"])
+    if prediction_pipeline.prediction_cache is not None:
+        predictions = prediction_pipeline.prediction_cache.stats()
+        counters["prediction_cache_hits_total"] = ("Rows answered from the prediction cache",
+                                                   predictions["hits"])
+        counters["prediction_cache_misses_total"] = ("Rows scored by the model through the prediction cache",
+                                                     predictions["misses"])
+        counters["prediction_cache_evictions_total"] = ("Prediction cache entries evicted by the size bound",
+                                                        predictions["evictions"])
+        gauges["prediction_cache_hit_ratio"] = ("Share of rows answered from the prediction cache",
+                                                predictions["hit_ratio"])
+        gauges["prediction_cache_entries"] = ("Entries in the prediction cache", predictions["entries"])
+        gauges["prediction_cache_memory_bytes"] = ("Approximate memory used by the prediction cache",
+                                                   predictions["memory_bytes"])
+    return gauges, counters
+
+SERVING_METRICS = [REQUEST_LATENCY, PREDICTION_LATENCY, PREDICTION_CPU, PREDICTION_ROWS]
+# Under gunicorn (METRICS_DIR is set by gunicorn.conf.py) /metrics merges the metrics of all the workers
+shared_metrics = SharedMetrics(os.environ["METRICS_DIR"], SERVING_METRICS, collector=collect_metrics) \
+    if os.environ.get("METRICS_DIR") else None
+
+@app.route('/metrics', methods=['GET']) ## Prometheus scrape endpoint
+def metrics():
+    if shared_metrics is not None:
+        body = shared_metrics.render()
+    else:
+        body = render_prometheus(SERVING_METRICS, *collect_metrics())
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
 @app.route('/', methods=['GET',]) ## route to display the home page
 def homepage():
     return render_template('index.html')
 
-@app.route('/train', methods=['GET']) ## route to train the pipeline
+@app.route('/train', methods=['GET', 'POST']) ## route to start training in the background
 def training():
-    os.system('python main.py')
-    return 'Training completed!'
+    # ?force=1 reruns every stage even if its inputs are unchanged
+    job_id, created = training_jobs.submit(force=request.args.get('force', '0').lower() in ('1', 'true'))
+    body = {"job_id": job_id, "status_url": f"/train/{job_id}"}
+    if not created:
+        body["error"] = "A training job is already queued or running"
+        return jsonify(body), 409
+    return jsonify(body), 202
+
+@app.route('/train/<job_id>', methods=['GET']) ## route to follow a training job
+def training_status(job_id):
+    status = training_jobs.status(job_id)
+    if status is None:
+        return jsonify({"error": f"Unknown training job: {job_id}"}), 404
+    return jsonify(status)
+
+@app.route('/model/stats', methods=['GET']) ## route to inspect the model cache
+def model_stats():
+    return jsonify(prediction_pipeline.model_cache.stats())
+
+@app.route('/predict/stats', methods=['GET']) ## route to inspect micro-batching and the prediction cache
+def predict_stats():
+    if prediction_pipeline.micro_batcher is None:
+        body = {"micro_batching": False}
+    else:
+        body = {"micro_batching": True, **prediction_pipeline.micro_batcher.stats()}
+    cache = prediction_pipeline.prediction_cache
+    body["prediction_cache"] = cache.stats() if cache is not None else False
+    return jsonify(body)
+
+@app.route('/predict/batch', methods=['POST']) ## JSON route scoring many samples at once
+def predict_batch():
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return jsonify({"error": "Request body must be JSON"}), 400
+    try:
+        matrix = prediction_pipeline.batch_to_matrix(payload)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Scoring errors are server errors (500), not invalid payloads
+    predictions = prediction_pipeline.prediction(matrix)
+    return jsonify({"count": int(predictions.shape[0]), "predictions": predictions.tolist()})
 
 @app.route('/predict', methods=['POST', 'GET']) ## route from the web ui
 def index():
@@ -30,21 +156,25 @@ def index():
             ph = float(request.form['pH'])
             sulphates = float(request.form['sulphates'])
             alcohol = float(request.form['alcohol'])
+        except (KeyError, ValueError):
+            # Missing or non-numeric form field
+            return "Something is wrong!!!!", 400
 
-            # Create a DataFrame for the input features
-            data=[fixed_acidity, volatile_acidity, citric_acid, residual_sugar, chlorides, free_sulfur_dioxide, total_sulfur_dioxide, density, ph, sulphates, alcohol]
-
-            data = np.array(data).reshape(1, 11)
-            obj = PredictionPipeline()
-            predict = obj.prediction(data)
-
-            return render_template('results.html', prediction=str(predict))
+        # Create a DataFrame for the input features
+        data=[fixed_acidity, volatile_acidity, citric_acid, residual_sugar, chlorides, free_sulfur_dioxide, total_sulfur_dioxide, density, ph, sulphates, alcohol]
 
+        data = np.array(data).reshape(1, 11)
+        try:
+            predict = prediction_pipeline.prediction(data)
         except Exception as e:
-            return "Something is wrong!!!!"
+            logger.error(f"Prediction failed: {str(e)}")
+            return "Something is wrong!!!!", 500
+
+        return render_template('results.html', prediction=str(predict))
         
     else:
         return render_template('index.html')
     
 if __name__ == "__main__":
+    # Development server; in production run the pre-forking server: gunicorn -c gunicorn.conf.py app:app
     app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
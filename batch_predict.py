@@ -0,0 +1,37 @@
+import argparse
+import json
+import os
+
+from src.datascienceproject import logger
+from src.datascienceproject.config.configuration import ConfigurationManager
+from src.datascienceproject.pipeline.pipeline_batch_prediction import BatchPredictionPipeline, DEFAULT_CHUNK_BYTES
+from src.datascienceproject.pipeline.pipeline_prediction import load_feature_columns
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score a large semicolon-separated wine file in streaming chunks.")
+    parser.add_argument("input", help="input CSV file (';' separated, with header)")
+    parser.add_argument("output", help="output CSV file for the predictions")
+    parser.add_argument("--model", default=None, help="model artifact (defaults to serving.model_path)")
+    parser.add_argument("--workers", type=int, default=1, help="number of scoring processes (0 = all cores)")
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_BYTES / 2**20,
+                        help="size of the blocks read from the input, in MiB")
+    parser.add_argument("--include-input", action="store_true", help="copy the feature columns into the output")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    model_path = args.model or ConfigurationManager().get_serving_config().model_path
+    pipeline = BatchPredictionPipeline(
+        model_path=model_path,
+        feature_columns=load_feature_columns(),
+        chunk_bytes=int(args.chunk_mb * 2**20),
+        include_input=args.include_input,
+    )
+    try:
+        summary = pipeline.run(args.input, args.output, workers=args.workers or os.cpu_count())
+        print(json.dumps(summary, indent=4))
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -0,0 +1,89 @@
+"""
+Benchmark the schema-driven loader (utils/data_io.load_dataset) against the line-by-line
+parser that ModelTrainer/ModelEvaluation used before it.
+
+Usage:
+    python benchmarks/bench_data_loader.py --rows 100000 500000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.datascienceproject.constant import SCHEMA_FILE_PATH
+from src.datascienceproject.utils.common import read_yaml
+from src.datascienceproject.utils.data_io import load_dataset
+
+
+def legacy_preprocess_data(file_path):
+    """The previous ModelTrainer._preprocess_data, kept here as the reference implementation."""
+    with open(file_path, 'r') as f:
+        lines = f.readlines()
+
+    headers = lines[0].strip().strip('"').split(';')
+    headers = [h.strip('"').strip() for h in headers]
+
+    data_rows = []
+    for line in lines[1:]:
+        values = [val.strip().strip('"').strip() for val in line.strip().split(';')]
+        data_rows.append(values)
+
+    df = pd.DataFrame(data_rows, columns=headers)
+
+    for col in df.columns:
+        if col != 'quality':
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce', downcast='integer')
+    return df
+
+
+def write_synthetic_file(path, n_rows, schema, seed=42):
+    """Write a wine-shaped file with a quoted header, like the raw dataset."""
+    rng = np.random.default_rng(seed)
+    data = {col: (rng.integers(3, 10, n_rows) if dtype.startswith("int") else rng.random(n_rows) * 10)
+            for col, dtype in schema.items()}
+    with open(path, "w") as f:
+        f.write(";".join(f'"{col}"' for col in schema) + "\n")
+    pd.DataFrame(data).to_csv(path, sep=";", index=False, header=False, mode="a")
+
+
+def measure(fn, *args):
+    # Time and memory are measured in separate calls: tracemalloc slows Python-heavy code down
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    args = parser.parse_args()
+
+    schema = dict(read_yaml(str(SCHEMA_FILE_PATH)).COLUMNS)
+    print(f"{'rows':>10} {'legacy s':>10} {'loader s':>10} {'speedup':>8} {'legacy MiB':>11} {'loader MiB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path = os.path.join(tmp, f"wine_{n_rows}.csv")
+            write_synthetic_file(path, n_rows, schema)
+
+            legacy, legacy_s, legacy_peak = measure(legacy_preprocess_data, path)
+            fast, fast_s, fast_peak = measure(load_dataset, path, schema)
+            assert np.allclose(legacy.to_numpy(dtype=float), fast.to_numpy(dtype=float))
+
+            print(f"{n_rows:>10} {legacy_s:>10.3f} {fast_s:>10.3f} {legacy_s / fast_s:>7.1f}x "
+                  f"{legacy_peak / 2**20:>11.1f} {fast_peak / 2**20:>11.1f}")
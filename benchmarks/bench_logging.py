@@ -0,0 +1,115 @@
+"""
+Measure what logging costs the calling thread, synchronous versus queued.
+
+For each logging configuration, the caller-side latency of logger.info is measured
+(file + console handlers writing to a temporary directory, stdout sent to /dev/null),
+then the /predict latency through the Flask test client, with one access-log record per
+request. --sink-delay-us adds a delay to every write, to simulate a slow disk or a
+blocked stdout pipe: synchronous logging pays it on the request thread, queued logging
+does not.
+
+Usage:
+    python benchmarks/bench_logging.py --records 20000 --requests 2000 --sink-delay-us 200
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.datascienceproject import logger
+from src.datascienceproject.utils.logging_setup import _state, configure_logging, logging_stats
+
+CONFIGURATIONS = {
+    "off": {"level": "WARNING"},
+    "sync_text": {"async": False},
+    "async_text": {"async": True},
+    "async_json": {"async": True, "format": "json"},
+    "async_sampled_1pct": {"async": True, "loggers": {"bench": {"sample_rate": 0.01},
+                                                      "datasciencelogger": {"sample_rate": 0.01}}},
+}
+
+
+def slow_down(delay_us: float):
+    """Make every sink handler sleep before writing, to simulate slow I/O."""
+    if not delay_us:
+        return
+    for handler in _state["sinks"]:
+        emit = handler.emit
+
+        def slow_emit(record, emit=emit):
+            time.sleep(delay_us / 1e6)
+            emit(record)
+        handler.emit = slow_emit
+
+
+def percentiles_us(timings) -> dict:
+    p50, p99 = np.percentile(timings, [50, 99]) * 1e6
+    return {"p50_us": p50, "p99_us": p99}
+
+
+def bench_calls(n_records: int) -> dict:
+    timings = np.empty(n_records)
+    for i in range(n_records):
+        start = time.perf_counter()
+        logger.info("record %d of %d", i, n_records, extra={"bench": True})
+        timings[i] = time.perf_counter() - start
+    return percentiles_us(timings)
+
+
+def bench_predict(client, n_requests: int) -> dict:
+    form = {"fixed_acidity": 7.0, "volatile_acidity": 0.27, "citric_acid": 0.36, "residual_sugar": 20.7,
+            "chlorides": 0.045, "free_sulfur_dioxide": 45.0, "total_sulfur_dioxide": 170.0, "density": 1.001,
+            "pH": 3.0, "sulphates": 0.45, "alcohol": 8.8}
+    timings = np.empty(n_requests)
+    for i in range(n_requests):
+        start = time.perf_counter()
+        response = client.post("/predict", data=form)
+        timings[i] = time.perf_counter() - start
+        assert response.status_code == 200, response.data
+    return percentiles_us(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000, help="logger.info calls per configuration")
+    parser.add_argument("--requests", type=int, default=1000, help="/predict requests per configuration")
+    parser.add_argument("--sink-delay-us", type=float, default=0.0, help="simulated latency of every write")
+    args = parser.parse_args()
+
+    import app as app_module
+    from flask import request
+
+    # One access-log record per request, as a production access log would add
+    @app_module.app.after_request
+    def access_log(response):
+        logging.getLogger("bench").info("%s %s %s", request.method, request.path, response.status_code)
+        return response
+
+    client = app_module.app.test_client()
+    results = {}
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        for name, settings in CONFIGURATIONS.items():
+            with contextlib.redirect_stdout(devnull):
+                # StreamHandler binds sys.stdout when created, so configure inside the redirect
+                configure_logging({"file": os.path.join(log_dir, f"{name}.log"), **settings})
+                slow_down(args.sink_delay_us)
+                bench_predict(client, 50)  # warm-up, loads the model
+                results[name] = {"logger_info": bench_calls(args.records),
+                                 "predict": bench_predict(client, args.requests)}
+                stats = logging_stats()
+                configure_logging({"file": None, "console": False})  # drains the queue
+            results[name]["dropped"] = stats["sampled_out"] + stats["rate_limited"]
+
+    print(f"{'configuration':<22} {'info p50 us':>12} {'info p99 us':>12} {'predict p50 us':>15} "
+          f"{'predict p99 us':>15} {'dropped':>8}")
+    for name, result in results.items():
+        print(f"{name:<22} {result['logger_info']['p50_us']:>12.1f} {result['logger_info']['p99_us']:>12.1f} "
+              f"{result['predict']['p50_us']:>15.1f} {result['predict']['p99_us']:>15.1f} {result['dropped']:>8}")
@@ -0,0 +1,130 @@
+"""
+Measure the prediction cache on traffic that repeats wine profiles.
+
+An ElasticNet is fitted on synthetic data and saved, with its linear scorer, to a
+temporary directory. Requests then draw their rows from --profiles distinct profiles
+with Zipf-distributed popularity (--zipf, higher means more repetition), and small noise
+is added to a share of them (--noise-share) so that only quantized keys can match those.
+Each request is scored through PredictionPipeline.prediction without the cache, with
+exact keys and with keys rounded to --decimals; the hit ratio, latency and memory of the
+cache are reported. Predictions served from exact keys are checked against the uncached
+ones (exit status 1 on a mismatch).
+
+Usage:
+    python benchmarks/bench_prediction_cache.py --requests 20000 --batch-size 1 --profiles 2000 --zipf 1.2
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.linear_model import ElasticNet
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import generate_frame, load_schema
+from src.datascienceproject.pipeline.pipeline_prediction import PredictionPipeline
+from src.datascienceproject.utils.linear_scorer import export_linear_scorer
+
+
+def make_requests(profiles: np.ndarray, n_requests: int, batch_size: int, zipf: float, noise_share: float,
+                  rng) -> list:
+    """Draw batches of profiles by Zipf popularity, jittering a share of the rows below 1e-4."""
+    ranks = np.arange(1, len(profiles) + 1)
+    popularity = ranks ** -zipf
+    picks = rng.choice(len(profiles), size=(n_requests, batch_size), p=popularity / popularity.sum())
+    rows = profiles[picks]
+    noisy = rng.random((n_requests, batch_size)) < noise_share
+    rows[noisy] += rng.uniform(-4e-5, 4e-5, size=rows[noisy].shape)
+    return list(rows)
+
+
+def run(pipeline: PredictionPipeline, requests: list) -> dict:
+    pipeline.prediction(requests[0])  # warm-up, loads the model
+    timings = np.empty(len(requests))
+    predictions = []
+    for i, batch in enumerate(requests):
+        start = time.perf_counter()
+        predictions.append(pipeline.prediction(batch))
+        timings[i] = time.perf_counter() - start
+    p50, p99 = np.percentile(timings, [50, 99]) * 1e6
+    return {"p50_us": p50, "p99_us": p99, "mean_us": timings.mean() * 1e6, "predictions": np.concatenate(predictions)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=1, help="rows per request")
+    parser.add_argument("--profiles", type=int, default=2000, help="distinct wine profiles")
+    parser.add_argument("--zipf", type=float, default=1.2, help="popularity skew of the profiles")
+    parser.add_argument("--noise-share", type=float, default=0.2, help="share of rows with sub-1e-4 jitter")
+    parser.add_argument("--decimals", type=int, default=3, help="rounding of the quantized cache")
+    parser.add_argument("--max-entries", type=int, default=100_000)
+    parser.add_argument("--scorer", action="store_true", help="serve the npz linear scorer instead of joblib")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    import joblib
+
+    rng = np.random.default_rng(42)
+    columns, target, bounds = load_schema()
+    features = [col for col in columns if col != target]
+    df = generate_frame(10_000 + args.profiles, columns, target, bounds, rng)
+    X = df[features].to_numpy(dtype=np.float64)
+    y = df[target].to_numpy(dtype=np.float64)
+    # Profiles are stored with the precision of the raw dataset
+    profiles = np.round(X[10_000:], 3)
+    requests = make_requests(profiles, args.requests, args.batch_size, args.zipf, args.noise_share, rng)
+
+    configurations = {
+        "no_cache": None,
+        "exact": {"max_entries": args.max_entries},
+        f"decimals_{args.decimals}": {"max_entries": args.max_entries, "decimals": args.decimals},
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        model = ElasticNet(alpha=0.1, l1_ratio=0.5, random_state=42).fit(X[:10_000], y[:10_000])
+        model_path = os.path.join(work_dir, "model.joblib")
+        scorer_path = os.path.join(work_dir, "scorer.npz")
+        joblib.dump(model, model_path)
+        export_linear_scorer(model, features, scorer_path)
+
+        for name, cache_settings in configurations.items():
+            # A fresh pipeline per configuration; the model itself stays in the process-wide cache
+            pipeline = PredictionPipeline(model_path=model_path, feature_columns=features,
+                                          scorer_path=scorer_path if args.scorer else None)
+            if cache_settings is not None:
+                pipeline.enable_prediction_cache(**cache_settings)
+            results[name] = run(pipeline, requests)
+            if pipeline.prediction_cache is not None:
+                results[name]["cache"] = pipeline.prediction_cache.stats()
+
+    baseline = results["no_cache"]
+    # Exact keys must serve exactly what the model returns (up to BLAS rounding of sub-batches)
+    max_diff = float(np.abs(results["exact"]["predictions"] - baseline["predictions"]).max())
+    if max_diff > 1e-9:
+        print(f"MISMATCH: exact-key cache differs from the model by {max_diff:.2e}")
+        sys.exit(1)
+    quantized = f"decimals_{args.decimals}"
+    quantized_diff = float(np.abs(results[quantized]["predictions"] - baseline["predictions"]).max())
+    print(f"exact keys match the model (max difference {max_diff:.2e}); "
+          f"{quantized} max difference {quantized_diff:.2e}")
+
+    print(f"\n{'configuration':<14} {'p50 us':>9} {'p99 us':>9} {'mean us':>9} {'hit ratio':>10} {'entries':>8} "
+          f"{'memory KB':>10}")
+    for name, result in results.items():
+        cache = result.get("cache", {})
+        print(f"{name:<14} {result['p50_us']:>9.1f} {result['p99_us']:>9.1f} {result['mean_us']:>9.1f} "
+              f"{cache.get('hit_ratio', 0.0):>10.3f} {cache.get('entries', 0):>8} "
+              f"{cache.get('memory_bytes', 0) / 1024:>10.1f}")
+
+    if args.output:
+        for result in results.values():
+            result.pop("predictions")
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=4)
+        print(f"Results saved to {args.output}")
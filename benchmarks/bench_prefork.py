@@ -0,0 +1,135 @@
+"""
+Throughput and memory of the pre-forked gunicorn server, per number of workers.
+
+For each worker count, gunicorn is started with gunicorn.conf.py on a free port, /predict/batch
+is loaded by --clients concurrent client threads for --seconds, and the memory of every
+worker is read from /proc/<pid>/smaps_rollup (Linux): USS (Private_*) is what each extra
+worker costs, PSS splits the shared pages (model, interpreter, libraries) between the
+processes that map them. Throughput only scales with the cores actually available.
+
+Usage:
+    python benchmarks/bench_prefork.py --workers 1 2 4 --clients 8 --seconds 10 --batch-size 1
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROW = {"fixed acidity": 7.0, "volatile acidity": 0.27, "citric acid": 0.36, "residual sugar": 20.7,
+       "chlorides": 0.045, "free sulfur dioxide": 45.0, "total sulfur dioxide": 170.0, "density": 1.001,
+       "pH": 3.0, "sulphates": 0.45, "alcohol": 8.8}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def memory_kb(pid: int) -> dict:
+    """Rss, Pss and Uss (private clean + dirty) of a process, in kB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {"rss": fields.get("Rss", 0), "pss": fields.get("Pss", 0),
+            "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)}
+
+
+def children(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def wait_until_up(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not come up at {url}")
+
+
+def load(url: str, body: bytes, clients: int, seconds: float) -> dict:
+    """Send requests from clients threads for seconds; return the throughput."""
+    counts = [0] * clients
+    errors = [0] * clients
+    stop = time.monotonic() + seconds
+
+    def client(i):
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        while time.monotonic() < stop:
+            try:
+                urllib.request.urlopen(request, timeout=10).read()
+                counts[i] += 1
+            except OSError:
+                errors[i] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"requests_per_second": sum(counts) / seconds, "errors": sum(errors)}
+
+
+def bench_workers(n_workers: int, args) -> dict:
+    port = free_port()
+    env = {**os.environ, "PORT": str(port), "WEB_CONCURRENCY": str(n_workers), "LOG_CONSOLE": "0"}
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+                              cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        wait_until_up(f"{base}/model/stats")
+        body = json.dumps({name: [value] * args.batch_size for name, value in ROW.items()}).encode()
+        load(f"{base}/predict/batch", body, args.clients, 1.0)  # warm-up
+        result = load(f"{base}/predict/batch", body, args.clients, args.seconds)
+        workers = [memory_kb(pid) for pid in children(server.pid)]
+        result.update({
+            "master": memory_kb(server.pid),
+            "worker_uss_kb": sum(w["uss"] for w in workers) / len(workers),
+            "worker_pss_kb": sum(w["pss"] for w in workers) / len(workers),
+            "worker_rss_kb": sum(w["rss"] for w in workers) / len(workers),
+        })
+        return result
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8, help="concurrent client threads")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of each run")
+    parser.add_argument("--batch-size", type=int, default=1, help="rows per /predict/batch request")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU(s)")
+    results = {n: bench_workers(n, args) for n in args.workers}
+
+    baseline = results[args.workers[0]]["requests_per_second"] / args.workers[0]
+    print(f"\n{'workers':>8} {'req/s':>10} {'scaling':>8} {'errors':>7} {'worker USS MB':>14} "
+          f"{'worker PSS MB':>14} {'worker RSS MB':>14}")
+    for n, result in results.items():
+        print(f"{n:>8} {result['requests_per_second']:>10.0f} {result['requests_per_second'] / baseline / n:>8.2f} "
+              f"{result['errors']:>7} {result['worker_uss_kb'] / 1024:>14.1f} {result['worker_pss_kb'] / 1024:>14.1f} "
+              f"{result['worker_rss_kb'] / 1024:>14.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=4)
+        print(f"Results saved to {args.output}")
@@ -0,0 +1,114 @@
+"""
+Compare the compiled linear scorer with sklearn's predict.
+
+An ElasticNet and a streaming-style pipeline (StandardScaler + SGDRegressor) are fitted
+on synthetic data and exported with export_linear_scorer. The scorer is first checked
+against model.predict on a held-out sample (exit status 1 on a parity failure), then the
+latency of both paths is measured for single rows and for batches, directly and through
+PredictionPipeline.prediction.
+
+Usage:
+    python benchmarks/bench_scorer.py --rows 100000 --batch-sizes 1 100 10000 --calls 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.linear_model import ElasticNet, SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import generate_frame, load_schema
+from src.datascienceproject.pipeline.pipeline_prediction import PredictionPipeline
+from src.datascienceproject.utils.linear_scorer import check_parity, export_linear_scorer, load_linear_scorer
+
+
+def latency(fn, X, calls: int) -> dict:
+    """Median and p99 latency of fn(X) over calls calls, in microseconds."""
+    fn(X)  # warm-up
+    timings = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        fn(X)
+        timings[i] = time.perf_counter() - start
+    p50, p99 = np.percentile(timings, [50, 99]) * 1e6
+    return {"p50_us": p50, "p99_us": p99, "rows_per_second": len(X) / np.median(timings)}
+
+
+def bench_model(name: str, model, X_train, y_train, X_test, work_dir, features, batch_sizes, calls) -> dict:
+    import joblib
+
+    model.fit(X_train, y_train)
+    model_path = os.path.join(work_dir, f"{name}.joblib")
+    scorer_path = os.path.join(work_dir, f"{name}.npz")
+    joblib.dump(model, model_path)
+    export_linear_scorer(model, features, scorer_path)
+    scorer = load_linear_scorer(scorer_path, feature_columns=features)
+    max_diff = check_parity(model, scorer, X_test)
+    print(f"{name}: scorer matches predict on {len(X_test)} rows (max difference {max_diff:.2e})")
+
+    # The serving pipelines go through the model cache, as in app.py
+    sklearn_pipeline = PredictionPipeline(model_path=model_path, feature_columns=features)
+    scorer_pipeline = PredictionPipeline(model_path=model_path, feature_columns=features, scorer_path=scorer_path)
+    paths = {
+        "sklearn": model.predict,
+        "scorer": scorer.predict,
+        "pipeline_sklearn": sklearn_pipeline.prediction,
+        "pipeline_scorer": scorer_pipeline.prediction,
+    }
+    results = {"max_difference": max_diff}
+    for batch_size in batch_sizes:
+        X = X_test[:batch_size]
+        for path, fn in paths.items():
+            results[f"{path}@{batch_size}"] = latency(fn, X, calls)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows of synthetic training data")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--calls", type=int, default=2000, help="timed calls per path and batch size")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    columns, target, bounds = load_schema()
+    features = [col for col in columns if col != target]
+    df = generate_frame(args.rows + max(args.batch_sizes), columns, target, bounds, np.random.default_rng(42))
+    X = df[features].to_numpy(dtype=np.float64)
+    y = df[target].to_numpy(dtype=np.float64)
+    X_train, y_train, X_test = X[:args.rows], y[:args.rows], X[args.rows:]
+
+    models = {
+        "elasticnet": ElasticNet(alpha=0.1, l1_ratio=0.5, random_state=42),
+        "sgd_pipeline": Pipeline([("scaler", StandardScaler()),
+                                  ("model", SGDRegressor(penalty="elasticnet", alpha=0.1, l1_ratio=0.5,
+                                                         random_state=42))]),
+    }
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            for name, model in models.items():
+                results[name] = bench_model(name, model, X_train, y_train, X_test, work_dir, features,
+                                            args.batch_sizes, args.calls)
+    except ValueError as e:
+        print(f"PARITY FAILURE: {e}")
+        sys.exit(1)
+
+    for name, model_results in results.items():
+        print(f"\n{name:<28} {'p50 us':>10} {'p99 us':>10} {'rows/s':>14}")
+        for key, result in model_results.items():
+            if key != "max_difference":
+                print(f"{key:<28} {result['p50_us']:>10.1f} {result['p99_us']:>10.1f} {result['rows_per_second']:>14.0f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=4)
+        print(f"Results saved to {args.output}")
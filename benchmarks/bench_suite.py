@@ -0,0 +1,207 @@
+"""
+Benchmark every training stage component and the /predict serving path.
+
+For each scale, a synthetic dataset following schema.yaml is generated, then the loader,
+validation, split, training and evaluation components are timed on it (best of
+--repeat runs). /predict and /predict/batch latencies are measured through the Flask test
+client with several concurrent client threads. Results are written as JSON; with
+--baseline, every timing is compared against a saved run and regressions beyond
+--threshold are reported (exit status 1).
+
+Usage:
+    python benchmarks/bench_suite.py --rows 10000 100000 --concurrency 1 4 16
+    python benchmarks/bench_suite.py --save-baseline benchmarks/results/baseline.json
+    python benchmarks/bench_suite.py --baseline benchmarks/results/baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import write_dataset
+from src.datascienceproject.config.configuration import ConfigurationManager
+from src.datascienceproject.components.data_validation import DataValiadtion
+from src.datascienceproject.components.data_transformation import DataTransformation
+from src.datascienceproject.components.model_trainer import ModelTrainer
+from src.datascienceproject.components.model_evaluation import ModelEvaluation
+from src.datascienceproject.utils.data_io import load_dataset
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def best_of(repeat: int, fn, *args, **kwargs) -> tuple:
+    """Return (result of the last call, fastest wall time) over repeat calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def bench_components(n_rows: int, work_dir: str, repeat: int) -> dict:
+    """Time every stage component on a generated dataset of n_rows rows."""
+    config = ConfigurationManager()
+    data_path = os.path.join(work_dir, "data.csv")
+    _, generate_s = best_of(1, write_dataset, data_path, n_rows)
+    print(f"  generated {n_rows} rows in {generate_s:.2f}s")
+
+    validation_config = replace(config.get_data_validation_config(), unzip_data_dir=data_path,
+                                STATUS_FILE=os.path.join(work_dir, "report.json"), fail_fast=False)
+    transformation_config = replace(config.get_data_transformation_config(), root_dir=work_dir,
+                                    data_path=data_path, artifact_format="npy", export_csv=False)
+    trainer_config = replace(config.get_model_trainer_config(), root_dir=work_dir, search={},
+                             cross_validation={})
+    evaluation_config = replace(config.get_model_evaluation_config(), root_dir=work_dir)
+
+    timings = {}
+    _, timings["load_dataset"] = best_of(repeat, load_dataset, data_path, validation_config.all_schema)
+    _, timings["validate_all_columns"] = best_of(repeat, DataValiadtion(validation_config).validate_all_columns)
+    splits, timings["split_data"] = best_of(repeat, DataTransformation(transformation_config).split_data)
+    model, timings["train"] = best_of(repeat, ModelTrainer(trainer_config).train, train=splits["train"])
+
+    evaluation = ModelEvaluation(evaluation_config)
+    test_x, test_y = splits["test"]
+
+    def evaluate():
+        pred = model.predict(test_x)
+        return evaluation.eval_metrics(test_y, pred), evaluation.detailed_metrics(test_x, test_y, pred)
+    _, timings["evaluate"] = best_of(repeat, evaluate)
+
+    results = {}
+    for name, seconds in timings.items():
+        results[f"{name}@{n_rows}"] = {"seconds": seconds, "rows_per_second": n_rows / seconds if seconds else None}
+    return results, os.path.join(work_dir, trainer_config.model_name)
+
+
+def bench_serving(model_path: str, concurrency_levels: list, requests_per_client: int) -> dict:
+    """Measure /predict and /predict/batch latency through the Flask test client."""
+    import app as app_module
+    from src.datascienceproject.pipeline.pipeline_prediction import PredictionPipeline
+
+    # Serve the model trained by the benchmark instead of the artifacts/ one
+    app_module.prediction_pipeline = PredictionPipeline(model_path=model_path)
+    columns = app_module.prediction_pipeline.feature_columns
+    form = {"fixed_acidity": 7.0, "volatile_acidity": 0.27, "citric_acid": 0.36, "residual_sugar": 20.7,
+            "chlorides": 0.045, "free_sulfur_dioxide": 45.0, "total_sulfur_dioxide": 170.0, "density": 1.001,
+            "pH": 3.0, "sulphates": 0.45, "alcohol": 8.8}
+    batch = {col: [1.0] * 100 for col in columns}
+    requests = {
+        "predict": lambda client: client.post("/predict", data=form),
+        "predict_batch_100": lambda client: client.post("/predict/batch", json=batch),
+    }
+    # A broken serving path must fail the benchmark, not measure a fast error page
+    row = np.array([list(form.values())])
+    expected_prediction = str(app_module.prediction_pipeline.prediction(row))
+    expected_batch = app_module.prediction_pipeline.predict_batch(batch)
+    checks = {
+        "predict": lambda response: expected_prediction in response.get_data(as_text=True),
+        "predict_batch_100": lambda response: np.allclose(response.get_json()["predictions"], expected_batch),
+    }
+
+    results = {}
+    for name, send in requests.items():
+        send(app_module.app.test_client())  # warm-up, loads the model
+        for clients in concurrency_levels:
+            def run_client(_):
+                client = app_module.app.test_client()
+                latencies = []
+                for _ in range(requests_per_client):
+                    start = time.perf_counter()
+                    response = send(client)
+                    latencies.append(time.perf_counter() - start)
+                    assert response.status_code == 200 and checks[name](response), response.data
+                return latencies
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as executor:
+                latencies = np.concatenate(list(executor.map(run_client, range(clients))))
+            elapsed = time.perf_counter() - start
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            # p95 latency is the value compared against the baseline
+            results[f"{name}@c{clients}"] = {"seconds": float(p95), "p50_ms": p50 * 1e3, "p95_ms": p95 * 1e3,
+                                             "p99_ms": p99 * 1e3, "requests_per_second": len(latencies) / elapsed}
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return the benchmarks slower than the baseline by more than threshold (a fraction)."""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None or not previous["seconds"]:
+            continue
+        ratio = current["seconds"] / previous["seconds"]
+        if ratio > 1 + threshold:
+            regressions.append({"benchmark": key, "baseline_seconds": previous["seconds"],
+                                "seconds": current["seconds"], "ratio": ratio})
+    return regressions
+
+
+def environment() -> dict:
+    import pandas
+    import sklearn
+
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "numpy": np.__version__, "pandas": pandas.__version__, "sklearn": sklearn.__version__}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000],
+                        help="dataset sizes, from 10k up to 100M rows")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per component timing, the best is kept")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200, help="requests sent by each client thread")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/bench-<timestamp>.json)")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging, 0.2 = 20%%")
+    parser.add_argument("--save-baseline", help="also save these results as the baseline at this path")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n_rows in args.rows:
+            print(f"Benchmarking components on {n_rows} rows")
+            scale_dir = os.path.join(work_dir, str(n_rows))
+            os.makedirs(scale_dir)
+            component_results, model_path = bench_components(n_rows, scale_dir, args.repeat)
+            results.update(component_results)
+        print(f"Benchmarking serving at concurrency {args.concurrency}")
+        results.update(bench_serving(model_path, args.concurrency, args.requests))
+
+    print(f"\n{'benchmark':<32} {'seconds':>10} {'throughput':>14}")
+    for key, result in results.items():
+        throughput = result.get("rows_per_second") or result.get("requests_per_second")
+        unit = "rows/s" if "rows_per_second" in result else "req/s"
+        print(f"{key:<32} {result['seconds']:>10.4f} {throughput:>10.0f} {unit}")
+
+    document = {"created_at": time.time(), "environment": environment(), "args": vars(args), "results": results}
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        document["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']}: {regression['baseline_seconds']:.4f}s -> "
+                  f"{regression['seconds']:.4f}s ({regression['ratio']:.2f}x)")
+        if not regressions:
+            print(f"No regression beyond {args.threshold:.0%} against {args.baseline}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    for path in filter(None, [output, args.save_baseline]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(document, f, indent=4)
+        print(f"Results saved to {path}")
+
+    sys.exit(1 if document.get("regressions") else 0)
@@ -0,0 +1,111 @@
+"""
+Import-time report and budget check for the serving process.
+
+The target module (``app`` by default) is imported in a fresh interpreter run with
+``python -X importtime``; the per-module timings it prints are parsed into a report of the
+slowest top-level packages and modules. The check fails (exit status 1) when the total
+import time exceeds --budget-ms, or when a module that inference does not need (pandas,
+sklearn, mlflow, ...) is imported.
+
+Timings are noisy: take the best of --repeat runs, and set the budget with some headroom
+on the machine that runs the check.
+
+Usage:
+    python benchmarks/import_budget.py --budget-ms 500
+    python benchmarks/import_budget.py --module main --forbid mlflow --budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the serving path must not import
+FORBIDDEN_MODULES = ("pandas", "sklearn", "scipy", "mlflow", "pyarrow")
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_imports(module: str) -> list:
+    """Import module in a fresh interpreter; return (name, self_us, cumulative_us, depth) records."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT_DIR, os.environ.get("PYTHONPATH")]))},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    records = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append({"module": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                            "depth": (len(indent) - 1) // 2})
+    return records
+
+
+def report(records: list, module: str, top: int) -> dict:
+    """Summarize -X importtime records: total time, slowest packages and modules."""
+    # Cumulative times of the top-level records (depth 0) include everything they imported
+    total_us = sum(r["cumulative_us"] for r in records if r["depth"] == 0)
+    packages = {}
+    for r in records:
+        package = r["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + r["self_us"]
+    return {
+        "module": module,
+        "total_ms": total_us / 1000,
+        "modules_imported": len(records),
+        "top_packages_ms": {name: us / 1000 for name, us in sorted(packages.items(), key=lambda kv: -kv[1])[:top]},
+        "top_modules_self_ms": {r["module"]: r["self_us"] / 1000
+                                for r in sorted(records, key=lambda r: -r["self_us"])[:top]},
+        "imported": sorted({r["module"] for r in records}),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app", help="module to import (default: app)")
+    parser.add_argument("--budget-ms", type=float, default=500, help="maximum total import time (default: 500)")
+    parser.add_argument("--forbid", nargs="*", default=list(FORBIDDEN_MODULES),
+                        help="top-level packages that must not be imported")
+    parser.add_argument("--repeat", type=int, default=3, help="runs, the fastest is kept")
+    parser.add_argument("--top", type=int, default=15, help="rows of the report")
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    runs = [report(measure_imports(args.module), args.module, args.top) for _ in range(args.repeat)]
+    best = min(runs, key=lambda r: r["total_ms"])
+
+    print(f"import {args.module}: {best['total_ms']:.1f} ms, {best['modules_imported']} modules "
+          f"(best of {args.repeat})")
+    print(f"\n{'package':<48} {'ms':>9}")
+    for name, ms in best["top_packages_ms"].items():
+        print(f"{name:<48} {ms:>9.1f}")
+    print(f"\n{'module (self time)':<48} {'ms':>9}")
+    for name, ms in best["top_modules_self_ms"].items():
+        print(f"{name:<48} {ms:>9.1f}")
+
+    failures = []
+    top_level = {name.split(".")[0] for name in best["imported"]}
+    for name in args.forbid:
+        if name in top_level:
+            failures.append(f"{name} is imported")
+    if args.budget_ms is not None and best["total_ms"] > args.budget_ms:
+        failures.append(f"{best['total_ms']:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    best["failures"] = failures
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(best, f, indent=4)
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK" + (f": within the {args.budget_ms:.0f} ms budget" if args.budget_ms is not None else ""))
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,88 @@
+"""
+Gunicorn configuration of the production server: gunicorn -c gunicorn.conf.py app:app
+
+The master imports the app once (preload_app) and loads the model before forking the
+workers, so they start with the model already in memory and share its pages: the
+scorer and model arrays are never written, and model.joblib's arrays are memory-mapped
+from the page cache (serving.mmap_model). gc.freeze() moves the objects created so far
+out of the collector's reach, so that collections in the workers do not touch, and copy,
+the pages they were forked with.
+
+Workers are recycled gracefully after max_requests (+ jitter) requests: the master forks
+a replacement from its preloaded state, and the old worker finishes its in-flight
+requests first. A retrained model is picked up by every worker on its next request
+(ModelCache checks the artifact's signature), without restarting anything. ``kill -HUP``
+on the master also replaces all workers gracefully.
+
+Logs go to stdout only: every worker rotating the same logs/logging.log would lose and
+interleave records. Set LOG_FILE to a name with a ``{pid}`` placeholder (e.g.
+``logs/logging-{pid}.log``) for one file per process instead.
+
+Each worker keeps its own metrics; /metrics merges the snapshots they write to
+``serving.server.metrics_dir`` (see utils/shared_metrics.py), whichever worker answers.
+
+Settings come from the ``serving.server`` section of config.yaml; WEB_CONCURRENCY,
+GUNICORN_THREADS and PORT override the number of workers, threads and the bind port.
+"""
+
+import gc
+import multiprocessing
+import os
+
+# Before the package import, which configures logging from the environment
+os.environ.setdefault("LOG_FILE", "")
+if os.environ["LOG_FILE"] and "{pid}" not in os.environ["LOG_FILE"]:
+    raise ValueError(f"LOG_FILE={os.environ['LOG_FILE']!r} would be shared by all workers, "
+                     "add a {pid} placeholder to its name")
+
+from src.datascienceproject.config.configuration import ConfigurationManager
+
+_server = ConfigurationManager().get_serving_config().server
+# Read by app.py, imported after this file
+os.environ.setdefault("METRICS_DIR", _server.get("metrics_dir", "artifacts/serving_metrics"))
+
+bind = _server.get("bind", "0.0.0.0:5000")
+if os.environ.get("PORT"):
+    bind = f"0.0.0.0:{os.environ['PORT']}"
+workers = int(os.environ.get("WEB_CONCURRENCY") or _server.get("workers") or 0) or multiprocessing.cpu_count()
+threads = int(os.environ.get("GUNICORN_THREADS") or _server.get("threads", 4))
+# gthread: each worker serves `threads` requests at a time and keeps connections alive
+worker_class = "gthread"
+preload_app = True
+max_requests = int(_server.get("max_requests", 10000))
+max_requests_jitter = int(_server.get("max_requests_jitter", 1000))
+graceful_timeout = int(_server.get("graceful_timeout", 30))
+timeout = int(_server.get("timeout", 60))
+# Logging goes through the app's queue handler; gunicorn's own logs go to stderr
+accesslog = None
+errorlog = "-"
+
+
+def when_ready(server):
+    """Load the model in the master, once, before the workers are forked."""
+    import app
+
+    # Counters of a previous server run must not be added to this one's
+    app.shared_metrics.reset()
+    try:
+        app.prediction_pipeline.model_cache.get()
+    except FileNotFoundError:
+        server.log.warning("No model artifact yet: workers will load it on their first prediction")
+    # Keep the collector from touching (and copying) the pages the workers inherit
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Model loaded in the master, forking {workers} worker(s) x {threads} thread(s)")
+
+
+def post_fork(server, worker):
+    # Per-process state: the log listener thread is restarted by logging_setup's at-fork hook,
+    # the micro-batcher and metrics snapshot threads start on the first request
+    server.log.info(f"Worker {worker.pid} forked")
+
+
+def worker_exit(server, worker):
+    import app
+
+    # Final snapshot, archived by the next scrape so the merged counters do not go backwards
+    app.shared_metrics.write()
+    server.log.info(f"Worker {worker.pid} exiting after {worker.nr} request(s)")
@@ -1,62 +1,24 @@
+import argparse
 from src.datascienceproject import logger
-from src.datascienceproject.pipeline.pipeline_data_ingestion import DataIngestionTrainingPipeline
-from src.datascienceproject.pipeline.pipline_data_validation import DataValidationTrainingPipeline
-from src.datascienceproject.pipeline.pipeline_data_transformation import DataTransformationTrainingPipeline
-from src.datascienceproject.pipeline.pipeline_model_trainer import ModelTrainingPipeline
-from src.datascienceproject.pipeline.pipeline_model_evaluation import ModelEvaluationPipeline
+from src.datascienceproject.pipeline.stage_runner import StageRunner
+from src.datascienceproject.utils.tracking import wait_for_runs
+from src.datascienceproject.utils.logging_setup import configure_logging
 
 logger.info("Welcome to our custom logging setup!")
 
-STAGE_NAME = "Data Ingestion Stage"
 if __name__ == "__main__":
-    try:
-        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-        pipeline = DataIngestionTrainingPipeline()
-        pipeline.initiate_data_ingestion()
-        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.error(f"Error in data ingestion process: {str(e)}")
-        raise e
+    parser = argparse.ArgumentParser(description="Run the training pipeline.")
+    parser.add_argument("--force", action="store_true", help="run every stage even if its inputs are unchanged")
+    args = parser.parse_args()
 
-STAGE_NAME = "Data Validation Stage"
-if __name__ == "__main__":
-    try:
-        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-        pipeline = DataValidationTrainingPipeline()
-        pipeline.initiate_data_validation()
-        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.error(f"Error in data validation process: {str(e)}")
-
-STAGE_NAME = "Data Transformation Stage"
-if __name__ == '__main__':
-    try:
-        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-        obj = DataTransformationTrainingPipeline()
-        obj.initiate_data_transformation()
-        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(e)
-        raise e
+    runner = StageRunner()
+    configure_logging(runner.config.get("logging"))
+    report = runner.run(force=args.force)
 
-STAGE_NAME = "Model Training Stage"
-if __name__ == "__main__":
-    try:
-        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-        pipeline = ModelTrainingPipeline()
-        pipeline.initiate_model_training()
-        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.error(f"Error in model training process: {str(e)}")
-        raise e
+    logger.info("Pipeline report:")
+    for entry in report:
+        logger.info(f"  {entry['stage']:<28} {entry['status']:<7} {entry['duration_seconds']:8.2f}s "
+                    f"{entry.get('rows', 0):>9} rows  ({entry['reason']})")
 
-STAGE_NAME = "Model Evaluation Stage"
-if __name__ == "__main__":
-    try:
-        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
-        pipeline = ModelEvaluationPipeline()
-        pipeline.initiate_model_evaluation()
-        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.error(f"Error in model evaluation process: {str(e)}")
-        raise e
\ No newline at end of file
+    # MLflow runs are logged in the background; let them finish before exiting
+    wait_for_runs()
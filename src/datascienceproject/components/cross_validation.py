@@ -0,0 +1,98 @@
+"""
+Parallel k-fold cross-validation of the ElasticNet model.
+
+The folds run concurrently in a process pool. The feature matrix and target are shared
+read-only: they are memory-mapped (see ``memmap_arrays``), so each worker receives a
+reference to the backing file rather than a pickled copy. Workers only materialize the
+rows of their own fold, and the base matrix is held once in the page cache however many
+workers there are.
+"""
+
+import math
+import time
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.linear_model import ElasticNet
+
+from src.datascienceproject import logger
+from src.datascienceproject.utils.data_io import memmap_arrays
+
+
+def kfold_indices(n_rows: int, folds: int, random_state: int = 42) -> list:
+    """Return the validation row indices of each fold, from a seeded shuffle of the rows."""
+    if not 2 <= folds <= n_rows:
+        raise ValueError(f"folds must be between 2 and the number of rows ({n_rows}), got {folds}")
+    order = np.random.default_rng(random_state).permutation(n_rows)
+    return [np.sort(fold) for fold in np.array_split(order, folds)]
+
+
+def _fit_fold(X, y, val_idx, fold: int, params: dict, random_state: int) -> dict:
+    """Fit on every row outside val_idx and score on val_idx."""
+    train_mask = np.ones(len(y), dtype=bool)
+    train_mask[val_idx] = False
+
+    start = time.perf_counter()
+    model = ElasticNet(**params, random_state=random_state)
+    model.fit(X[train_mask], y[train_mask])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_val = np.asarray(y[val_idx])
+    residuals = y_val - model.predict(X[val_idx])
+    predict_seconds = time.perf_counter() - start
+
+    mse = float(np.mean(residuals ** 2))
+    return {
+        "fold": fold,
+        "train_rows": int(train_mask.sum()),
+        "val_rows": len(val_idx),
+        "rmse": math.sqrt(mse),
+        "mae": float(np.mean(np.abs(residuals))),
+        "r2": 1.0 - mse / float(np.var(y_val)),
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+    }
+
+
+def cross_validate(X, y, params: dict, work_dir, folds: int = 5, n_jobs: int = -1, random_state: int = 42) -> dict:
+    """Cross-validate an ElasticNet with the given parameters, one fold per task.
+
+    Args:
+        X (np.ndarray): training features.
+        y (np.ndarray): training target.
+        params (dict): ElasticNet parameters (alpha, l1_ratio).
+        work_dir (str | Path): where in-memory arrays are written to be memory-mapped.
+        folds (int): number of folds.
+        n_jobs (int): worker processes, -1 for all cores.
+        random_state (int): seed of the fold assignment and of the models.
+
+    Returns:
+        dict: per-fold metrics and timings, and the mean and standard deviation of each metric
+    """
+    start = time.perf_counter()
+    shared = memmap_arrays({"X": X, "y": y}, work_dir)
+    workers = min(effective_n_jobs(n_jobs), folds)
+    logger.info(f"Cross-validating {params} over {folds} folds on {workers} worker(s)")
+
+    # max_nbytes=None: the arrays are already memory-mapped, joblib must not copy them again
+    results = Parallel(n_jobs=workers, backend="loky", max_nbytes=None)(
+        delayed(_fit_fold)(shared["X"], shared["y"], val_idx, fold, params, random_state)
+        for fold, val_idx in enumerate(kfold_indices(len(y), folds, random_state))
+    )
+
+    aggregate = {}
+    for metric in ("rmse", "mae", "r2", "fit_seconds"):
+        values = np.array([result[metric] for result in results])
+        aggregate[metric] = {"mean": float(values.mean()), "std": float(values.std())}
+    elapsed = time.perf_counter() - start
+    logger.info(f"Cross-validation rmse {aggregate['rmse']['mean']:.4f} +/- {aggregate['rmse']['std']:.4f}, "
+                f"mae {aggregate['mae']['mean']:.4f}, r2 {aggregate['r2']['mean']:.4f} in {elapsed:.2f}s")
+    return {
+        "params": params,
+        "folds": results,
+        "aggregate": aggregate,
+        "n_jobs": workers,
+        "random_state": random_state,
+        "duration_seconds": elapsed,
+    }
@@ -1,59 +1,213 @@
 import os
+import json
+import hashlib
 import urllib.request as request
+from urllib.error import HTTPError, URLError
+from http.client import HTTPException
 from src.datascienceproject import logger
 import zipfile
 from src.datascienceproject.entity.config_entity import (DataIngestionConfig)
 
+# Size of the blocks streamed from the source URL
+CHUNK_SIZE = 1024 * 1024
+# Number of times an interrupted download is resumed before giving up
+MAX_RETRIES = 3
+TIMEOUT_SECONDS = 30
+
 class DataIngestion:
     def __init__(self, config: DataIngestionConfig):
         self.config = config
-    
+        self.file_path = str(self.config.local_data_file)
+        # ETag / Last-Modified / SHA-256 of the local copy, used for conditional fetches
+        self.meta_path = self.file_path + ".meta.json"
+        self.part_path = self.file_path + ".part"
+
     def verify_zip_file(self, file_path: str) -> bool:
         """
         Verify if the file is a valid ZIP file
         """
         try:
-            with open(file_path, 'rb') as f:
-                # Check ZIP file signature (PK\x03\x04)
-                is_zip = f.read(4).startswith(b'PK\x03\x04')
-                if not is_zip:
-                    logger.error(f"File {file_path} does not have a valid ZIP signature")
-                return is_zip
+            # Checks the end of central directory record, not just the leading signature
+            is_zip = zipfile.is_zipfile(file_path)
+            if not is_zip:
+                logger.error(f"File {file_path} is not a valid ZIP file")
+            return is_zip
         except Exception as e:
             logger.error(f"Error verifying ZIP file: {str(e)}")
             return False
-    
+
+    def _load_meta(self) -> dict:
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_meta(self, meta: dict):
+        with open(self.meta_path, 'w') as f:
+            json.dump(meta, f, indent=4)
+
+    def _validator_headers(self, meta: dict) -> dict:
+        """Headers asking the server to confirm that our copy is still current."""
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def is_up_to_date(self) -> bool:
+        """
+        Check with a single conditional HEAD request whether the local copy matches the source.
+        """
+        meta = self._load_meta()
+        if not os.path.exists(self.file_path) or meta.get("url") != self.config.source_URL:
+            return False
+        if meta.get("size") != os.path.getsize(self.file_path):
+            return False
+        if self.config.source_sha256 and meta.get("sha256") != self.config.source_sha256:
+            return False
+
+        headers = self._validator_headers(meta)
+        if not headers:
+            return False
+        try:
+            req = request.Request(self.config.source_URL, method="HEAD", headers=headers)
+            with request.urlopen(req, timeout=TIMEOUT_SECONDS) as response:
+                # Servers ignoring conditional headers still let us compare validators
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                return bool((etag and etag == meta.get("etag")) or
+                            (not etag and last_modified and last_modified == meta.get("last_modified")))
+        except HTTPError as e:
+            if e.code == 304:
+                return True
+            logger.warning(f"HEAD request failed ({e.code}), downloading again")
+            return False
+        except (URLError, HTTPException, OSError) as e:
+            # Offline, or a read timeout (a bare TimeoutError): keep using the verified local copy
+            logger.warning(f"Source unreachable ({getattr(e, 'reason', e)}), using the local copy")
+            return True
+
+    def _stream_to_part(self, digest, meta: dict) -> tuple:
+        """
+        Download the source into the .part file, resuming from its current size with an
+        HTTP Range request. The digest is updated with every byte written.
+
+        Returns:
+            tuple: (digest of the whole .part file, ETag and Last-Modified of the resource)
+        """
+        offset = os.path.getsize(self.part_path) if os.path.exists(self.part_path) else 0
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            # Only resume if the remote file is still the one we started downloading
+            validator = meta.get("partial_etag") or meta.get("partial_last_modified")
+            if validator:
+                headers["If-Range"] = validator
+
+        req = request.Request(self.config.source_URL, headers=headers)
+        with request.urlopen(req, timeout=TIMEOUT_SECONDS) as response:
+            if offset and response.status == 206:
+                logger.info(f"Resuming download at byte {offset}")
+                mode = 'ab'
+            else:
+                # Full response: start over
+                digest = hashlib.sha256()
+                mode = 'wb'
+            validators = {
+                "partial_etag": response.headers.get("ETag"),
+                "partial_last_modified": response.headers.get("Last-Modified"),
+            }
+            self._save_meta({**meta, **validators})
+            expected = response.headers.get("Content-Length")
+            received = 0
+            with open(self.part_path, mode) as f:
+                for block in iter(lambda: response.read(CHUNK_SIZE), b""):
+                    f.write(block)
+                    digest.update(block)
+                    received += len(block)
+            # A dropped connection can look like a normal end of stream
+            if expected is not None and received < int(expected):
+                raise ConnectionError(f"Connection closed after {received} of {expected} bytes")
+        return digest, validators
+
+    def _hash_part(self):
+        """Return a sha256 digest primed with the bytes already in the .part file."""
+        digest = hashlib.sha256()
+        if os.path.exists(self.part_path):
+            with open(self.part_path, 'rb') as f:
+                for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(block)
+        return digest
+
+    def _has_usable_copy(self) -> bool:
+        """Whether the existing local file can be used when the source is unreachable."""
+        if not os.path.exists(self.file_path) or not self.verify_zip_file(self.file_path):
+            return False
+        if self.config.source_sha256:
+            return self._load_meta().get("sha256") == self.config.source_sha256
+        return True
+
     def download_file(self):
         """
-        Downloads file from source URL if it doesn't exist locally
+        Downloads the file from the source URL unless the local copy is still current.
+
+        The download is streamed in chunks into a .part file and resumed with HTTP Range
+        requests after an interruption. When source_sha256 is configured, the checksum
+        computed while streaming must match it before the file is moved into place.
         """
         try:
-            file_path = str(self.config.local_data_file)
-            if not os.path.exists(file_path):
-                # Create directory if it doesn't exist
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                
-                logger.info(f"Downloading from {self.config.source_URL} to {file_path}")
-                filename, headers = request.urlretrieve(
-                    url=self.config.source_URL,
-                    filename=file_path
-                )
-                logger.info(f"File downloaded successfully to: {filename}")
-                logger.debug(f"Download headers: {headers}")
-            
-            # Verify the file whether it was just downloaded or existed before
-            if not self.verify_zip_file(file_path):
-                # If file exists but is invalid, try to download again
-                logger.warning("Invalid ZIP file detected, attempting to download again...")
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                filename, headers = request.urlretrieve(
-                    url=self.config.source_URL,
-                    filename=file_path
-                )
-                if not self.verify_zip_file(file_path):
-                    raise Exception("Failed to download a valid ZIP file")
-            
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            if self.is_up_to_date():
+                logger.info(f"{self.file_path} is up to date with {self.config.source_URL}")
+                return
+
+            logger.info(f"Downloading from {self.config.source_URL} to {self.file_path}")
+            meta = self._load_meta()
+            if meta.get("url") != self.config.source_URL and os.path.exists(self.part_path):
+                # Partial download of another source, cannot be resumed
+                os.remove(self.part_path)
+            meta["url"] = self.config.source_URL
+
+            digest = self._hash_part()
+            for attempt in range(1, MAX_RETRIES + 1):
+                try:
+                    digest, validators = self._stream_to_part(digest, meta)
+                    break
+                except (URLError, HTTPException, OSError) as e:
+                    if isinstance(e, HTTPError) and e.code == 416:
+                        # Our partial file does not fit the remote one anymore
+                        os.remove(self.part_path)
+                    if attempt == MAX_RETRIES:
+                        if self._has_usable_copy():
+                            logger.warning(f"Download failed ({str(e)}), keeping the existing {self.file_path}")
+                            return
+                        raise
+                    logger.warning(f"Download interrupted ({str(e)}), resuming (attempt {attempt + 1}/{MAX_RETRIES})")
+                    meta = self._load_meta()
+                    # Re-hash what actually reached the disk before resuming
+                    digest = self._hash_part()
+
+            sha256 = digest.hexdigest()
+            if self.config.source_sha256 and sha256 != self.config.source_sha256:
+                os.remove(self.part_path)
+                raise ValueError(f"Checksum mismatch for {self.config.source_URL}: "
+                                 f"expected {self.config.source_sha256}, got {sha256}")
+            if not self.verify_zip_file(self.part_path):
+                os.remove(self.part_path)
+                raise Exception("Failed to download a valid ZIP file")
+
+            os.replace(self.part_path, self.file_path)
+            self._save_meta({
+                "url": self.config.source_URL,
+                "etag": validators["partial_etag"],
+                "last_modified": validators["partial_last_modified"],
+                "sha256": sha256,
+                "size": os.path.getsize(self.file_path),
+            })
+            logger.info(f"File downloaded successfully to: {self.file_path} (sha256 {sha256})")
+
         except Exception as e:
             logger.error(f"Error downloading file: {str(e)}")
             raise e
@@ -65,18 +219,29 @@ class DataIngestion:
         try:
             file_path = str(self.config.local_data_file)
             unzip_path = str(self.config.unzip_dir)
-            
+
             # Verify zip file before attempting to extract
             if not self.verify_zip_file(file_path):
                 raise Exception("Cannot extract: Invalid ZIP file")
-            
+
             os.makedirs(unzip_path, exist_ok=True)
-            
+
             with zipfile.ZipFile(file_path, 'r') as zip_ref:
                 # List contents before extracting
                 logger.info(f"ZIP file contains: {zip_ref.namelist()}")
-                zip_ref.extractall(unzip_path)
-            logger.info(f"File extracted successfully to: {unzip_path}")
+                # Skip members already extracted from this archive
+                zip_mtime = os.path.getmtime(file_path)
+                stale = [info for info in zip_ref.infolist()
+                         if not self._is_extracted(os.path.join(unzip_path, info.filename), info, zip_mtime)]
+                for info in stale:
+                    zip_ref.extract(info, unzip_path)
+            logger.info(f"Extracted {len(stale)} file(s) to: {unzip_path}")
         except Exception as e:
             logger.error(f"Error extracting file: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e
+
+    @staticmethod
+    def _is_extracted(path: str, info: zipfile.ZipInfo, zip_mtime: float) -> bool:
+        return (not info.is_dir() and os.path.exists(path)
+                and os.path.getsize(path) == info.file_size
+                and os.path.getmtime(path) >= zip_mtime)
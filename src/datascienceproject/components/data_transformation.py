@@ -1,9 +1,11 @@
 import os
+import numpy as np
 from pathlib import Path
 from src.datascienceproject import logger
 from sklearn.model_selection import train_test_split
-import pandas as pd
 from src.datascienceproject.entity.config_entity import DataTransformationConfig
+from src.datascienceproject.utils.data_io import load_dataset, save_split
+from src.datascienceproject.utils.instrumentation import record_rows
 
 class DataTransformation:
     def __init__(self, config: DataTransformationConfig):
@@ -12,23 +14,27 @@ class DataTransformation:
     #You can perform all kinds of EDA in ML cycle here before passing this data to the model
 
     # I am only adding train_test_spliting cz this data is already cleaned up
-    def split_data(self):
-        # Read data with semicolon separator
-        data = pd.read_csv(self.config.data_path, sep=';')
+    def split_data(self) -> dict:
+        """Split the dataset, save both splits and return them as (X, y) arrays."""
+        # Read data with semicolon separator and the schema dtypes
+        data = load_dataset(self.config.data_path, self.config.all_schema)
+        record_rows(len(data))
 
         # Split the data
-        train, test = train_test_split(data, test_size=0.2, random_state=42)
+        train, test = train_test_split(data, test_size=self.config.test_size, random_state=self.config.random_state)
         
-        # Save with semicolon separator to maintain consistency
-        train.to_csv(os.path.join(self.config.root_dir, "train.csv"), sep=';', index=False)
-        test.to_csv(os.path.join(self.config.root_dir, "test.csv"), sep=';', index=False)
+        # Save in the configured artifact format so later stages don't re-parse text
+        for name, split in (("train", train), ("test", test)):
+            save_split(split, os.path.join(self.config.root_dir, name), self.config.artifact_format,
+                       self.config.target_column, export_csv=self.config.export_csv)
 
         logger.info("Columns in training data: %s", train.columns.tolist())
 
-        logger.info("Split data into training and test sets")
-        logger.info(train.shape)
-        logger.info(test.shape)
-
-        print(train.shape)
-        print(test.shape)
+        logger.info("Split data into training %s and test %s sets", train.shape, test.shape)
 
+        # Handed to training and evaluation in memory, the saved files are checkpoints
+        features = [col for col in self.config.all_schema if col != self.config.target_column]
+        return {
+            name: (split[features].to_numpy(dtype=np.float64), split[self.config.target_column].to_numpy())
+            for name, split in (("train", train), ("test", test))
+        }
@@ -1,8 +1,12 @@
 import os
+import json
+import time
+import numpy as np
 from src.datascienceproject import logger
 from src.datascienceproject.entity.config_entity import (DataValidationConfig)
+from src.datascienceproject.utils.data_io import open_dataset, parse_header
+from src.datascienceproject.utils.instrumentation import record_rows
 import pandas as pd
-from pathlib import Path
 
 class DataValiadtion:
     def __init__(self, config: DataValidationConfig):
@@ -10,46 +14,145 @@ class DataValiadtion:
         # Create the directory for status file if it doesn't exist
         #create_directories([Path(self.config.root_dir)])
 
+    def _bounds(self, columns: list) -> tuple:
+        """Return (lower, upper) arrays of the schema.yaml BOUNDS, -inf/inf where unset."""
+        lower = np.full(len(columns), -np.inf)
+        upper = np.full(len(columns), np.inf)
+        for i, col in enumerate(columns):
+            bounds = self.config.bounds.get(col) or {}
+            if bounds.get("min") is not None:
+                lower[i] = bounds["min"]
+            if bounds.get("max") is not None:
+                upper[i] = bounds["max"]
+        return lower, upper
+
+    def _write_report(self, report: dict):
+        tmp_path = str(self.config.STATUS_FILE) + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=4)
+        os.replace(tmp_path, self.config.STATUS_FILE)
+
     def validate_all_columns(self)-> bool:
+        """
+        Validate the dataset against schema.yaml in a single streaming pass.
+
+        The header is checked for missing and extra columns first. Rows are then parsed
+        in chunks of chunk_rows as float64 and checked column-wise with numpy: null
+        counts, min/max, values outside the schema BOUNDS and non-integer values in int
+        columns. Memory stays bounded by the chunk size whatever the file size. With
+        fail_fast, the scan stops at the first chunk with a violation.
+
+        The result is written as a JSON report to STATUS_FILE.
+
+        Returns:
+            bool: True if no violation was found
+        """
         try:
-            validation_status = True
-            validation_message = []
-
-            # Read CSV with proper separator
-            data = pd.read_csv(self.config.unzip_data_dir, sep=";")
-            all_cols = list(data.columns)
-            all_schema = self.config.all_schema.keys()
-
-            # Check for missing columns
-            missing_cols = set(all_schema) - set(all_cols)
-            if missing_cols:
-                validation_status = False
-                validation_message.append(f"Missing columns: {missing_cols}")
-
-            # Check for extra columns
-            extra_cols = set(all_cols) - set(all_schema)
-            if extra_cols:
-                validation_status = False
-                validation_message.append(f"Extra columns: {extra_cols}")
-
-            # Check data types
-            for col in all_cols:
-                if col in all_schema:
-                    expected_type = self.config.all_schema[col]
-                    actual_type = str(data[col].dtype)
-                    if expected_type != actual_type:
-                        validation_status = False
-                        validation_message.append(f"Type mismatch for '{col}': expected {expected_type}, got {actual_type}")
-
-            # Write validation status and details
-            with open(self.config.STATUS_FILE, 'w') as f:
-                f.write(f"Validation status: {validation_status}\n")
-                if validation_message:
-                    f.write("\nValidation details:\n")
-                    f.write("\n".join(validation_message))
+            start = time.perf_counter()
+            all_schema = self.config.all_schema
+            violations = []
+            report = {"file": str(self.config.unzip_data_dir), "rows": 0, "chunks": 0, "complete": False}
+
+            with open_dataset(self.config.unzip_data_dir) as f:
+                all_cols = parse_header(f.readline())
+
+                # Check for missing and extra columns
+                missing_cols = [col for col in all_schema if col not in all_cols]
+                if missing_cols:
+                    violations.append({"check": "missing_columns", "columns": missing_cols})
+                extra_cols = [col for col in all_cols if col not in all_schema]
+                if extra_cols:
+                    violations.append({"check": "extra_columns", "columns": extra_cols})
+
+                # Numeric columns are checked as one float64 matrix per chunk; others only for nulls
+                columns = [col for col in all_schema if col in all_cols]
+                numeric = np.array([np.issubdtype(np.dtype(all_schema[col]), np.number) for col in columns])
+                integer = np.array([np.issubdtype(np.dtype(all_schema[col]), np.integer) for col in columns])
+                lower, upper = self._bounds(columns)
+
+                nulls = np.zeros(len(columns), dtype=np.int64)
+                out_of_range = np.zeros(len(columns), dtype=np.int64)
+                non_integer = np.zeros(len(columns), dtype=np.int64)
+                col_min = np.full(len(columns), np.nan)
+                col_max = np.full(len(columns), np.nan)
+
+                if not violations:
+                    reader = pd.read_csv(
+                        f,
+                        sep=";",
+                        header=None,
+                        names=all_cols,
+                        usecols=columns,
+                        dtype={col: np.float64 if is_num else object for col, is_num in zip(columns, numeric)},
+                        chunksize=self.config.chunk_rows,
+                    )
+                    try:
+                        for chunk in reader:
+                            chunk = chunk[columns]
+                            values = chunk.to_numpy(dtype=np.float64) if numeric.all() else None
+                            if values is None:
+                                nulls += chunk.isna().to_numpy().sum(axis=0)
+                                values = chunk.loc[:, numeric].to_numpy(dtype=np.float64)
+                                idx = np.flatnonzero(numeric)
+                            else:
+                                nulls += np.isnan(values).sum(axis=0)
+                                idx = slice(None)
+
+                            # fmin/fmax skip NaN; comparisons with NaN are False
+                            col_min[idx] = np.fmin(col_min[idx], np.fmin.reduce(values, axis=0))
+                            col_max[idx] = np.fmax(col_max[idx], np.fmax.reduce(values, axis=0))
+                            out_of_range[idx] += ((values < lower[idx]) | (values > upper[idx])).sum(axis=0)
+                            non_integer[idx] += ((values != np.round(values)) & ~np.isnan(values)
+                                                 & integer[idx]).sum(axis=0)
+
+                            report["rows"] += len(chunk)
+                            report["chunks"] += 1
+                            if self.config.fail_fast and (nulls.any() or out_of_range.any() or non_integer.any()):
+                                logger.warning(f"Violation found in chunk {report['chunks']}, stopping validation")
+                                break
+                        else:
+                            report["complete"] = True
+                    except ValueError as e:
+                        # Values that do not parse as numbers
+                        violations.append({"check": "type", "message": str(e)})
+                    finally:
+                        reader.close()
+
+                bytes_read = getattr(f.raw, "bytes_read", None) or f.tell()
+
+            for i, col in enumerate(columns):
+                for check, counts in (("nulls", nulls), ("out_of_range", out_of_range), ("non_integer", non_integer)):
+                    if counts[i]:
+                        violations.append({"check": check, "column": col, "count": int(counts[i])})
+
+            elapsed = time.perf_counter() - start
+            validation_status = not violations
+            report.update(
+                validation_status=validation_status,
+                violations=violations,
+                duration_seconds=elapsed,
+                mib_per_second=bytes_read / 2**20 / elapsed if elapsed else 0.0,
+                columns={
+                    col: {
+                        "dtype": all_schema[col],
+                        "nulls": int(nulls[i]),
+                        "min": None if np.isnan(col_min[i]) else float(col_min[i]),
+                        "max": None if np.isnan(col_max[i]) else float(col_max[i]),
+                        "bounds": self.config.bounds.get(col) or {},
+                        "out_of_range": int(out_of_range[i]),
+                        "non_integer": int(non_integer[i]),
+                    }
+                    for i, col in enumerate(columns)
+                },
+            )
+            self._write_report(report)
+            record_rows(report["rows"])
+            logger.info(f"Validated {report['rows']} rows in {elapsed:.2f}s "
+                        f"({report['mib_per_second']:.1f} MiB/s): status {validation_status}, "
+                        f"{len(violations)} violation(s)")
 
             return validation_status
-        
+
         except Exception as e:
             logger.error(f"Error occurred during data validation: {e}")
-            raise e
\ No newline at end of file
+            raise e
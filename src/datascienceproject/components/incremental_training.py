@@ -0,0 +1,107 @@
+"""
+Out-of-core training of an elastic-net linear model with ``partial_fit``.
+
+The training split is never loaded whole: it is read as a sequence of chunks (see
+``iter_xy_chunks``), and only one chunk is in memory at a time. A first pass fits a
+``StandardScaler`` incrementally; the following passes (epochs) feed the standardized
+chunks to an ``SGDRegressor`` with the elastic-net penalty. Both are returned as one
+sklearn ``Pipeline``, which predicts from raw features like the batch ``ElasticNet``.
+
+With the squared loss, ``SGDRegressor`` minimizes the same objective as ``ElasticNet``:
+``1/(2n) * ||y - Xw||^2 + alpha * l1_ratio * ||w||_1 + alpha * (1 - l1_ratio) / 2 * ||w||^2``,
+so alpha and l1_ratio keep their meaning. The penalty applies to the coefficients of the
+standardized features, though, so the fitted model is not identical to a batch fit on
+raw features.
+
+Each epoch reports its progressive validation RMSE: every chunk is scored before the
+model is updated on it, which estimates the generalization error without a held-out set.
+"""
+
+import math
+import time
+
+import numpy as np
+from sklearn.linear_model import SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from src.datascienceproject import logger
+
+
+def array_chunks(X, y, chunk_rows: int, order=None):
+    """Yield (X, y) chunks of in-memory arrays, in the given chunk order."""
+    n_chunks = math.ceil(len(y) / chunk_rows)
+    for i in (range(n_chunks) if order is None else order):
+        start = i * chunk_rows
+        yield np.asarray(X[start:start + chunk_rows]), np.asarray(y[start:start + chunk_rows], dtype=np.float64)
+
+
+def fit_incremental(chunks, alpha: float, l1_ratio: float, epochs: int = 5, learning_rate: str = "invscaling",
+                    eta0: float = 0.01, tol: float = None, shuffle: bool = True, random_state: int = 42) -> tuple:
+    """Fit a standardized SGD elastic-net model over chunks of the training data.
+
+    Args:
+        chunks (callable): called with an epoch's ``np.random.Generator`` (or None for the
+            scaling pass), returns an iterable of (X, y) chunks. Each call is a new pass
+            over the data, in a chunk order the callable may shuffle with the generator.
+        alpha (float): regularization strength, as for ElasticNet.
+        l1_ratio (float): L1 share of the penalty, as for ElasticNet.
+        epochs (int): maximum number of passes over the data.
+        learning_rate (str): SGDRegressor learning rate schedule.
+        eta0 (float): initial learning rate.
+        tol (float): stop when an epoch improves the progressive RMSE by less than tol.
+            None always runs every epoch.
+        shuffle (bool): shuffle the rows within each chunk, and let chunks shuffle their order.
+        random_state (int): seed of the shuffles and of SGDRegressor.
+
+    Returns:
+        tuple: (Pipeline of the scaler and the regressor, training report dict)
+    """
+    start = time.perf_counter()
+    scaler = StandardScaler()
+    rows = 0
+    for X, _ in chunks(None):
+        scaler.partial_fit(X)
+        rows += len(X)
+    if not rows:
+        raise ValueError("The training split is empty")
+    scaling_seconds = time.perf_counter() - start
+    logger.info(f"Fitted the feature scaler on {rows} rows in {scaling_seconds:.2f}s")
+
+    rng = np.random.default_rng(random_state)
+    model = SGDRegressor(penalty="elasticnet", alpha=alpha, l1_ratio=l1_ratio, learning_rate=learning_rate,
+                         eta0=eta0, random_state=random_state)
+    history = []
+    for epoch in range(1, epochs + 1):
+        epoch_start = time.perf_counter()
+        sse, seen = 0.0, 0
+        for X, y in chunks(rng if shuffle else None):
+            X = scaler.transform(X)
+            if shuffle:
+                perm = rng.permutation(len(y))
+                X, y = X[perm], y[perm]
+            # Score the chunk before learning from it (progressive validation)
+            if hasattr(model, "coef_"):
+                residuals = y - model.predict(X)
+                sse += float(residuals @ residuals)
+                seen += len(y)
+            model.partial_fit(X, y)
+        rmse = math.sqrt(sse / seen) if seen else None
+        history.append({"epoch": epoch, "progressive_rmse": rmse, "seconds": time.perf_counter() - epoch_start})
+        logger.info(f"Epoch {epoch}/{epochs}: progressive RMSE {rmse if rmse is None else round(rmse, 5)}")
+
+        previous = history[-2]["progressive_rmse"] if len(history) > 1 else None
+        if tol is not None and previous is not None and previous - rmse < tol:
+            logger.info(f"Progressive RMSE improved by less than {tol}, stopping after epoch {epoch}")
+            break
+
+    report = {
+        "rows": rows,
+        "epochs_run": len(history),
+        "alpha": alpha,
+        "l1_ratio": l1_ratio,
+        "scaling_seconds": scaling_seconds,
+        "total_seconds": time.perf_counter() - start,
+        "history": history,
+    }
+    return Pipeline([("scaler", scaler), ("model", model)]), report
@@ -1,17 +1,18 @@
 # set up evaluation matrics
 import os
-import pandas as pd
+import time
+from pathlib import Path
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from urllib.parse import urlparse
-import mlflow
-import mlflow.sklearn
 import numpy as np
 import joblib
 from src.datascienceproject.entity.config_entity import ModelEvaluationConfig
 # set up configuration manager
 from src.datascienceproject.constant import *  # Import all constants
 from src.datascienceproject.utils.common import save_json  
-import os
+from src.datascienceproject.utils.data_io import load_xy
+from src.datascienceproject.utils.tracking import MlflowTracker
+from src.datascienceproject.utils.instrumentation import record_rows
+from src.datascienceproject.utils.metrics import bootstrap_intervals, sliced_metrics, value_slices, quantile_slices
 #os.environ["MLFLOW_TRACKING_URI"] = "https://dagshub.com/akatoshleiwu/datascienceproject_fullflow.mlflow"
 #os.environ["MLFLOW_TRACKING_USERNAME"] = 
 #os.environ["MLFLOW_TRACKING_PASSWORD"] = 
@@ -21,35 +22,9 @@ class ModelEvaluation:
     def __init__(self, config: ModelEvaluationConfig):
         self.config = config
 
-    def _preprocess_data(self, file_path):
-        # Read the raw data
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Get column names from first line, removing extra quotes
-        headers = lines[0].strip().strip('"').split(';')
-        headers = [h.strip('"') for h in headers]
-        
-        # Process data rows
-        data_rows = []
-        for line in lines[1:]:
-            values = line.strip().split(';')
-            data_rows.append(values)
-            
-        # Create DataFrame
-        df = pd.DataFrame(data_rows, columns=headers)
-        
-        # Convert numeric columns to appropriate types
-        for col in df.columns:
-            if col != 'quality':  # All columns except quality should be float
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            else:
-                df[col] = pd.to_numeric(df[col], errors='coerce', downcast='integer')
-        
-        print(f"Processed data columns: {df.columns.tolist()}")
-        print(f"First few rows of processed data:\n{df.head()}")
-        
-        return df
+    def _load_split(self, stem):
+        # npy splits are memory-mapped, other formats are parsed with the schema dtypes
+        return load_xy(stem, self.config.artifact_format, self.config.all_schema, self.config.TARGET_COLUMN)
 
     def eval_metrics(self,actual, pred):
         rmse = np.sqrt(mean_squared_error(actual, pred))
@@ -57,46 +32,70 @@ class ModelEvaluation:
         r2 = r2_score(actual, pred)
         return rmse, mae, r2
     
-    def log_into_mlflow(self):
-        # Preprocess the test data
-        test_data = self._preprocess_data(self.config.test_data_path)
-        model = joblib.load(self.config.model_path)
+    def detailed_metrics(self, test_x, actual, pred) -> dict:
+        """Bootstrap confidence intervals and per-slice metrics, as configured in config.yaml."""
+        details = {}
+        bootstrap = self.config.bootstrap
+        if bootstrap.get("resamples", 0) > 0:
+            start = time.perf_counter()
+            details["confidence_intervals"] = bootstrap_intervals(
+                actual, pred,
+                resamples=bootstrap["resamples"],
+                confidence=bootstrap.get("confidence", 0.95),
+                random_state=bootstrap.get("random_state", 42),
+            )
+            details["bootstrap"] = {"resamples": bootstrap["resamples"],
+                                    "confidence": bootstrap.get("confidence", 0.95),
+                                    "seconds": time.perf_counter() - start}
 
-        test_x = test_data.drop([self.config.TARGET_COLUMN], axis=1)
-        test_y = test_data[[self.config.TARGET_COLUMN]]
+        slices = {}
+        if self.config.slices.get("by_target", False):
+            slices[self.config.TARGET_COLUMN] = sliced_metrics(actual, pred, *value_slices(actual))
+        features = [col for col in self.config.all_schema if col != self.config.TARGET_COLUMN]
+        for feature in self.config.slices.get("features", []):
+            keys, labels = quantile_slices(test_x[:, features.index(feature)], self.config.slices.get("quantile_bins", 4))
+            slices[f"{feature} quantile"] = sliced_metrics(actual, pred, keys, labels)
+        if slices:
+            details["slices"] = slices
+        return details
 
+    def log_into_mlflow(self, test=None, model=None):
+        """Evaluate the model on the test split, save the metrics and log the run to MLflow.
 
-        # Set tracking URI but don't set registry URI for DagsHub
-        tracking_url_type_store = urlparse(mlflow.get_tracking_uri()).scheme
+        The MLflow run is logged in the background by an MlflowTracker (spooled locally when
+        the tracking server is unreachable), so this returns as soon as metrics.json is written.
 
-        # Start an MLflow run
-        with mlflow.start_run():
-            # Make predictions
-            predicted_qualities = model.predict(test_x)
-            
-            # Calculate metrics
-            (rmse, mae, r2) = self.eval_metrics(test_y, predicted_qualities)
-            
-            # Save metrics locally
-            from anyio import Path as AnyioPath
-            scores = {"rmse": rmse, "mae": mae, "r2": r2}
-            save_json(path=AnyioPath(str(self.config.metrics_file_name)), data=scores)
+        Args:
+            test (tuple): (X, y) arrays of the test split. Loaded from disk if not given.
+            model: the fitted model. Loaded from model_path if not given.
 
-            # Log parameters and metrics to MLflow
-            mlflow.log_params(self.config.all_params)
-            mlflow.log_metric("rmse", rmse)
-            mlflow.log_metric("r2", r2)
-            mlflow.log_metric("mae", mae)
+        Returns:
+            MlflowTracker: the tracker logging the run; call wait() to block until it is sent
+        """
+        # Use the in-memory test split and model when given, else load them from disk
+        test_x, test_y = test if test is not None else self._load_split(self.config.test_data_path)
+        model = model if model is not None else joblib.load(self.config.model_path)
 
-            # Log the model without registration
-            try:
-                # Log model artifacts
-                mlflow.sklearn.log_model(
-                    sk_model=model,
-                    artifact_path="model",
-                )
-                print(f"Model logged successfully in run {mlflow.active_run().info.run_id}")
-            except Exception as e:
-                print(f"Warning: Error while logging model: {str(e)}")
-                print("Continuing with metric logging...")
-    
+        # Make predictions
+        predicted_qualities = model.predict(test_x)
+        record_rows(len(test_y))
+
+        # Calculate metrics
+        (rmse, mae, r2) = self.eval_metrics(test_y, predicted_qualities)
+
+        # Save metrics locally, with confidence intervals and per-slice metrics
+        scores = {"rmse": rmse, "mae": mae, "r2": r2}
+        details = self.detailed_metrics(test_x, test_y, predicted_qualities)
+        save_json(path=Path(self.config.metrics_file_name), data={**scores, **details})
+
+        # In tuning mode the fitted model holds the selected alpha/l1_ratio, not params.yaml's.
+        # Streaming training saves a scaler + SGDRegressor Pipeline: read the final step
+        estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+        params = {key: value for key, value in self.config.all_params.items() if key != "search"}
+        params.update(alpha=estimator.alpha, l1_ratio=estimator.l1_ratio, estimator=type(estimator).__name__)
+
+        # Params and metrics go in one batched call, the model is uploaded in the background
+        tracker = MlflowTracker(self.config.mlflow_uri, self.config.mlflow_spool_dir,
+                                timeout=self.config.mlflow_timeout)
+        tracker.log_run(params=params, metrics=scores, model=model)
+        return tracker
@@ -1,67 +1,184 @@
-import pandas as pd
 import os
+import json
+import math
 from src.datascienceproject import logger
 from sklearn.linear_model import ElasticNet
 import joblib
 
 from src.datascienceproject.entity.config_entity import ModelTrainerConfig
+from src.datascienceproject.utils.data_io import iter_xy_chunks, load_xy
+from src.datascienceproject.components.model_search import expand_grid, search_elastic_net
+from src.datascienceproject.components.cross_validation import cross_validate
+from src.datascienceproject.components.incremental_training import array_chunks, fit_incremental
+from src.datascienceproject.utils.instrumentation import record_rows
+from src.datascienceproject.utils.linear_scorer import check_parity, export_linear_scorer
+
+# Training rows used to check the exported scorer against the model
+PARITY_ROWS = 1000
 
 class ModelTrainer:
     def __init__(self, config: ModelTrainerConfig):
         self.config = config
 
-    def _preprocess_data(self, file_path):
-        # Read the raw data
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Get column names from first line, removing extra quotes
-        headers = lines[0].strip().strip('"').split(';')
-        headers = [h.strip('"').strip() for h in headers]  # Strip both quotes and whitespace
-        
-        # Process data rows
-        data_rows = []
-        for line in lines[1:]:
-            # Split by semicolon and clean each value
-            values = [val.strip().strip('"').strip() for val in line.strip().split(';')]
-            data_rows.append(values)
-            
-        # Create DataFrame
-        df = pd.DataFrame(data_rows, columns=headers)
-        
-        # Convert numeric columns to appropriate types
-        for col in df.columns:
-            if col != 'quality':  # All columns except quality should be float
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            else:
-                df[col] = pd.to_numeric(df[col], errors='coerce', downcast='integer')
-        
-        logger.info(f"Processed data columns: {df.columns.tolist()}")
-        logger.info(f"First few rows of processed data:\n{df.head()}")
-        
-        return df
-
-    def train(self):
-        # Load and preprocess data
-        train_data = self._preprocess_data(self.config.train_data_path)
-        test_data = self._preprocess_data(self.config.test_data_path)
-        
-        print("Available columns in training data:")
-        print(train_data.columns.tolist())
-        print("\nTarget column we're looking for:", self.config.target_column)
-        
-        # Add separator for readability
-        print("\nFirst few rows of training data:")
-        print(train_data.head())
-        
-        train_X = train_data.drop(columns=[self.config.target_column], axis=1)
-        test_X = test_data.drop(columns=[self.config.target_column], axis=1)
-        train_y = train_data[self.config.target_column]
-        test_y = test_data[self.config.target_column]
-
-        lr = ElasticNet(alpha=self.config.alpha, l1_ratio=self.config.l1_ratio, random_state=42)
-        lr.fit(train_X, train_y)
-
-        joblib.dump(lr, os.path.join(self.config.root_dir, self.config.model_name))
-        
-        logger.info("Model training completed.")
\ No newline at end of file
+    def _load_split(self, stem):
+        # npy splits are memory-mapped, other formats are parsed with the schema dtypes
+        X, y = load_xy(stem, self.config.artifact_format, self.config.all_schema, self.config.target_column)
+        logger.info(f"Loaded {stem} ({self.config.artifact_format}): X{X.shape}, y{y.shape}")
+        return X, y
+
+    def tune(self, X, y) -> dict:
+        """Search the alpha/l1_ratio grid of params.yaml and write the leaderboard.
+
+        Returns:
+            dict: the best alpha and l1_ratio
+        """
+        search = self.config.search
+        result = search_elastic_net(
+            X, y,
+            alphas=expand_grid(search["alpha"]),
+            l1_ratios=expand_grid(search["l1_ratio"]),
+            validation_size=search.get("validation_size", 0.2),
+            n_jobs=search.get("n_jobs", -1),
+        )
+        leaderboard_path = self._save_json(self.config.leaderboard_name, result)
+        logger.info(f"Leaderboard of {result['grid_size']} configurations saved to {leaderboard_path}")
+        return result["best_params"]
+
+    def _save_json(self, name, data):
+        path = os.path.join(self.config.root_dir, name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, path)
+        return path
+
+    def cross_validate(self, X, y, params: dict) -> dict:
+        """Run k-fold cross-validation of the given parameters and write the CV report."""
+        cv = self.config.cross_validation
+        report = cross_validate(
+            X, y, params,
+            work_dir=os.path.join(self.config.root_dir, "cv"),
+            folds=cv.get("folds", 5),
+            n_jobs=cv.get("n_jobs", -1),
+            random_state=cv.get("random_state", 42),
+        )
+        path = self._save_json(self.config.cv_report_name, report)
+        logger.info(f"Cross-validation report saved to {path}")
+        return report
+
+    def _chunk_source(self, train=None):
+        """Return a callable giving a new pass of (X, y) chunks over the training split.
+
+        In-memory and memory-mapped (npy) splits are sliced, in a chunk order shuffled by
+        the generator the callable receives. Other formats are read sequentially from disk.
+        """
+        chunk_rows = self.config.streaming.get("chunk_rows", 100000)
+        if train is None and self.config.artifact_format != "npy":
+            return lambda rng: iter_xy_chunks(self.config.train_data_path, self.config.artifact_format,
+                                              self.config.all_schema, self.config.target_column, chunk_rows)
+
+        X, y = train if train is not None else self._load_split(self.config.train_data_path)
+        n_chunks = math.ceil(len(y) / chunk_rows)
+        return lambda rng: array_chunks(X, y, chunk_rows, None if rng is None else rng.permutation(n_chunks))
+
+    def train_streaming(self, train=None):
+        """Fit an SGD elastic-net model over chunks of the training split.
+
+        Memory is bounded by streaming.chunk_rows. Grid search and cross-validation need the
+        whole split in memory and are skipped in this mode.
+
+        Returns:
+            Pipeline: the fitted scaler and SGDRegressor
+        """
+        streaming = self.config.streaming
+        if self.config.search.get("enabled", False) or self.config.cross_validation.get("enabled", False):
+            logger.warning("Search and cross-validation are not run in streaming mode, "
+                           "using alpha and l1_ratio from params.yaml")
+
+        model, report = fit_incremental(
+            self._chunk_source(train),
+            alpha=self.config.alpha,
+            l1_ratio=self.config.l1_ratio,
+            epochs=streaming.get("epochs", 5),
+            learning_rate=streaming.get("learning_rate", "invscaling"),
+            eta0=streaming.get("eta0", 0.01),
+            tol=streaming.get("tol"),
+            shuffle=streaming.get("shuffle", True),
+            random_state=streaming.get("random_state", 42),
+        )
+        record_rows(report["rows"])
+        report["chunk_rows"] = streaming.get("chunk_rows", 100000)
+        path = self._save_json(self.config.streaming_report_name, report)
+        logger.info(f"Streaming training report saved to {path}")
+        return model
+
+    def export_scorer(self, model, sample_X):
+        """Export the model as a linear scorer next to it, checked against model.predict.
+
+        A stale scorer is removed when the model cannot be exported, so that serving falls
+        back to the model artifact instead of scoring with outdated coefficients.
+
+        Returns:
+            str: path of the scorer, or None if it was not exported
+        """
+        if not self.config.scorer_name:
+            return None
+        scorer_path = os.path.join(self.config.root_dir, self.config.scorer_name)
+        features = [col for col in self.config.all_schema if col != self.config.target_column]
+        try:
+            scorer = export_linear_scorer(model, features, scorer_path)
+            max_diff = check_parity(model, scorer, sample_X)
+        except ValueError as e:
+            logger.warning(f"Linear scorer not exported: {str(e)}")
+            if os.path.exists(scorer_path):
+                os.remove(scorer_path)
+            return None
+        logger.info(f"Linear scorer saved to {scorer_path} (max difference to the model {max_diff:.2e})")
+        return scorer_path
+
+    def train(self, train=None):
+        """Fit the model on the training split and save it.
+
+        In tuning mode (search.enabled in params.yaml), the grid is searched first and
+        the model is refitted on the whole training split with the best parameters. With
+        cross_validation enabled in config.yaml, the selected parameters are also
+        cross-validated on the training split.
+
+        With streaming enabled in config.yaml, the model is trained out-of-core instead
+        (see train_streaming) and saved through the same model_name artifact. Either way,
+        the model is also exported as a numpy-only linear scorer for serving (scorer_name).
+
+        Args:
+            train (tuple): (X, y) arrays of the training split. Loaded from disk if not given.
+
+        Returns:
+            ElasticNet | Pipeline: the fitted model
+        """
+        if self.config.streaming.get("enabled", False):
+            lr = self.train_streaming(train)
+            sample_X = next(iter(self._chunk_source(train)(None)))[0][:PARITY_ROWS]
+        else:
+            # Load the training split (the test split is only needed by evaluation)
+            train_X, train_y = train if train is not None else self._load_split(self.config.train_data_path)
+            record_rows(len(train_y))
+
+            params = {"alpha": self.config.alpha, "l1_ratio": self.config.l1_ratio}
+            if self.config.search.get("enabled", False):
+                params = self.tune(train_X, train_y)
+            if self.config.cross_validation.get("enabled", False):
+                self.cross_validate(train_X, train_y, params)
+
+            lr = ElasticNet(**params, random_state=42)
+            lr.fit(train_X, train_y)
+            sample_X = train_X[:PARITY_ROWS]
+
+        # Write to a temporary file and rename it into place, so that a serving process
+        # hot-reloading the model never reads a partially written artifact
+        model_path = os.path.join(self.config.root_dir, self.config.model_name)
+        tmp_path = model_path + ".tmp"
+        joblib.dump(lr, tmp_path)
+        os.replace(tmp_path, model_path)
+        self.export_scorer(lr, sample_X)
+
+        logger.info("Model training completed.")
+        return lr
@@ -1,11 +1,141 @@
+"""
+Configuration of the pipeline stages and of the serving app.
+
+config.yaml, params.yaml and schema.yaml are parsed once per process into a
+``ConfigSnapshot``, keyed by the SHA-256 of the three files' content. Creating a
+``ConfigurationManager`` only re-reads the files to hash them: as long as none of them
+changed, it reuses the snapshot (parsed YAML, stage configs already built, artifact
+directories already created). When a file changes, the next manager parses a new one.
+
+Stage configs are frozen dataclasses whose dict fields are plain dicts, so they pickle
+cheaply to worker processes. The frozenness is shallow: each getter call returns a deep
+copy of the cached config, so a stage mutating a dict field cannot change what later
+stages get. Pickling a manager
+ships its snapshot; the worker registers it and does not parse the files again.
+"""
+
 # Import constants and utility functions from the project
 from src.datascienceproject.constant import *  # Import all constants
-from src.datascienceproject.utils.common import read_yaml, create_directories  # Import specific utility functions
+from src.datascienceproject.utils.common import create_directories  # Import specific utility functions
 from src.datascienceproject import logger  # Import logger
 import os  # For path operations
+import copy
+import functools
+import hashlib
+import threading
+
+import yaml
+from box import ConfigBox
+
+from src.datascienceproject.entity.config_entity import (DataIngestionConfig,DataValidationConfig,DataTransformationConfig,ModelTrainerConfig,ModelEvaluationConfig,ServingConfig)
+
+# Config sections whose root_dir is created with the snapshot
+STAGE_SECTIONS = ("data_ingestion", "data_validation", "data_transformation", "model_training", "model_evaluation")
+
+# Latest snapshot of each (config, params, schema) path triple
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def _plain(value):
+    """Return a plain-dict (or list) copy of a ConfigBox value, scalars unchanged."""
+    return value.to_dict() if hasattr(value, "to_dict") else value.to_list() if hasattr(value, "to_list") else value
+
+
+class ConfigSnapshot:
+    def __init__(self, paths: tuple, contents: tuple, content_hash: str):
+        """
+        Args:
+            paths (tuple): config, params and schema file paths.
+            contents (tuple): raw content of each file, parsed here.
+            content_hash (str): SHA-256 of the contents.
+        """
+        self.paths = paths
+        self.content_hash = content_hash
+        self.config, self.params, self.schema = (self._parse(path, content) for path, content in zip(paths, contents))
+        # Stage configs built so far, by getter name
+        self.entities = {}
+        self.directories_created = False
+
+    @staticmethod
+    def _parse(path: str, content: bytes) -> ConfigBox:
+        data = yaml.safe_load(content)
+        if data is None:
+            raise ValueError(f"yaml file is empty: {path}")
+        logger.info(f"YAML file {path} loaded successfully.")
+        return ConfigBox(data)
+
+    def __setstate__(self, state):
+        # Unpickled in a worker process: reuse this snapshot there instead of parsing again
+        self.__dict__.update(state)
+        with _snapshots_lock:
+            _snapshots.setdefault(self.paths, self)
+
+
+def load_snapshot(config_filepath=CONFIG_FILE_PATH, params_filepath=PARAMS_FILE_PATH,
+                  schema_filepath=SCHEMA_FILE_PATH) -> ConfigSnapshot:
+    """Return the process-wide snapshot of the three files, parsing them only if their content changed.
+
+    Raises:
+        FileNotFoundError: If one of the files does not exist.
+
+    Returns:
+        ConfigSnapshot: the snapshot matching the current file contents
+    """
+    paths = tuple(str(path) for path in (config_filepath, params_filepath, schema_filepath))
+    contents = []
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Configuration file not found at: {path}")
+        with open(path, "rb") as f:
+            content = f.read()
+        contents.append(content)
+        digest.update(len(content).to_bytes(8, "little"))
+        digest.update(content)
+    content_hash = digest.hexdigest()
+
+    snapshot = _snapshots.get(paths)
+    if snapshot is not None and snapshot.content_hash == content_hash:
+        return snapshot
+    with _snapshots_lock:
+        snapshot = _snapshots.get(paths)
+        if snapshot is None or snapshot.content_hash != content_hash:
+            snapshot = ConfigSnapshot(paths, tuple(contents), content_hash)
+            _snapshots[paths] = snapshot
+    return snapshot
 
-from src.datascienceproject.entity.config_entity import (DataIngestionConfig,DataValidationConfig,DataTransformationConfig,ModelTrainerConfig,ModelEvaluationConfig)
 
+def streams_dataset(config) -> bool:
+    """Whether the stages read the dataset straight from the archive (data_ingestion.ingestion_mode: stream)."""
+    return config.data_ingestion.get("ingestion_mode", "extract") == "stream"
+
+
+def dataset_path(config, extracted_path):
+    """Return where the stages read the dataset from: the extracted CSV or, in stream mode, the archive.
+
+    Args:
+        config (ConfigBox): parsed config.yaml.
+        extracted_path (str): the extracted CSV the stage reads in extract mode.
+    """
+    return config.data_ingestion.local_data_file if streams_dataset(config) else extracted_path
+
+
+def _cached(getter):
+    """Build a stage config once per snapshot; every call gets its own deep copy of it.
+
+    The dataclasses are frozen, but their dict fields (params, schema, slices...) are not:
+    handing out the cached instance would let one stage's mutation leak into later ones
+    without changing the snapshot's content hash. A copy costs tens of microseconds.
+    """
+    @functools.wraps(getter)
+    def wrapper(self):
+        entities = self.snapshot.entities
+        entity = entities.get(getter.__name__)
+        if entity is None:
+            entity = entities.setdefault(getter.__name__, getter(self))
+        return copy.deepcopy(entity)
+    return wrapper
 
 
 class ConfigurationManager:
@@ -19,87 +149,139 @@ class ConfigurationManager:
         logger.debug(f"Params file path: {params_filepath}")
         logger.debug(f"Schema file path: {schema_filepath}")
         
-        # Verify file existence
-        if not os.path.exists(config_filepath):
-            raise FileNotFoundError(f"Configuration file not found at: {config_filepath}")
-            
-        # Convert paths to strings for read_yaml
-        self.config = read_yaml(str(config_filepath))
-        self.params = read_yaml(str(params_filepath))
-        self.schema = read_yaml(str(schema_filepath))
+        self.snapshot = load_snapshot(config_filepath, params_filepath, schema_filepath)
+        if not self.snapshot.directories_created:
+            self.prepare_directories()
+
+    @property
+    def config(self) -> ConfigBox:
+        return self.snapshot.config
+
+    @property
+    def params(self) -> ConfigBox:
+        return self.snapshot.params
+
+    @property
+    def schema(self) -> ConfigBox:
+        return self.snapshot.schema
 
-        create_directories([self.config.artifacts_root])
+    def prepare_directories(self):
+        """Create the artifacts root and every stage's root_dir (once per snapshot, or again per run)."""
+        create_directories([self.config.artifacts_root]
+                           + [self.config[section].root_dir for section in STAGE_SECTIONS if section in self.config])
+        self.snapshot.directories_created = True
 
+    @_cached
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         config = self.config.data_ingestion
-        create_directories([config.root_dir])
 
         data_ingestion_config = DataIngestionConfig(
             root_dir=config.root_dir,
             source_URL=config.source_URL,
             local_data_file=config.local_data_file,
-            unzip_dir=config.unzip_dir
+            unzip_dir=config.unzip_dir,
+            source_sha256=config.get("source_sha256") or "",
+            ingestion_mode=config.get("ingestion_mode", "extract")
         )
         return data_ingestion_config
     
+    @_cached
     def get_data_validation_config(self) -> DataValidationConfig:
         config = self.config.data_validation
         schema = self.schema.COLUMNS
 
-        create_directories([config.root_dir])
-
         data_validation_config = DataValidationConfig(
             root_dir=config.root_dir,
             STATUS_FILE=config.STATUS_FILE,
-            unzip_data_dir=config.unzip_data_dir,
-            all_schema=schema,
+            unzip_data_dir=dataset_path(self.config, config.unzip_data_dir),
+            all_schema=_plain(schema),
+            bounds=_plain(self.schema.get("BOUNDS") or {}),
+            chunk_rows=config.chunk_rows,
+            fail_fast=config.fail_fast,
         )
 
         return data_validation_config
 
+    @_cached
     def get_data_transformation_config(self) -> DataTransformationConfig:
         config = self.config.data_transformation
-        create_directories([config.root_dir])
-
         data_transformation_config = DataTransformationConfig(
             root_dir=config.root_dir,
-            data_path=config.data_path
+            data_path=dataset_path(self.config, config.data_path),
+            artifact_format=self.config.artifact_format,
+            export_csv=config.export_csv,
+            all_schema=_plain(self.schema.COLUMNS),
+            target_column=self.schema.TARGET_COLUMN.name,
+            test_size=config.get("test_size", 0.2),
+            random_state=config.get("random_state", 42)
         )
         return data_transformation_config
 
+    @_cached
     def get_model_trainer_config(self) -> ModelTrainerConfig:
         config = self.config.model_training
         params = self.params.ElasticNet
         schema = self.schema.TARGET_COLUMN
 
-        create_directories([config.root_dir])
-
         model_trainer_config = ModelTrainerConfig(
             root_dir=config.root_dir,
             train_data_path=config.train_data_path,
             test_data_path=config.test_data_path,
             model_name=config.model_name,
+            scorer_name=config.get("scorer_name"),
             alpha=params.alpha,
             l1_ratio=params.l1_ratio,
-            target_column=schema.name
+            target_column=schema.name,
+            all_schema=_plain(self.schema.COLUMNS),
+            artifact_format=self.config.artifact_format,
+            leaderboard_name=config.leaderboard_name,
+            search=_plain(params.get("search") or {}),
+            cross_validation=_plain(config.get("cross_validation") or {}),
+            cv_report_name=config.get("cv_report_name", "cv_report.json"),
+            streaming=_plain(config.get("streaming") or {}),
+            streaming_report_name=config.get("streaming_report_name", "streaming_report.json")
         )
 
         return model_trainer_config
     
+    @_cached
     def get_model_evaluation_config(self) -> ModelEvaluationConfig:
         config=self.config.model_evaluation
         params=self.params.ElasticNet
         schema=self.schema.TARGET_COLUMN
 
-        create_directories([config.root_dir])
-        
         model_evaluation_config = ModelEvaluationConfig(
             root_dir=config.root_dir,
             test_data_path=config.test_data_path,
             model_path=config.model_path,
-            all_params=params,
+            all_params=_plain(params),
             metrics_file_name=config.metrics_file_name,
             TARGET_COLUMN=schema.name,
-            mlflow_uri="https://dagshub.com/akatoshleiwu/datascienceproject_fullflow.mlflow"
+            # The configured URI: MlflowTracker applies MLFLOW_TRACKING_URI when it is built, since
+            # this config is cached per snapshot of the YAML files, not of the environment
+            mlflow_uri=config.mlflow_uri,
+            all_schema=_plain(self.schema.COLUMNS),
+            artifact_format=self.config.artifact_format,
+            mlflow_spool_dir=config.mlflow_spool_dir,
+            mlflow_timeout=config.mlflow_timeout,
+            bootstrap=_plain(config.get("bootstrap") or {}),
+            slices=_plain(config.get("slices") or {})
+        )
+        return model_evaluation_config
+
+    @_cached
+    def get_serving_config(self) -> ServingConfig:
+        config = self.config.serving
+
+        serving_config = ServingConfig(
+            model_path=config.model_path,
+            scorer_path=config.get("scorer_path"),
+            micro_batching=config.micro_batching,
+            max_batch_size=config.max_batch_size,
+            max_wait_us=config.max_wait_us,
+            training_jobs_dir=config.training_jobs_dir,
+            mmap_model=config.get("mmap_model", False),
+            server=_plain(config.get("server") or {}),
+            prediction_cache=_plain(config.get("prediction_cache") or {})
         )
-        return model_evaluation_config
\ No newline at end of file
+        return serving_config
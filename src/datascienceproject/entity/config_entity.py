@@ -1,38 +1,61 @@
 # input for DataIngestion 
+# Configs are frozen and slotted: ConfigurationManager builds each one once per parsed
+# configuration and hands out deep copies (the dict fields stay mutable); use
+# dataclasses.replace to derive a variant
 
 from dataclasses import dataclass
 from pathlib import Path
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DataIngestionConfig:
     root_dir: Path
     source_URL: str
     local_data_file: Path
     unzip_dir: Path
+    source_sha256: str
+    ingestion_mode: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DataValidationConfig:
     root_dir: Path
     STATUS_FILE: str  # Changed from status_file to STATUS_FILE to match config.yaml
     unzip_data_dir: Path
     all_schema: dict
+    bounds: dict
+    chunk_rows: int
+    fail_fast: bool
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DataTransformationConfig:
     root_dir: Path
     data_path: Path
+    artifact_format: str
+    export_csv: bool
+    all_schema: dict
+    target_column: str
+    test_size: float
+    random_state: int
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModelTrainerConfig:
     root_dir: Path
     train_data_path: Path
     test_data_path: Path
     model_name: str
+    scorer_name: str
     alpha: float
     l1_ratio: float
     target_column: str
+    all_schema: dict
+    artifact_format: str
+    leaderboard_name: str
+    search: dict
+    cross_validation: dict
+    cv_report_name: str
+    streaming: dict
+    streaming_report_name: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModelEvaluationConfig:
     root_dir: Path
     test_data_path: Path
@@ -40,4 +63,22 @@ class ModelEvaluationConfig:
     all_params: dict
     metrics_file_name: Path
     TARGET_COLUMN: str
-    mlflow_uri: str
\ No newline at end of file
+    mlflow_uri: str
+    all_schema: dict
+    artifact_format: str
+    mlflow_spool_dir: Path
+    mlflow_timeout: float
+    bootstrap: dict
+    slices: dict
+
+@dataclass(frozen=True, slots=True)
+class ServingConfig:
+    model_path: Path
+    scorer_path: Path
+    micro_batching: bool
+    max_batch_size: int
+    max_wait_us: int
+    training_jobs_dir: Path
+    mmap_model: bool
+    server: dict
+    prediction_cache: dict
@@ -1 +1,7 @@
-from src.datascienceproject.pipeline.pipeline_data_ingestion import DataIngestionTrainingPipeline
+# Stage pipelines import their components (pandas, sklearn); they are loaded on first
+# access so that importing a serving module from this package stays light
+def __getattr__(name):
+    if name == "DataIngestionTrainingPipeline":
+        from src.datascienceproject.pipeline.pipeline_data_ingestion import DataIngestionTrainingPipeline
+        return DataIngestionTrainingPipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
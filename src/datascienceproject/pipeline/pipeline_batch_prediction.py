@@ -0,0 +1,160 @@
+"""
+Offline batch scoring of large semicolon-separated wine files.
+
+The input is never loaded as a whole: it is split into byte ranges aligned on line
+boundaries (one per worker process), and each worker streams its range in fixed-size
+blocks, parses a block into a feature matrix, scores it with the model it loaded once,
+and appends the predictions to its own part file. The parts are concatenated in order at
+the end, so the output rows line up with the input rows. Memory per worker is bounded by
+the block size, whatever the size of the input.
+"""
+
+import io
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.datascienceproject import logger
+from src.datascienceproject.utils.data_io import read_header
+from src.datascienceproject.utils.model_cache import get_model_cache
+
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def shard_offsets(input_path: str, data_start: int, n_shards: int) -> list:
+    """Split the data section of the file into n_shards byte ranges that start at a line boundary."""
+    size = os.path.getsize(input_path)
+    bounds = [data_start]
+    with open(input_path, "rb") as f:
+        for i in range(1, n_shards):
+            target = data_start + (size - data_start) * i // n_shards
+            if target <= bounds[-1]:
+                continue
+            f.seek(target)
+            f.readline()  # move to the start of the next line
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+def iter_blocks(input_path: str, start: int, end: int, chunk_bytes: int):
+    """Yield blocks of whole lines from the byte range [start, end), each about chunk_bytes long."""
+    with open(input_path, "rb") as f:
+        f.seek(start)
+        pos = start
+        carry = b""
+        while pos < end:
+            block = f.read(min(chunk_bytes, end - pos))
+            if not block:
+                break
+            pos += len(block)
+            data = carry + block
+            # Keep a trailing partial line for the next block (ranges themselves end on a line)
+            cut = len(data) if pos >= end else data.rfind(b"\n") + 1
+            carry = data[cut:]
+            if cut:
+                yield data[:cut]
+        if carry:
+            yield carry
+
+
+def score_shard(model_path: str, input_path: str, columns: list, feature_columns: list,
+                start: int, end: int, part_path: str, chunk_bytes: int, include_input: bool) -> int:
+    """
+    Score one byte range of the input file and write its predictions to part_path.
+
+    Returns:
+        int: number of rows scored
+    """
+    model = get_model_cache(model_path).get()
+    dtypes = {col: np.float64 for col in feature_columns}
+    rows = 0
+    with open(part_path, "w", newline="") as out:
+        for block in iter_blocks(input_path, start, end, chunk_bytes):
+            if not block.strip():
+                continue
+            chunk = pd.read_csv(io.BytesIO(block), sep=";", header=None, names=columns,
+                                usecols=feature_columns, dtype=dtypes)
+            features = chunk[feature_columns].to_numpy()
+            result = pd.DataFrame({"prediction": model.predict(features)})
+            if include_input:
+                result = pd.concat([chunk[feature_columns].reset_index(drop=True), result], axis=1)
+            result.to_csv(out, sep=";", header=False, index=False)
+            rows += len(chunk)
+    return rows
+
+
+class BatchPredictionPipeline:
+    def __init__(self, model_path, feature_columns: list, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                 include_input: bool = False):
+        """
+        Args:
+            model_path (str | Path): path to the trained model artifact.
+            feature_columns (list): model input columns, in training order.
+            chunk_bytes (int): size of the blocks streamed from the input file.
+            include_input (bool): whether to copy the feature columns into the output.
+        """
+        self.model_path = str(model_path)
+        self.feature_columns = list(feature_columns)
+        self.chunk_bytes = chunk_bytes
+        self.include_input = include_input
+
+    def run(self, input_path: str, output_path: str, workers: int = 1) -> dict:
+        """
+        Score input_path and write one prediction per input row to output_path.
+
+        Args:
+            input_path (str): semicolon-separated input file with a header row.
+            output_path (str): semicolon-separated output file.
+            workers (int): number of processes scoring shards of the input in parallel.
+
+        Returns:
+            dict: rows scored, elapsed seconds and rows per second
+        """
+        start_time = time.perf_counter()
+        columns, data_start = read_header(input_path)
+        missing = set(self.feature_columns) - set(columns)
+        if missing:
+            raise ValueError(f"Input file is missing columns: {sorted(missing)}")
+
+        shards = shard_offsets(input_path, data_start, max(1, workers))
+        part_paths = [f"{output_path}.part{i}" for i in range(len(shards))]
+        args = [(self.model_path, input_path, columns, self.feature_columns, start, end,
+                 part_path, self.chunk_bytes, self.include_input)
+                for (start, end), part_path in zip(shards, part_paths)]
+        logger.info(f"Scoring {input_path} in {len(shards)} shard(s) with {workers} worker(s)")
+
+        try:
+            if workers > 1 and len(shards) > 1:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    rows = sum(executor.map(score_shard, *zip(*args)))
+            else:
+                rows = sum(score_shard(*shard_args) for shard_args in args)
+
+            # Stitch the parts together in input order
+            header = (self.feature_columns if self.include_input else []) + ["prediction"]
+            with open(output_path, "wb") as out:
+                out.write((";".join(header) + "\n").encode("utf-8"))
+                for part_path in part_paths:
+                    with open(part_path, "rb") as part:
+                        shutil.copyfileobj(part, out)
+        finally:
+            for part_path in part_paths:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+
+        elapsed = time.perf_counter() - start_time
+        summary = {
+            "input_path": str(input_path),
+            "output_path": str(output_path),
+            "rows": rows,
+            "workers": workers,
+            "elapsed_seconds": elapsed,
+            "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+        }
+        logger.info(f"Scored {rows} rows in {elapsed:.2f}s ({summary['rows_per_second']:.0f} rows/s)")
+        return summary
@@ -9,26 +9,34 @@ class DataIngestionTrainingPipeline:
         """Initialize the Data Ingestion Training Pipeline"""
         logger.info(f">>>>>> {STAGE_NAME} started <<<<<<")
     
-    def initiate_data_ingestion(self):
+    def initiate_data_ingestion(self, config: ConfigurationManager = None, context: dict = None):
         """
         Initiate the data ingestion process
-        
+
+        Args:
+            config (ConfigurationManager): shared configuration, created if not given.
+            context (dict): in-memory outputs of upstream stages (unused, ingestion is the first stage).
+
         Returns:
             None
         """
         try:
-            config = ConfigurationManager()
+            config = config or ConfigurationManager()
             data_ingestion_config = config.get_data_ingestion_config()
             
             # Create data ingestion object
             data_ingestion = DataIngestion(config=data_ingestion_config)
             
-            # Download and extract file
+            # Download and (in extract mode) extract file
             logger.info("Downloading file...")
             data_ingestion.download_file()
             
-            logger.info("Extracting file...")
-            data_ingestion.extract_zip_file()
+            if data_ingestion_config.ingestion_mode == "stream":
+                # Later stages decompress the archive on the fly
+                logger.info("Stream mode: leaving the archive compressed")
+            else:
+                logger.info("Extracting file...")
+                data_ingestion.extract_zip_file()
             
             logger.info(f">>>>>> {STAGE_NAME} completed <<<<<<\n\nx==========x")
             
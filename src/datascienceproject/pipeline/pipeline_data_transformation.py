@@ -2,6 +2,7 @@ from src.datascienceproject.config.configuration import ConfigurationManager
 from src.datascienceproject.components.data_transformation import DataTransformation
 from src.datascienceproject import logger
 from pathlib import Path
+import json
 
 STAGE_NAME = "Data Transformation Stage"
 
@@ -10,31 +11,40 @@ class DataTransformationTrainingPipeline:
         """Initialize the Data Transformation Training Pipeline"""
         logger.info(f">>>>>> {STAGE_NAME} started <<<<<<")
 
-    def initiate_data_transformation(self):
+    def initiate_data_transformation(self, config: ConfigurationManager = None, context: dict = None):
         """
         Initiate the data transformation process
 
+        Args:
+            config (ConfigurationManager): shared configuration, created if not given.
+            context (dict): in-memory outputs of upstream stages; the validation status is
+                read from there, or from the validation report when validation was not run.
+
         Returns:
-            None
+            dict: the train and test splits as (X, y) arrays
         """
         try:
-            with open(Path("artifacts/data_validation/status.txt"), 'r') as file:
-                status = file.read().split(" ")[-1].strip()
-            if status =="True":
-                config = ConfigurationManager()
+            config = config or ConfigurationManager()
+            status = (context or {}).get("validation_status")
+            if status is None:
+                with open(Path(config.config.data_validation.STATUS_FILE), 'r') as file:
+                    status = json.load(file)["validation_status"]
+            if status:
                 data_transformation_config = config.get_data_transformation_config()
 
                     # Create data transformation object
                 data_transformation = DataTransformation(config=data_transformation_config)
 
                     # Split data
-                data_transformation.split_data()
+                splits = data_transformation.split_data()
                     
                 logger.info(f">>>>>> {STAGE_NAME} completed <<<<<<\n\nx==========x")
+                return splits
             else:
                 raise Exception("Your data schema is not validated")
         except Exception as e:
-            print(e)
+            logger.error(f"Error in {STAGE_NAME}: {str(e)}")
+            raise e
 
 if __name__ == '__main__':
     try:
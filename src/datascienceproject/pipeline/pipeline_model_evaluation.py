@@ -9,8 +9,10 @@ class ModelEvaluationPipeline:
     def __init__(self):
         pass
 
-    def initiate_model_evaluation(self):
-        config = ConfigurationManager()
+    def initiate_model_evaluation(self, config: ConfigurationManager = None, context: dict = None):
+        config = config or ConfigurationManager()
         model_evaluation_config = config.get_model_evaluation_config()
         model_evaluation = ModelEvaluation(config=model_evaluation_config)
-        model_evaluation.log_into_mlflow()
\ No newline at end of file
+        # Use the split and model from this run when available, else load them from disk
+        context = context or {}
+        model_evaluation.log_into_mlflow(test=context.get("test"), model=context.get("model"))
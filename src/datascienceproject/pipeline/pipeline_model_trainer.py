@@ -9,8 +9,10 @@ class ModelTrainingPipeline:
     def __init__(self):
         pass
 
-    def initiate_model_training(self):
-        config = ConfigurationManager()
+    def initiate_model_training(self, config: ConfigurationManager = None, context: dict = None):
+        config = config or ConfigurationManager()
         model_trainer_config = config.get_model_trainer_config()
         model_trainer = ModelTrainer(config=model_trainer_config)
-        model_trainer.train()
\ No newline at end of file
+        # Use the split from this run if the transformation stage ran, else load it from disk
+        model = model_trainer.train(train=(context or {}).get("train"))
+        return {"model": model}
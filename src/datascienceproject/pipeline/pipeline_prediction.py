@@ -1,13 +1,185 @@
-import joblib
+import os
+import functools
 import numpy as np
-import pandas as pd
 from pathlib import Path
+from src.datascienceproject.constant import SCHEMA_FILE_PATH
+from src.datascienceproject.utils.common import read_yaml
+from src.datascienceproject.utils.model_cache import get_model_cache, mmap_joblib_load
+from src.datascienceproject.utils.linear_scorer import load_linear_scorer
+from src.datascienceproject.utils.micro_batcher import MicroBatcher
+from src.datascienceproject.utils.prediction_cache import PredictionCache
+from src.datascienceproject.utils.instrumentation import (PREDICTION_CPU, PREDICTION_LATENCY, PREDICTION_ROWS,
+                                                          instrumented)
+
+MODEL_PATH = Path("artifacts/model_training/model.joblib")
+
+
+def load_feature_columns(schema_filepath=SCHEMA_FILE_PATH) -> list:
+    """Return the model input columns, in training order, as declared in schema.yaml."""
+    schema = read_yaml(str(schema_filepath))
+    target = schema.TARGET_COLUMN.name
+    return [col for col in schema.COLUMNS.keys() if col != target]
 
 
 class PredictionPipeline:
-    def __init__(self):
-        self.model_path = joblib.load('artifacts/model_training/model.joblib')
+    def __init__(self, model_path=MODEL_PATH, feature_columns=None, scorer_path=None, mmap_model: bool = False):
+        """
+        Args:
+            model_path (str | Path): the model.joblib artifact.
+            feature_columns (list): input columns in training order. Read from schema.yaml if not given.
+            scorer_path (str | Path): linear scorer artifact. While it exists and is no older than
+                model_path, predictions use it (a numpy matmul, without sklearn's input checks)
+                instead of the joblib model. Checked on every lookup.
+            mmap_model (bool): memory-map the model's numpy arrays, shared by all server workers.
+        """
+        # The models themselves live in process-wide caches, so creating a pipeline is cheap
+        self.feature_columns = feature_columns or load_feature_columns()
+        self.model_path = model_path
+        self.scorer_path = scorer_path
+        self.joblib_cache = get_model_cache(model_path, loader=mmap_joblib_load) if mmap_model \
+            else get_model_cache(model_path)
+        self.scorer_cache = None
+        if scorer_path is not None:
+            loader = functools.partial(load_linear_scorer, feature_columns=self.feature_columns)
+            self.scorer_cache = get_model_cache(scorer_path, loader=loader)
+        self.micro_batcher = None
+        self.prediction_cache = None
+
+    def _scorer_is_current(self) -> bool:
+        """Whether the scorer exists and was written no earlier than model.joblib."""
+        try:
+            scorer_mtime = os.stat(self.scorer_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        try:
+            return scorer_mtime >= os.stat(self.model_path).st_mtime_ns
+        except FileNotFoundError:
+            # Only the scorer was deployed
+            return True
+
+    @property
+    def model_cache(self):
+        """The cache of the artifact predictions currently use: the scorer while it is current, else the model.
+
+        The trainer writes model.joblib first, then the scorer, and removes a scorer it
+        cannot export: a missing or older scorer belongs to a previous model.
+        """
+        if self.scorer_cache is not None:
+            if self._scorer_is_current():
+                return self.scorer_cache
+            if self.scorer_cache.signature is not None:
+                # Do not keep serving, or holding, the previous model's coefficients
+                self.scorer_cache.invalidate()
+        return self.joblib_cache
+
+    def _load(self) -> tuple:
+        """Return the cache of the artifact in use and its (re)loaded model."""
+        cache = self.model_cache
+        try:
+            return cache, cache.get()
+        except FileNotFoundError:
+            if cache is self.joblib_cache:
+                raise
+            # The scorer was removed between the check and the load
+            return self.joblib_cache, self.joblib_cache.get()
+
+    @property
+    def model(self):
+        return self._load()[1]
+
+    def enable_micro_batching(self, max_batch_size: int = 64, max_wait_us: int = 2000):
+        """Route single-row predictions through a shared MicroBatcher."""
+        self.micro_batcher = MicroBatcher(self._predict, max_batch_size=max_batch_size, max_wait_us=max_wait_us)
+        return self.micro_batcher
+
+    def enable_prediction_cache(self, max_entries: int = 100_000, ttl_seconds: float = None, decimals: int = None):
+        """Answer repeated feature rows from a PredictionCache, invalidated when the model changes."""
+        self.prediction_cache = PredictionCache(max_entries=max_entries, ttl_seconds=ttl_seconds, decimals=decimals)
+        return self.prediction_cache
+
+    def _predict(self, data):
+        return self.model.predict(data)
+
+    def _score(self, data):
+        # Single rows are coalesced with concurrent requests when micro-batching is on
+        if self.micro_batcher is not None and len(data) == 1:
+            return np.array([self.micro_batcher.predict_one(data[0])])
+        return self._predict(data)
 
+    @instrumented(PREDICTION_LATENCY, cpu_counter=PREDICTION_CPU, rows_counter=PREDICTION_ROWS)
     def prediction(self,data):
-        prediction=self.model_path.predict(data)
-        return prediction
\ No newline at end of file
+        if self.prediction_cache is not None:
+            # Loading first makes the signature the one of the artifact scoring the misses. The path
+            # is part of it: switching between scorer.npz and model.joblib also drops the entries.
+            cache, _ = self._load()
+            return self.prediction_cache.predict(data, self._score, (cache.model_path, cache.signature))
+        prediction=self._score(data)
+        return prediction
+
+    def batch_to_matrix(self, payload) -> np.ndarray:
+        """
+        Convert a JSON batch payload into a (n_rows, n_features) float matrix.
+
+        Two layouts are accepted, both keyed by the schema.yaml column names:
+        - records: a list of objects, one per sample
+        - columnar: an object mapping each column name to a list of values
+
+        The whole batch is validated at once: missing columns, ragged columns and
+        non-numeric or non-finite values are all reported with the offending rows.
+
+        Args:
+            payload (list | dict): the decoded JSON body.
+
+        Raises:
+            ValueError: If the payload does not describe a valid batch.
+
+        Returns:
+            np.ndarray: feature matrix in training column order
+        """
+        cols = self.feature_columns
+
+        if isinstance(payload, list):
+            if not all(isinstance(record, dict) for record in payload):
+                raise ValueError("Records payload must be a list of objects")
+            # Keys missing from later records become NaN and are caught by the finite check below
+            missing = set(cols) - set(payload[0]) if payload else set()
+            if missing:
+                raise ValueError(f"Missing columns: {sorted(missing)}")
+            rows = [[record.get(col) for col in cols] for record in payload]
+        elif isinstance(payload, dict):
+            missing = set(cols) - set(payload)
+            if missing:
+                raise ValueError(f"Missing columns: {sorted(missing)}")
+            not_lists = [col for col in cols if not isinstance(payload[col], list)]
+            if not_lists:
+                raise ValueError(f"Columnar payload values must be lists, got scalars or objects for: {not_lists}")
+            lengths = {len(payload[col]) for col in cols}
+            if len(lengths) > 1:
+                raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+            # Build column-major and transpose once, no per-row work
+            rows = None
+            columns = [payload[col] for col in cols]
+        else:
+            raise ValueError("Payload must be a list of records or an object of columns")
+
+        try:
+            if rows is not None:
+                matrix = np.asarray(rows, dtype=np.float64).reshape(len(rows), len(cols))
+            else:
+                matrix = np.asarray(columns, dtype=np.float64).T
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Non-numeric value in batch: {e}")
+
+        if matrix.shape[0] == 0:
+            raise ValueError("Batch is empty")
+
+        # Single vectorized pass over the whole batch (catches null, NaN and inf)
+        bad_rows = np.flatnonzero(~np.isfinite(matrix).all(axis=1))
+        if bad_rows.size:
+            raise ValueError(f"Missing or non-finite values in rows: {bad_rows[:20].tolist()}")
+
+        return np.ascontiguousarray(matrix)
+
+    def predict_batch(self, payload) -> np.ndarray:
+        """Validate a JSON batch payload and score it with a single model.predict call."""
+        return self.prediction(self.batch_to_matrix(payload))
@@ -8,11 +8,13 @@ class DataValidationTrainingPipeline:
     def __init__(self):
         pass
 
-    def initiate_data_validation(self):
-        config = ConfigurationManager()
+    def initiate_data_validation(self, config: ConfigurationManager = None, context: dict = None):
+        config = config or ConfigurationManager()
         data_validation_config = config.get_data_validation_config()
         data_validation = DataValiadtion(config=data_validation_config)
-        data_validation.validate_all_columns()
+        validation_status = data_validation.validate_all_columns()
+        # Handed to the transformation stage in memory when run by the StageRunner
+        return {"validation_status": validation_status}
 
 
 if __name__ == '__main__':
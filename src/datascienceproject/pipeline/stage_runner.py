@@ -0,0 +1,231 @@
+"""
+Incremental, dependency-driven execution of the training stages.
+
+Before running a stage, the runner hashes everything the stage declares as input: the
+config.yaml and params.yaml values it uses, schema.yaml, and the content of the files it
+reads. If those hashes match the ones recorded in the manifest for the stage's last
+successful run, and every output file still exists with the recorded content hash, the
+stage is reused instead of re-executed. Since a stage's outputs are the next stage's
+inputs, a change anywhere invalidates exactly the stages downstream of it.
+
+File hashes are memoized in the manifest by (size, mtime), so unchanged files are not
+re-read on every run.
+
+Every stage that runs is profiled (wall and CPU time, RSS, rows processed), and each run
+writes a JSON profile to the ``profiling.profile_dir`` of config.yaml.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.datascienceproject import logger
+from src.datascienceproject.config.configuration import ConfigurationManager
+from src.datascienceproject.pipeline.stages import TRAINING_STAGES, run_stage
+from src.datascienceproject.utils.instrumentation import RunProfile, profile_stage
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def hash_value(value) -> str:
+    """Return the SHA-256 of a JSON-serializable value, independent of key order."""
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    payload = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class StageRunner:
+    def __init__(self, stages=TRAINING_STAGES, config_manager: ConfigurationManager = None, manifest_path=None,
+                 max_workers: int = 4):
+        """
+        Args:
+            stages (list): Stage declarations to run.
+            config_manager (ConfigurationManager): parsed configuration, shared by all stages. Created if not given.
+            manifest_path (str): where the manifest is stored. Defaults to config.yaml pipeline_manifest.
+            max_workers (int): maximum number of stages running at the same time.
+        """
+        self.stages = stages
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self.config_manager = config_manager or ConfigurationManager()
+        self.config = self.config_manager.config
+        self.manifest_path = str(manifest_path or self.config.pipeline_manifest)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        manifest.setdefault("stages", {})
+        manifest.setdefault("file_hashes", {})
+        return manifest
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=4)
+        os.replace(tmp_path, self.manifest_path)
+
+    def file_hash(self, path):
+        """Return the SHA-256 of a file's content, or None if it does not exist."""
+        path = str(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        memo = self.manifest["file_hashes"].get(path)
+        if memo and memo["size"] == st.st_size and memo["mtime_ns"] == st.st_mtime_ns:
+            return memo["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+        self.manifest["file_hashes"][path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256}
+        return sha256
+
+    def input_hashes(self, stage) -> dict:
+        """Hash every declared input of a stage."""
+        hashes = {f"config:{key}": hash_value(self.config.get(key)) for key in stage.config_keys}
+        hashes.update({f"params:{key}": hash_value(self.config_manager.params.get(key)) for key in stage.params_keys})
+        if stage.uses_schema:
+            hashes["schema"] = hash_value(self.config_manager.schema)
+        hashes.update({f"file:{path}": self.file_hash(path) for path in stage.input_files(self.config)})
+        return hashes
+
+    def output_hashes(self, stage) -> dict:
+        """Hash every declared output file of a stage."""
+        return {str(path): self.file_hash(path) for path in stage.output_files(self.config)}
+
+    def is_up_to_date(self, stage, inputs: dict) -> tuple:
+        """Return (up_to_date, reason) for a stage given its current input hashes."""
+        previous = self.manifest["stages"].get(stage.name)
+        if previous is None:
+            return False, "no previous run"
+        if previous["inputs"] != inputs:
+            changed = sorted(key for key in set(inputs) | set(previous["inputs"])
+                             if inputs.get(key) != previous["inputs"].get(key))
+            return False, f"inputs changed: {changed}"
+        outputs = self.output_hashes(stage)
+        # Declared outputs the last run did not write are optional, the others must still exist
+        missing = sorted(path for path, digest in outputs.items()
+                         if digest is None and previous["outputs"].get(path) is not None)
+        if missing:
+            return False, f"outputs missing: {missing}"
+        if outputs != previous["outputs"]:
+            return False, "outputs modified"
+        return True, "inputs and outputs unchanged"
+
+    def _execute(self, stage, force: bool, context: dict, on_stage_start=None, profile: RunProfile = None) -> dict:
+        """Check one stage against the manifest and run it if needed; returns its report entry."""
+        if on_stage_start:
+            on_stage_start(stage.name)
+        start = time.perf_counter()
+        with self._lock:
+            inputs = self.input_hashes(stage)
+            up_to_date, reason = self.is_up_to_date(stage, inputs)
+        entry = {"stage": stage.name, "status": "reused", "reason": reason}
+
+        if force or stage.always_run or not up_to_date:
+            entry.update(status="ran", reason="forced" if force else "always runs" if stage.always_run else reason)
+            logger.info(f">>>>>> stage {stage.name} started ({entry['reason']}) <<<<<<")
+            try:
+                with (profile.stage(stage.name) if profile else profile_stage(stage.name)) as record:
+                    outputs = run_stage(stage.pipeline_cls, stage.method_name,
+                                        config=self.config_manager, context=dict(context))
+                entry.update(rows=record["rows"], cpu_seconds=record["cpu_seconds"])
+            except Exception as e:
+                with self._lock:
+                    self.manifest["stages"].pop(stage.name, None)
+                    self._save_manifest()
+                entry.update(status="failed", reason=str(e), error=e, duration_seconds=time.perf_counter() - start)
+                logger.error(f"Error in {stage.name}: {str(e)}")
+                return entry
+            with self._lock:
+                context.update(outputs)
+                self.manifest["stages"][stage.name] = {
+                    "inputs": inputs,
+                    "outputs": self.output_hashes(stage),
+                    "completed_at": time.time(),
+                }
+                self._save_manifest()
+            logger.info(f">>>>>> stage {stage.name} completed <<<<<<\n\nx==========x")
+        else:
+            logger.info(f">>>>>> stage {stage.name} reused ({reason}) <<<<<<")
+
+        entry["duration_seconds"] = time.perf_counter() - start
+        return entry
+
+    def run(self, force: bool = False, on_stage_start=None, on_stage_end=None) -> list:
+        """
+        Run the stages as a DAG, skipping those whose inputs and outputs are unchanged.
+
+        A stage starts as soon as all the stages it depends on are done, so independent
+        stages run concurrently (in threads, up to max_workers). Outputs returned by a
+        stage (splits, fitted model, ...) are handed to downstream stages in memory; the
+        files they write are checkpoints for later runs. When a stage is reused, its
+        dependents fall back to reading those checkpoints.
+
+        Args:
+            force (bool): run every stage even if it is up to date. Defaults to False.
+            on_stage_start (callable): called with the stage name before it is checked.
+            on_stage_end (callable): called with the stage's report entry once it is done.
+
+        Raises:
+            Exception: re-raises the first stage failure, once running stages have finished.
+
+        Returns:
+            list: one report entry per stage, in declaration order, with status ran or
+                reused, reason and duration
+        """
+        names = {stage.name for stage in self.stages}
+        for stage in self.stages:
+            unknown = set(stage.depends_on) - names
+            if unknown:
+                raise ValueError(f"{stage.name} depends on unknown stages: {sorted(unknown)}")
+
+        # Directories are created once per run, not by every config getter
+        self.config_manager.prepare_directories()
+        profiling = self.config.get("profiling") or {}
+        profile = RunProfile(profiling.get("profile_dir", "artifacts/profiles"),
+                             cprofile=profiling.get("cprofile", False),
+                             trace_memory=profiling.get("tracemalloc", False))
+        context = {}
+        entries = {}
+        pending = list(self.stages)
+        running = {}
+        failure = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # Submit every stage whose dependencies are all done
+                if failure is None:
+                    for stage in [s for s in pending if all(dep in entries for dep in s.depends_on)]:
+                        pending.remove(stage)
+                        running[executor.submit(self._execute, stage, force, context, on_stage_start, profile)] = stage
+                if not running:
+                    if pending and failure is None:
+                        raise ValueError(f"Dependency cycle between stages: {[s.name for s in pending]}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    entry = future.result()
+                    error = entry.pop("error", None)
+                    entries[stage.name] = entry
+                    if on_stage_end:
+                        on_stage_end(entry)
+                    if error is not None and failure is None:
+                        failure = error
+
+        profile.save()
+        if failure is not None:
+            raise failure
+        return [entries[stage.name] for stage in self.stages]
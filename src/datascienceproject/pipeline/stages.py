@@ -0,0 +1,129 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.datascienceproject.pipeline.pipeline_data_ingestion import DataIngestionTrainingPipeline
+from src.datascienceproject.pipeline.pipline_data_validation import DataValidationTrainingPipeline
+from src.datascienceproject.pipeline.pipeline_data_transformation import DataTransformationTrainingPipeline
+from src.datascienceproject.pipeline.pipeline_model_trainer import ModelTrainingPipeline
+from src.datascienceproject.pipeline.pipeline_model_evaluation import ModelEvaluationPipeline
+from src.datascienceproject.config.configuration import dataset_path, streams_dataset
+from src.datascienceproject.utils.data_io import split_files
+
+
+@dataclass
+class Stage:
+    """A training stage and the inputs that decide whether it has to run again."""
+    name: str
+    pipeline_cls: type
+    method_name: str
+    # config.yaml keys whose values are hashed as inputs
+    config_keys: list = field(default_factory=list)
+    # params.yaml keys whose values are hashed as inputs
+    params_keys: list = field(default_factory=list)
+    uses_schema: bool = False
+    # run even when up to date, for stages whose real input is outside the repo (e.g. a remote file)
+    always_run: bool = False
+    # names of the stages that must complete before this one starts
+    depends_on: list = field(default_factory=list)
+    # functions of the parsed config.yaml returning the files read / written by the stage;
+    # a declared output the last run did not write (e.g. the leaderboard when search is off)
+    # is not required, but one it wrote must still be there, unchanged
+    input_files: Callable = lambda config: []
+    output_files: Callable = lambda config: []
+
+
+def _split_files(config, stem, exports: bool = False):
+    # exports: include the CSV copies, which the transformation writes but no stage reads
+    export_csv = exports and config.data_transformation.get("export_csv", False)
+    return split_files(stem, config.artifact_format, export_csv=export_csv)
+
+
+def _training_outputs(config):
+    training = config.model_training
+    names = [training.model_name, training.get("scorer_name"), training.get("leaderboard_name"),
+             training.get("cv_report_name"), training.get("streaming_report_name")]
+    return [f"{training.root_dir}/{name}" for name in names if name]
+
+
+# Stages making up a training run, in a valid execution order
+TRAINING_STAGES = [
+    Stage(
+        name="Data Ingestion Stage",
+        pipeline_cls=DataIngestionTrainingPipeline,
+        method_name="initiate_data_ingestion",
+        config_keys=["data_ingestion"],
+        # the source may change remotely; a current copy costs one conditional HEAD request
+        always_run=True,
+        output_files=lambda config: ([config.data_ingestion.local_data_file]
+                                     + ([] if streams_dataset(config) else [config.data_validation.unzip_data_dir])),
+    ),
+    Stage(
+        name="Data Validation Stage",
+        depends_on=["Data Ingestion Stage"],
+        pipeline_cls=DataValidationTrainingPipeline,
+        method_name="initiate_data_validation",
+        config_keys=["data_validation"],
+        uses_schema=True,
+        input_files=lambda config: [dataset_path(config, config.data_validation.unzip_data_dir)],
+        output_files=lambda config: [config.data_validation.STATUS_FILE],
+    ),
+    Stage(
+        name="Data Transformation Stage",
+        depends_on=["Data Ingestion Stage", "Data Validation Stage"],
+        pipeline_cls=DataTransformationTrainingPipeline,
+        method_name="initiate_data_transformation",
+        config_keys=["data_transformation", "artifact_format"],
+        uses_schema=True,
+        input_files=lambda config: [dataset_path(config, config.data_transformation.data_path),
+                                    config.data_validation.STATUS_FILE],
+        output_files=lambda config: (_split_files(config, config.model_training.train_data_path, exports=True)
+                                     + _split_files(config, config.model_training.test_data_path, exports=True)),
+    ),
+    Stage(
+        name="Model Training Stage",
+        depends_on=["Data Transformation Stage"],
+        pipeline_cls=ModelTrainingPipeline,
+        method_name="initiate_model_training",
+        config_keys=["model_training", "artifact_format"],
+        params_keys=["ElasticNet"],
+        uses_schema=True,
+        input_files=lambda config: _split_files(config, config.model_training.train_data_path),
+        output_files=_training_outputs,
+    ),
+    Stage(
+        name="Model Evaluation Stage",
+        depends_on=["Data Transformation Stage", "Model Training Stage"],
+        pipeline_cls=ModelEvaluationPipeline,
+        method_name="initiate_model_evaluation",
+        config_keys=["model_evaluation", "artifact_format"],
+        params_keys=["ElasticNet"],
+        uses_schema=True,
+        input_files=lambda config: (_split_files(config, config.model_evaluation.test_data_path)
+                                    + [config.model_evaluation.model_path]),
+        output_files=lambda config: [config.model_evaluation.metrics_file_name],
+    ),
+]
+
+
+def get_stage(name: str) -> Stage:
+    """Return the training stage with the given name."""
+    for stage in TRAINING_STAGES:
+        if stage.name == name:
+            return stage
+    raise KeyError(f"Unknown stage: {name}")
+
+
+def run_stage(pipeline_cls, method_name: str, config=None, context=None):
+    """Instantiate a stage pipeline and run its entry method.
+
+    Args:
+        pipeline_cls (type): the stage pipeline class.
+        method_name (str): its entry method.
+        config (ConfigurationManager): shared configuration, built by the stage if not given.
+        context (dict): in-memory outputs of the upstream stages of this run.
+
+    Returns:
+        dict: in-memory outputs of this stage for downstream stages
+    """
+    pipeline = pipeline_cls()
+    return getattr(pipeline, method_name)(config=config, context=context) or {}
@@ -0,0 +1,230 @@
+"""
+Background training jobs for the web app.
+
+Training runs execute the stages from ``TRAINING_STAGES`` (through the incremental
+``StageRunner``, so unchanged stages are reused) inside a dedicated worker
+process, so a retrain neither blocks a web worker nor competes with request threads for
+the GIL. The worker process is kept alive between runs, so imports are paid only once.
+
+Each job reports its progress to ``<jobs_dir>/<job_id>.json``; the web process reads that
+file to answer status requests. Only one run can be queued or running at a time, across
+all the server workers sharing ``jobs_dir``: submissions are serialized with a lock file,
+and ``<jobs_dir>/active_job.json`` names the job that was last started.
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, where the app runs in a single process
+    fcntl = None
+
+from src.datascienceproject import logger
+
+
+def _write_status(status_path: str, status: dict):
+    # Write then rename, so readers never see a partially written status file
+    tmp_path = status_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(status, f, indent=4)
+    os.replace(tmp_path, status_path)
+
+
+def _pid_alive(pid) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        return True
+    return True
+
+
+def run_training_job(job_id: str, status_path: str, force: bool = False) -> dict:
+    """
+    Run the training stages through the incremental StageRunner, recording per-stage
+    progress and durations.
+
+    Executed in the worker process; failures are recorded in the status file
+    rather than raised.
+
+    Args:
+        job_id (str): identifier of the job.
+        status_path (str): path of the JSON status file to update.
+        force (bool): run every stage even if its inputs are unchanged.
+
+    Returns:
+        dict: the final job status
+    """
+    from src.datascienceproject.pipeline.stage_runner import StageRunner
+    from src.datascienceproject.utils.logging_setup import configure_logging
+
+    with open(status_path) as f:
+        status = json.load(f)
+    status.update(status="running", started_at=time.time(), pid=os.getpid())
+    _write_status(status_path, status)
+    stages = {stage["name"]: stage for stage in status["stages"]}
+
+    def on_stage_start(stage_name):
+        stages[stage_name].update(status="running", started_at=time.time())
+        status["current_stage"] = stage_name
+        _write_status(status_path, status)
+
+    def on_stage_end(entry):
+        # status is one of ran, reused or failed
+        stages[entry["stage"]].update(status="succeeded" if entry["status"] == "ran" else entry["status"],
+                                      reason=entry["reason"], duration_seconds=entry["duration_seconds"])
+        status["completed_stages"] = sum(s["status"] in ("succeeded", "reused") for s in status["stages"])
+        _write_status(status_path, status)
+
+    run_start = time.perf_counter()
+    try:
+        logger.info(f">>>>>> job {job_id} started <<<<<<")
+        runner = StageRunner()
+        # The worker is a spawned process: apply the logging section of config.yaml here too
+        configure_logging(runner.config.get("logging"))
+        runner.run(force=force, on_stage_start=on_stage_start, on_stage_end=on_stage_end)
+        status["status"] = "succeeded"
+        logger.info(f">>>>>> job {job_id} completed <<<<<<")
+    except Exception as e:
+        logger.error(f"Error in job {job_id}: {str(e)}")
+        status.update(status="failed", error=str(e), traceback=traceback.format_exc())
+
+    status.update(current_stage=None, finished_at=time.time(),
+                  duration_seconds=time.perf_counter() - run_start)
+    _write_status(status_path, status)
+    return status
+
+
+class TrainingJobManager:
+    def __init__(self, jobs_dir: str):
+        """
+        Args:
+            jobs_dir (str): directory where job status files are written.
+        """
+        self.jobs_dir = str(jobs_dir)
+        self._executor = None
+        # Serializes the threads of this process; the lock file serializes the processes
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork a process that is running request threads
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def _status_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    @property
+    def _active_marker_path(self) -> str:
+        return os.path.join(self.jobs_dir, "active_job.json")
+
+    @contextmanager
+    def _submit_lock(self):
+        """Hold the submission lock of jobs_dir, shared by every process using it."""
+        with self._lock:
+            os.makedirs(self.jobs_dir, exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.jobs_dir, ".submit.lock"), "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _active_job(self):
+        """
+        Return the id of the job queued or running in any process, or None.
+
+        Called with the submission lock held. A queued job is active while the process
+        that submitted it (and holds it in its executor queue) is alive, a running job
+        while its worker process is alive; a process killed mid-run leaves a stale marker.
+        """
+        try:
+            with open(self._active_marker_path) as f:
+                marker = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        status = self.status(marker["job_id"]) or {}
+        if status.get("status") == "queued" and _pid_alive(marker.get("submitter_pid")):
+            return marker["job_id"]
+        if status.get("status") == "running" and _pid_alive(status.get("pid")):
+            return marker["job_id"]
+        return None
+
+    def submit(self, force: bool = False):
+        """
+        Start a training run in the background unless one is already queued or running.
+
+        Args:
+            force (bool): run every stage even if its inputs are unchanged.
+
+        Returns:
+            tuple: (job_id, created) where created is False if an active job was returned instead
+        """
+        from src.datascienceproject.pipeline.stages import TRAINING_STAGES
+
+        with self._submit_lock():
+            active_job_id = self._active_job()
+            if active_job_id is not None:
+                return active_job_id, False
+
+            job_id = uuid.uuid4().hex[:12]
+            status_path = self._status_path(job_id)
+            _write_status(status_path, {
+                "job_id": job_id,
+                "status": "queued",
+                "submitted_at": time.time(),
+                "current_stage": None,
+                "completed_stages": 0,
+                "total_stages": len(TRAINING_STAGES),
+                "force": force,
+                "stages": [{"name": stage.name, "status": "pending"} for stage in TRAINING_STAGES],
+            })
+
+            try:
+                future = self._get_executor().submit(run_training_job, job_id, status_path, force)
+            except Exception:
+                # The worker process died (BrokenProcessPool); start a fresh one
+                self._executor = None
+                future = self._get_executor().submit(run_training_job, job_id, status_path, force)
+            future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+
+            _write_status(self._active_marker_path, {"job_id": job_id, "submitter_pid": os.getpid()})
+            logger.info(f"Training job {job_id} submitted")
+            return job_id, True
+
+    def _on_done(self, job_id: str, future):
+        # Only needed when the worker itself crashed before recording the failure
+        error = future.exception()
+        if error is None:
+            return
+        logger.error(f"Training job {job_id} crashed: {str(error)}")
+        status = self.status(job_id) or {"job_id": job_id}
+        status.update(status="failed", error=str(error), finished_at=time.time())
+        _write_status(self._status_path(job_id), status)
+
+    def status(self, job_id: str):
+        """Return the status document of a job, or None if the job is unknown."""
+        # Job ids are generated hex strings; anything else cannot name a status file
+        if not job_id.isalnum():
+            return None
+        try:
+            with open(self._status_path(job_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,380 @@
+"""
+This module provides schema-driven readers for the semicolon-separated wine datasets.
+
+Files are parsed by pandas' C parser straight into the dtypes declared in schema.yaml,
+without building an intermediate frame of strings. Quoted and/or padded header names
+(as in the raw ``winequality-white.csv``) are normalized before parsing so that the
+schema column names always match. ZIP archives are read in place: their CSV members are
+decompressed in chunks and concatenated on the fly, with no extracted copy on disk.
+
+It also reads and writes the train/test split artifacts exchanged between stages, in the
+format selected by ``artifact_format`` in config.yaml.
+"""
+
+import csv
+import io
+import json
+import os
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from src.datascienceproject import logger
+
+
+# Buffer size used when streaming datasets (also the decompression block size for ZIP members)
+STREAM_BUFFER_BYTES = 1024 * 1024
+
+
+class ZipMembersReader(io.RawIOBase):
+    """Binary stream over the CSV members of a ZIP archive.
+
+    Members are decompressed block by block as the stream is read, and concatenated in
+    archive order; the header row of every member after the first is dropped (and must
+    match the first one). Nothing is extracted to disk.
+    """
+
+    def __init__(self, zip_path, members: list = None):
+        """
+        Args:
+            zip_path (str | Path): path to the ZIP archive.
+            members (list): names of the members to read. Defaults to every .csv member.
+
+        Raises:
+            ValueError: If the archive has no CSV member, or members have different headers.
+        """
+        super().__init__()
+        self.zip_path = str(zip_path)
+        self._zip = zipfile.ZipFile(self.zip_path)
+        self.members = members or [
+            info.filename for info in self._zip.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(".csv")
+            and not info.filename.startswith("__MACOSX/")
+        ]
+        if not self.members:
+            raise ValueError(f"No CSV member found in {self.zip_path}")
+        self.header = None
+        self.bytes_read = 0
+        self._index = -1
+        self._current = None
+        self._pending = b""
+        self._last_byte = b"\n"
+        self._next_member()
+
+    def _next_member(self):
+        if self._current is not None:
+            self._current.close()
+        self._index += 1
+        if self._index >= len(self.members):
+            self._current = None
+            return
+        self._current = self._zip.open(self.members[self._index])
+        header = self._current.readline()
+        if self.header is None:
+            self.header = header
+            self._pending = header
+        elif header.strip() != self.header.strip():
+            raise ValueError(f"Header of {self.members[self._index]} differs from {self.members[0]} in {self.zip_path}")
+        elif self._last_byte != b"\n":
+            # Previous member did not end with a newline; keep rows from merging
+            self._pending = b"\n"
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while True:
+            if self._pending:
+                n = min(len(buffer), len(self._pending))
+                buffer[:n] = self._pending[:n]
+                self._pending = self._pending[n:]
+                self.bytes_read += n
+                return n
+            if self._current is None:
+                return 0
+            data = self._current.read(len(buffer))
+            if data:
+                buffer[:len(data)] = data
+                self._last_byte = data[-1:]
+                self.bytes_read += len(data)
+                return len(data)
+            self._next_member()
+
+    def close(self):
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        self._zip.close()
+        super().close()
+
+
+def open_dataset(file_path):
+    """Open a dataset for binary streaming reads.
+
+    ``.zip`` paths are read through a ZipMembersReader, so the CSV members are decompressed
+    on the fly instead of being extracted; other paths are opened as plain files.
+
+    Args:
+        file_path (str | Path): path to a semicolon-separated file or a ZIP archive of them.
+
+    Returns:
+        io.BufferedReader: binary stream positioned at the header row
+    """
+    if str(file_path).lower().endswith(".zip"):
+        return io.BufferedReader(ZipMembersReader(file_path), buffer_size=STREAM_BUFFER_BYTES)
+    return open(file_path, "rb", buffering=STREAM_BUFFER_BYTES)
+
+
+def parse_header(header_line: bytes) -> list:
+    """Return the column names of a ';' separated header row, stripped of quotes and whitespace."""
+    columns = next(csv.reader([header_line.decode("utf-8")], delimiter=";"))
+    return [col.strip().strip('"').strip() for col in columns]
+
+
+def read_header(file_path) -> tuple:
+    """Return (column names, byte offset of the first data row) of a semicolon-separated file.
+
+    Args:
+        file_path (str | Path): path to the file.
+
+    Returns:
+        tuple: list of column names stripped of quotes and whitespace, and the offset of the first data row
+    """
+    with open(file_path, "rb") as f:
+        header_line = f.readline()
+        data_start = f.tell()
+    return parse_header(header_line), data_start
+
+
+def load_dataset(file_path, schema: dict, columns: list = None) -> pd.DataFrame:
+    """Load a semicolon-separated dataset (or a ZIP archive of them) using the schema dtypes.
+
+    Args:
+        file_path (str | Path): path to the file or ZIP archive.
+        schema (dict): mapping of column name to dtype, as in schema.yaml COLUMNS.
+        columns (list): subset of schema columns to load. Defaults to all schema columns.
+
+    Raises:
+        ValueError: If a requested column is not in the file header.
+
+    Returns:
+        pd.DataFrame: data with one column per requested schema column, in schema order
+    """
+    start = time.perf_counter()
+    with open_dataset(file_path) as f:
+        header = parse_header(f.readline())
+        wanted = [col for col in schema if columns is None or col in columns]
+        missing = set(wanted) - set(header)
+        if missing:
+            raise ValueError(f"Columns missing from {file_path}: {sorted(missing)}")
+
+        df = pd.read_csv(
+            f,
+            sep=";",
+            header=None,
+            names=header,
+            usecols=wanted,
+            dtype={col: schema[col] for col in wanted},
+        )[wanted]
+        # Uncompressed bytes for ZIP archives
+        bytes_read = getattr(f.raw, "bytes_read", None) or f.tell()
+
+    elapsed = time.perf_counter() - start
+    mib = bytes_read / 2**20
+    logger.info(f"Parsed {len(df)} rows ({mib:.1f} MiB) from {file_path} in {elapsed:.2f}s "
+                f"({mib / elapsed if elapsed else 0:.1f} MiB/s)")
+    return df
+
+
+# Supported formats for the train/test splits handed between pipeline stages
+ARTIFACT_SUFFIXES = {
+    "npy": ".npy",
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "csv": ".csv",
+}
+
+
+def artifact_path(stem, artifact_format: str) -> str:
+    """Return the file path of a split artifact for the given format.
+
+    Args:
+        stem (str | Path): artifact path without extension, e.g. artifacts/data_transformation/train
+        artifact_format (str): one of npy, parquet, feather or csv.
+
+    Raises:
+        ValueError: If the format is not supported.
+
+    Returns:
+        str: path with the format's extension
+    """
+    if artifact_format not in ARTIFACT_SUFFIXES:
+        raise ValueError(f"Unsupported artifact format '{artifact_format}', expected one of {list(ARTIFACT_SUFFIXES)}")
+    return str(stem) + ARTIFACT_SUFFIXES[artifact_format]
+
+
+def _columns_path(stem) -> str:
+    return str(stem) + ".columns.json"
+
+
+def split_files(stem, artifact_format: str, export_csv: bool = False) -> list:
+    """Return every file save_split writes for a split: the artifact, its npy column
+    sidecar and, with export_csv, the CSV copy."""
+    files = [artifact_path(stem, artifact_format)]
+    if artifact_format == "npy":
+        files.append(_columns_path(stem))
+    if export_csv and artifact_format != "csv":
+        files.append(artifact_path(stem, "csv"))
+    return files
+
+
+def save_split(df: pd.DataFrame, stem, artifact_format: str, target_column: str, export_csv: bool = False) -> str:
+    """Save a train or test split, with the target as the last column.
+
+    For ``npy`` the whole split is stored as one float64 matrix so that it can be
+    memory-mapped, and the column names are kept in a ``<stem>.columns.json`` sidecar.
+
+    Args:
+        df (pd.DataFrame): the split to save.
+        stem (str | Path): artifact path without extension.
+        artifact_format (str): one of npy, parquet, feather or csv.
+        target_column (str): name of the target column.
+        export_csv (bool): also write a ';' separated CSV copy. Defaults to False.
+
+    Returns:
+        str: path of the written artifact
+    """
+    path = artifact_path(stem, artifact_format)
+    columns = [col for col in df.columns if col != target_column] + [target_column]
+    df = df[columns].reset_index(drop=True)
+
+    if artifact_format == "npy":
+        np.save(path, df.to_numpy(dtype=np.float64))
+        with open(_columns_path(stem), "w") as f:
+            json.dump({"columns": columns}, f, indent=4)
+    elif artifact_format == "parquet":
+        df.to_parquet(path, index=False)
+    elif artifact_format == "feather":
+        df.to_feather(path)
+    else:
+        df.to_csv(path, sep=";", index=False)
+
+    if export_csv and artifact_format != "csv":
+        df.to_csv(artifact_path(stem, "csv"), sep=";", index=False)
+    return path
+
+
+def load_xy(stem, artifact_format: str, schema: dict, target_column: str, mmap: bool = True) -> tuple:
+    """Load a split saved by save_split as a feature matrix and a target vector.
+
+    ``npy`` splits are memory-mapped, and X and y are views on the mapped file, so
+    nothing is parsed or copied at load time.
+
+    Args:
+        stem (str | Path): artifact path without extension.
+        artifact_format (str): one of npy, parquet, feather or csv.
+        schema (dict): mapping of column name to dtype, as in schema.yaml COLUMNS.
+        target_column (str): name of the target column.
+        mmap (bool): memory-map npy artifacts instead of reading them. Defaults to True.
+
+    Raises:
+        ValueError: If the stored columns do not match the schema.
+
+    Returns:
+        tuple: (X, y) numpy arrays, with X columns in schema order
+    """
+    path = artifact_path(stem, artifact_format)
+    features = [col for col in schema if col != target_column]
+
+    if artifact_format == "npy":
+        with open(_columns_path(stem)) as f:
+            columns = json.load(f)["columns"]
+        if columns != features + [target_column]:
+            raise ValueError(f"Columns stored in {path} do not match the schema: {columns}")
+        data = np.load(path, mmap_mode="r" if mmap else None)
+        return data[:, :-1], data[:, -1]
+
+    if artifact_format == "parquet":
+        df = pd.read_parquet(path, columns=features + [target_column])
+    elif artifact_format == "feather":
+        df = pd.read_feather(path, columns=features + [target_column])
+    else:
+        df = load_dataset(path, schema)
+    return df[features].to_numpy(dtype=np.float64), df[target_column].to_numpy()
+
+
+def iter_xy_chunks(stem, artifact_format: str, schema: dict, target_column: str, chunk_rows: int):
+    """Read a split saved by save_split as (X, y) chunks of at most chunk_rows rows.
+
+    Only one chunk is held in memory at a time: ``npy`` splits are memory-mapped and
+    sliced, parquet row groups and feather record batches are read one at a time, and CSV
+    splits are parsed chunk by chunk. Each call starts a new pass over the split.
+
+    Args:
+        stem (str | Path): artifact path without extension.
+        artifact_format (str): one of npy, parquet, feather or csv.
+        schema (dict): mapping of column name to dtype, as in schema.yaml COLUMNS.
+        target_column (str): name of the target column.
+        chunk_rows (int): maximum number of rows per chunk.
+
+    Yields:
+        tuple: (X, y) float64 numpy arrays, with X columns in schema order
+    """
+    path = artifact_path(stem, artifact_format)
+    features = [col for col in schema if col != target_column]
+
+    if artifact_format == "npy":
+        X, y = load_xy(stem, artifact_format, schema, target_column)
+        for start in range(0, len(y), chunk_rows):
+            yield np.asarray(X[start:start + chunk_rows]), np.asarray(y[start:start + chunk_rows], dtype=np.float64)
+        return
+
+    if artifact_format == "parquet":
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=features + [target_column])
+    elif artifact_format == "feather":
+        import pyarrow as pa
+
+        # Feather v2 is the Arrow IPC file format: batches are read from the mapped file
+        reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        batches = (reader.get_batch(i).select(features + [target_column]) for i in range(reader.num_record_batches))
+    else:
+        batches = pd.read_csv(path, sep=";", usecols=features + [target_column], dtype=np.float64,
+                              chunksize=chunk_rows)
+
+    for batch in batches:
+        df = batch if isinstance(batch, pd.DataFrame) else batch.to_pandas()
+        # Feather batches have the writer's size, re-slice them to chunk_rows
+        for start in range(0, len(df), chunk_rows):
+            part = df.iloc[start:start + chunk_rows]
+            yield part[features].to_numpy(dtype=np.float64), part[target_column].to_numpy(dtype=np.float64)
+
+
+def memmap_arrays(arrays: dict, folder) -> dict:
+    """Return read-only memory-mapped versions of arrays, to share them between processes.
+
+    Arrays that are already memory-mapped (e.g. npy splits loaded by load_xy) are returned
+    as is; the others are saved once to ``<folder>/<name>.npy`` and mapped back. Process
+    pools then pass workers a reference to the file instead of a pickled copy, and every
+    worker reads the same pages from the OS page cache.
+
+    Args:
+        arrays (dict): mapping of name to numpy array.
+        folder (str | Path): directory for the arrays that need a backing file.
+
+    Returns:
+        dict: mapping of name to np.memmap
+    """
+    shared = {}
+    for name, array in arrays.items():
+        if isinstance(array, np.memmap):
+            shared[name] = array
+            continue
+        path = os.path.join(str(folder), f"{name}.npy")
+        os.makedirs(str(folder), exist_ok=True)
+        np.save(path, np.ascontiguousarray(array))
+        shared[name] = np.load(path, mmap_mode="r")
+    return shared
@@ -0,0 +1,298 @@
+"""
+Timing, memory and throughput instrumentation.
+
+Pipeline stages are wrapped in ``profile_stage``, which records wall time, CPU time of
+the stage's thread, process RSS and the rows the stage processed. Components report
+their row counts with ``record_rows``, which adds to the record of the stage running in
+the current thread and does nothing otherwise. ``RunProfile`` collects the records of a
+run and writes them to a JSON profile. On request, each stage can also be run under
+cProfile and/or tracemalloc, and those profiles are dumped next to the run profile.
+
+For serving, ``Histogram`` and ``Counter`` keep in-process metrics that
+``render_prometheus`` exposes in the Prometheus text format (``shared_metrics`` merges
+them across server worker processes). The ``instrumented``
+decorator times a function into a histogram and accumulates its CPU time and row counts.
+"""
+
+import bisect
+import cProfile
+import functools
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from src.datascienceproject import logger
+
+# Latency buckets in seconds, from 0.5 ms to 10 s
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_local = threading.local()
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MiB (0 when it cannot be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process' resident set size in MiB."""
+    if resource is None:
+        return 0.0
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def record_rows(rows: int):
+    """Add rows to the record of the stage being profiled in this thread, if any."""
+    record = getattr(_local, "record", None)
+    if record is not None:
+        record["rows"] = record.get("rows", 0) + int(rows)
+
+
+def _file_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_").lower()
+
+
+@contextmanager
+def profile_stage(name: str, profile_dir=None, cprofile: bool = False, trace_memory: bool = False):
+    """
+    Profile the block of code running a stage.
+
+    CPU time is the CPU time of the calling thread, so stages running concurrently in
+    other threads are not counted. RSS is process-wide: ``rss_delta_mb`` is the change
+    over the stage and ``peak_rss_mb`` the process high-water mark when the stage ends.
+
+    Args:
+        name (str): stage name.
+        profile_dir (str | Path): where cProfile / tracemalloc dumps are written.
+        cprofile (bool): run the stage under cProfile and dump ``<stage>.prof``.
+        trace_memory (bool): trace allocations with tracemalloc and dump the top allocation
+            sites to ``<stage>.tracemalloc.txt``. Allocations of concurrent stages are
+            included, and tracing slows the stage down noticeably.
+
+    Yields:
+        dict: the stage record, completed when the block exits
+    """
+    record = {"stage": name, "rows": 0}
+    previous, _local.record = getattr(_local, "record", None), record
+    profiler = cProfile.Profile() if cprofile else None
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    rss_before = current_rss_mb()
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Only one profiler can be active at a time on recent Python versions
+            logger.warning(f"cProfile disabled for {name}: {str(e)}")
+            profiler = None
+    try:
+        yield record
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        wall = time.perf_counter() - wall_start
+        record.update(
+            wall_seconds=wall,
+            cpu_seconds=time.thread_time() - cpu_start,
+            rss_delta_mb=current_rss_mb() - rss_before,
+            peak_rss_mb=peak_rss_mb(),
+        )
+        record["rows_per_second"] = record["rows"] / wall if wall and record["rows"] else None
+        _local.record = previous
+
+        if profiler is not None or trace_memory:
+            os.makedirs(str(profile_dir), exist_ok=True)
+            base = os.path.join(str(profile_dir), _file_name(name))
+        if profiler is not None:
+            profiler.dump_stats(base + ".prof")
+            record["cprofile"] = base + ".prof"
+        if trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            record["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+            with open(base + ".tracemalloc.txt", "w") as f:
+                for stat in snapshot.statistics("lineno")[:25]:
+                    f.write(f"{stat}\n")
+            record["tracemalloc"] = base + ".tracemalloc.txt"
+            if started_tracing:
+                tracemalloc.stop()
+
+
+class RunProfile:
+    def __init__(self, profile_dir, cprofile: bool = False, trace_memory: bool = False):
+        """
+        Args:
+            profile_dir (str | Path): directory of the run profiles.
+            cprofile (bool): also run every stage under cProfile.
+            trace_memory (bool): also trace every stage's allocations with tracemalloc.
+        """
+        self.run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+        self.profile_dir = str(profile_dir)
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.started_at = time.time()
+        self.stages = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Profile one stage of the run; see profile_stage."""
+        with profile_stage(name, os.path.join(self.profile_dir, self.run_id),
+                           cprofile=self.cprofile, trace_memory=self.trace_memory) as record:
+            try:
+                yield record
+            finally:
+                with self._lock:
+                    self.stages.append(record)
+
+    def save(self) -> str:
+        """Write the run profile to ``<profile_dir>/<run_id>.json`` and return its path."""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{self.run_id}.json")
+        with self._lock:
+            profile = {
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "wall_seconds": time.time() - self.started_at,
+                "peak_rss_mb": peak_rss_mb(),
+                "stages": list(self.stages),
+            }
+        with open(path, "w") as f:
+            json.dump(profile, f, indent=4)
+        logger.info(f"Run profile saved to {path}")
+        return path
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        """
+        Args:
+            name (str): metric name.
+            help_text (str): description shown by Prometheus.
+            labelnames (tuple): label names; observe() takes the values in the same order.
+            buckets (tuple): upper bounds of the buckets, increasing.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            series["counts"][index] += 1
+            series["sum"] += value
+
+    def snapshot(self) -> dict:
+        """Return a copy of the series, label values -> {"counts": per-bucket counts, "sum": total}."""
+        with self._lock:
+            return {labels: {"counts": list(s["counts"]), "sum": s["sum"]} for labels, s in self._series.items()}
+
+    def render(self, series: dict = None) -> list:
+        """Render this histogram, or the given series (e.g. merged from several processes)."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        if series is None:
+            series = self.snapshot()
+        for labelvalues, s in sorted(series.items()):
+            labels = [f'{k}="{v}"' for k, v in zip(self.labelnames, labelvalues)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), s["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = ",".join(labels + [f'le="{le}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = "{" + ",".join(labels) + "}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {s['sum']}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def render(self, value: float = None) -> list:
+        """Render this counter, or the given value (e.g. summed over several processes)."""
+        value = self.value if value is None else value
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter", f"{self.name} {value}"]
+
+
+# Serving metrics of this process
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency",
+                            labelnames=("method", "endpoint", "status"))
+PREDICTION_LATENCY = Histogram("prediction_duration_seconds", "PredictionPipeline.prediction latency")
+PREDICTION_CPU = Counter("prediction_cpu_seconds_total", "CPU time spent in PredictionPipeline.prediction")
+PREDICTION_ROWS = Counter("prediction_rows_total", "Rows scored by PredictionPipeline.prediction")
+
+
+def instrumented(histogram: Histogram, cpu_counter: Counter = None, rows_counter: Counter = None):
+    """
+    Decorate a function taking a 2D array as first argument (after self) to record its
+    latency, CPU time and number of rows.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, data, *args, **kwargs):
+            cpu_start = time.thread_time()
+            start = time.perf_counter()
+            try:
+                return func(self, data, *args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+                if cpu_counter is not None:
+                    cpu_counter.inc(time.thread_time() - cpu_start)
+                if rows_counter is not None:
+                    rows_counter.inc(len(data))
+        return wrapper
+    return decorator
+
+
+def render_prometheus(metrics: list, gauges: dict = None, counters: dict = None) -> str:
+    """
+    Render metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics (list): Histogram and Counter objects.
+        gauges (dict): extra gauges, name -> (help text, value).
+        counters (dict): extra unlabelled counters kept elsewhere, name -> (help text, value).
+            Names end in ``_total``, like the Counter objects'.
+
+    Returns:
+        str: the exposition document
+    """
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    for metric_type, values in (("gauge", gauges), ("counter", counters)):
+        for name, (help_text, value) in (values or {}).items():
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}", f"{name} {value}"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,123 @@
+"""
+Compiled linear scorer: the trained linear model reduced to a coefficient vector.
+
+Scoring an ElasticNet (or the scaler + SGDRegressor pipeline of streaming training) with
+sklearn's ``predict`` validates and converts its input on every call, which costs far
+more than the 11-term dot product itself. ``export_linear_scorer`` writes the model as a
+small ``.npz`` artifact: the coefficients, the intercept and the feature order. A
+StandardScaler step is folded into them:
+``(x - mean) / scale @ w + b == x @ (w / scale) + (b - mean / scale @ w)``.
+
+``load_linear_scorer`` reads the artifact with numpy only (no sklearn import and no
+unpickling), and ``LinearScorer.predict`` is a single matmul.
+"""
+
+import os
+
+import numpy as np
+
+
+class LinearScorer:
+    def __init__(self, coef, intercept: float, feature_columns: list):
+        """
+        Args:
+            coef (np.ndarray): one coefficient per feature.
+            intercept (float): model intercept.
+            feature_columns (list): feature names, in the order of coef.
+        """
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.feature_columns = list(feature_columns)
+
+    def predict(self, X) -> np.ndarray:
+        """Score a (n_rows, n_features) matrix."""
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+
+def linear_parameters(model) -> tuple:
+    """Return the (coef, intercept) of a fitted linear model, with a StandardScaler step folded in.
+
+    Raises:
+        ValueError: If the model is not a linear model, optionally preceded by a StandardScaler.
+    """
+    steps = [step for _, step in model.steps] if hasattr(model, "steps") else [model]
+    estimator = steps[-1]
+    if not hasattr(estimator, "coef_") or np.ndim(estimator.coef_) != 1:
+        raise ValueError(f"{type(estimator).__name__} is not a single-output linear model")
+    coef = np.asarray(estimator.coef_, dtype=np.float64)
+    intercept = float(np.ravel(estimator.intercept_)[0])
+
+    for step in reversed(steps[:-1]):
+        if not (hasattr(step, "mean_") and hasattr(step, "scale_")):
+            raise ValueError(f"Cannot fold a {type(step).__name__} step into a linear scorer")
+        # mean_ is also set with with_mean=False, but not used by transform
+        centered = getattr(step, "with_mean", True) and step.mean_ is not None
+        scaled = getattr(step, "with_std", True) and step.scale_ is not None
+        mean = step.mean_ if centered else np.zeros_like(coef)
+        scale = step.scale_ if scaled else np.ones_like(coef)
+        coef = coef / scale
+        intercept -= float(mean @ coef)
+    return coef, intercept
+
+
+def export_linear_scorer(model, feature_columns: list, path) -> LinearScorer:
+    """Save the scorer of a fitted linear model to ``path`` (a .npz file).
+
+    Args:
+        model: fitted ElasticNet-like model, or Pipeline of StandardScaler and linear model.
+        feature_columns (list): training feature names, in column order.
+        path (str | Path): artifact path.
+
+    Returns:
+        LinearScorer: the exported scorer
+    """
+    coef, intercept = linear_parameters(model)
+    if len(coef) != len(feature_columns):
+        raise ValueError(f"The model has {len(coef)} coefficients for {len(feature_columns)} features")
+    scorer = LinearScorer(coef, intercept, feature_columns)
+
+    # Written to a temporary file and renamed, as model.joblib, for hot-reloading servers
+    tmp_path = str(path) + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, coef=scorer.coef, intercept=np.float64(scorer.intercept),
+                 feature_columns=np.array(scorer.feature_columns, dtype=str))
+    os.replace(tmp_path, path)
+    return scorer
+
+
+def load_linear_scorer(path, feature_columns: list = None) -> LinearScorer:
+    """Load a scorer saved by export_linear_scorer.
+
+    Args:
+        path (str | Path): artifact path.
+        feature_columns (list): expected feature order; checked against the artifact when given.
+
+    Raises:
+        ValueError: If the artifact's feature order differs from feature_columns.
+
+    Returns:
+        LinearScorer: the scorer
+    """
+    with np.load(str(path), allow_pickle=False) as data:
+        scorer = LinearScorer(data["coef"], data["intercept"], data["feature_columns"].tolist())
+    if feature_columns is not None and scorer.feature_columns != list(feature_columns):
+        raise ValueError(f"Scorer {path} was exported for columns {scorer.feature_columns}, "
+                         f"expected {list(feature_columns)}")
+    return scorer
+
+
+def check_parity(model, scorer: LinearScorer, X, rtol: float = 1e-9, atol: float = 1e-9) -> float:
+    """Check that the scorer reproduces model.predict on X.
+
+    Raises:
+        ValueError: If a prediction differs beyond the tolerances.
+
+    Returns:
+        float: the largest absolute difference
+    """
+    expected = model.predict(X)
+    actual = scorer.predict(X)
+    max_diff = float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
+    if not np.allclose(actual, expected, rtol=rtol, atol=atol):
+        raise ValueError(f"Linear scorer differs from the model by up to {max_diff:.3g}")
+    return max_diff
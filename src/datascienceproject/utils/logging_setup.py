@@ -0,0 +1,255 @@
+"""
+Logging setup: a queue in front of the file and console handlers.
+
+With ``async`` on (the default), the root logger only has a ``QueueHandler``: the calling
+thread merges the message arguments and puts the record on an in-memory queue, and a
+``QueueListener`` thread does the formatting and the blocking file and stdout writes. The
+listener is restarted in forked children (its thread does not survive a fork) and
+drained at exit.
+
+Records are formatted as text (the historical format) or as one JSON object per line.
+Noisy loggers can be sampled and rate-limited before anything is queued: ``loggers``
+maps a logger name, or a module name since the project logs through a single logger, to
+a ``sample_rate`` (share of records below WARNING that are kept) and/or a ``rate_limit``
+(records per second, any level, token bucket with a one-second burst). The file handler
+rotates by size. A ``{pid}`` placeholder in the file name gives each process its own file,
+for servers running several worker processes: rotation is not safe across processes
+sharing one file.
+
+Settings come from the ``logging`` section of config.yaml, overridden by the LOG_LEVEL,
+LOG_FORMAT, LOG_FILE, LOG_ASYNC and LOG_CONSOLE environment variables. At import, the
+package configures logging from the defaults and the environment only; entry points
+call ``configure_logging`` again with the config.yaml section.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s in %(module)s: %(message)s"
+
+DEFAULT_SETTINGS = {
+    "level": "INFO",
+    # text or json
+    "format": "text",
+    # queue handler + background listener thread
+    "async": True,
+    "console": True,
+    # empty or null to disable the log file; {pid} is replaced by the process id
+    "file": os.path.join("logs", "logging.log"),
+    "max_bytes": 10 * 2**20,
+    "backup_count": 5,
+    "loggers": {},
+}
+
+ENV_SETTINGS = {"LOG_LEVEL": "level", "LOG_FORMAT": "format", "LOG_FILE": "file", "LOG_ASYNC": "async",
+                "LOG_CONSOLE": "console"}
+
+# Attributes of every LogRecord; anything else was passed through extra= and is emitted in JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# handlers: attached to the root logger; sinks: the file and console handlers
+_state = {"settings": None, "listener": None, "queue": None, "handlers": [], "sinks": [], "filter": None}
+_lock = threading.RLock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rules: dict):
+        """
+        Args:
+            rules (dict): logger or module name -> {"sample_rate": float, "rate_limit": float}.
+        """
+        super().__init__()
+        self.rules = {name: dict(rule or {}) for name, rule in (rules or {}).items()}
+        # name -> [tokens, last refill time]
+        self._buckets = {name: [float(rule["rate_limit"]), time.monotonic()]
+                         for name, rule in self.rules.items() if rule.get("rate_limit")}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+        self.rate_limited = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        name = record.name if record.name in self.rules else record.module
+        rule = self.rules.get(name)
+        if rule is None:
+            return True
+
+        sample_rate = rule.get("sample_rate")
+        if sample_rate is not None and record.levelno < logging.WARNING and random.random() >= sample_rate:
+            self.sampled_out += 1
+            return False
+
+        bucket = self._buckets.get(name)
+        if bucket is not None:
+            rate = float(rule["rate_limit"])
+            with self._lock:
+                now = time.monotonic()
+                bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                if bucket[0] < 1.0:
+                    self.rate_limited += 1
+                    return False
+                bucket[0] -= 1.0
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now (they may change once the call returns) but leave the
+        # formatting to the listener thread; tracebacks are rendered here, as text
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in ("", "0", "false", "no", "off")
+    return bool(value)
+
+
+def resolve_settings(settings: dict = None) -> dict:
+    """Merge the defaults, the given config.yaml settings and the LOG_* environment variables."""
+    resolved = dict(DEFAULT_SETTINGS)
+    resolved.update({key: value for key, value in (settings or {}).items() if value is not None or key == "file"})
+    for variable, key in ENV_SETTINGS.items():
+        if variable in os.environ:
+            resolved[key] = os.environ[variable]
+    resolved["async"] = _as_bool(resolved["async"])
+    resolved["console"] = _as_bool(resolved["console"])
+    resolved["level"] = str(resolved["level"]).upper()
+    if resolved["format"] not in ("text", "json"):
+        raise ValueError(f"Unknown log format {resolved['format']!r}, expected text or json")
+    return resolved
+
+
+def _build_handlers(settings: dict) -> list:
+    formatter = JsonFormatter() if settings["format"] == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = []
+    if settings["file"]:
+        path = settings["file"].replace("{pid}", str(os.getpid()))
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # delay: the file is opened on the first record, not at import
+        handlers.append(logging.handlers.RotatingFileHandler(path, maxBytes=int(settings["max_bytes"]),
+                                                             backupCount=int(settings["backup_count"]), delay=True))
+    if settings["console"]:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def _stop_listener():
+    listener = _state["listener"]
+    if listener is not None:
+        _state["listener"] = None
+        listener.stop()
+
+
+def configure_logging(settings: dict = None) -> dict:
+    """(Re)configure the root logger; a no-op when the resolved settings did not change.
+
+    Args:
+        settings (dict): the ``logging`` section of config.yaml. Defaults and environment
+            variables fill in the rest.
+
+    Returns:
+        dict: the resolved settings
+    """
+    resolved = resolve_settings(settings)
+    with _lock:
+        if resolved == _state["settings"]:
+            return resolved
+
+        root = logging.getLogger()
+        _stop_listener()
+        for handler in _state["handlers"]:
+            root.removeHandler(handler)
+        for handler in set(_state["handlers"]) | set(_state["sinks"]):
+            handler.close()
+
+        handlers = _build_handlers(resolved)
+        sampling = SamplingFilter(resolved["loggers"])
+        if resolved["async"]:
+            log_queue = queue.SimpleQueue()
+            queue_handler = _QueueHandler(log_queue)
+            queue_handler.addFilter(sampling)
+            listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            _state.update(listener=listener, queue=log_queue, handlers=[queue_handler], sinks=handlers)
+            root.addHandler(queue_handler)
+        else:
+            for handler in handlers:
+                handler.addFilter(sampling)
+                root.addHandler(handler)
+            _state.update(queue=None, handlers=handlers, sinks=handlers)
+
+        root.setLevel(resolved["level"])
+        _state.update(settings=resolved, filter=sampling)
+    return resolved
+
+
+def _restart_after_fork():
+    # The listener thread is not copied into a forked child: start a new one, on a new queue.
+    # A per-process log file is reopened under the child's pid.
+    global _lock
+    _lock = threading.RLock()
+    settings = _state["settings"]
+    if settings is not None and (settings["async"] or "{pid}" in (settings["file"] or "")):
+        _state.update(settings=None, listener=None)
+        configure_logging(settings)
+
+
+def logging_stats() -> dict:
+    """Queue depth and records dropped by sampling and rate limits, for monitoring."""
+    log_queue, sampling = _state["queue"], _state["filter"]
+    return {
+        "queue_size": log_queue.qsize() if log_queue is not None else 0,
+        "sampled_out": sampling.sampled_out if sampling is not None else 0,
+        "rate_limited": sampling.rate_limited if sampling is not None else 0,
+    }
+
+
+# Flush the queue before exit
+atexit.register(_stop_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
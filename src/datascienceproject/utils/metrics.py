@@ -0,0 +1,115 @@
+"""
+Vectorized regression metrics for model evaluation.
+
+``bootstrap_intervals`` draws every resample of the test set as one (resamples, rows)
+index matrix and computes RMSE, MAE and R2 for all of them with array reductions; no
+Python loop runs per resample. Resamples are processed in blocks so memory stays bounded
+for large test sets.
+
+``sliced_metrics`` computes the same metrics per group (target value, feature quantile
+bin, ...) from a single pass over the residuals, using ``np.bincount`` to accumulate the
+per-group sums.
+"""
+
+import numpy as np
+
+# Upper bound on the number of elements of a block of resample indices (about 80 MB of int64)
+MAX_BLOCK_ELEMENTS = 10_000_000
+
+
+def bootstrap_intervals(actual, pred, resamples: int = 2000, confidence: float = 0.95,
+                        random_state: int = 42) -> dict:
+    """Percentile bootstrap confidence intervals of RMSE, MAE and R2.
+
+    Args:
+        actual (np.ndarray): true target values.
+        pred (np.ndarray): predictions.
+        resamples (int): number of bootstrap resamples.
+        confidence (float): confidence level of the intervals.
+        random_state (int): seed of the resampling.
+
+    Returns:
+        dict: for each metric, the lower and upper bound and the standard error
+    """
+    actual = np.asarray(actual, dtype=np.float64)
+    errors = np.asarray(pred, dtype=np.float64) - actual
+    n = len(actual)
+    rng = np.random.default_rng(random_state)
+    block = max(1, MAX_BLOCK_ELEMENTS // n)
+
+    samples = {"rmse": [], "mae": [], "r2": []}
+    for start in range(0, resamples, block):
+        idx = rng.integers(0, n, size=(min(block, resamples - start), n))
+        e = errors[idx]
+        y = actual[idx]
+        sse = np.einsum("ij,ij->i", e, e)
+        sst = np.einsum("ij,ij->i", y, y) - y.sum(axis=1) ** 2 / n
+        samples["rmse"].append(np.sqrt(sse / n))
+        samples["mae"].append(np.abs(e).mean(axis=1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            samples["r2"].append(1.0 - sse / sst)
+
+    tail = (1.0 - confidence) / 2 * 100
+    intervals = {}
+    for metric, values in samples.items():
+        values = np.concatenate(values)
+        values = values[np.isfinite(values)]
+        low, high = np.percentile(values, [tail, 100 - tail])
+        intervals[metric] = {"low": float(low), "high": float(high), "std_error": float(values.std())}
+    return intervals
+
+
+def sliced_metrics(actual, pred, keys, labels: list) -> dict:
+    """RMSE, MAE, R2 and mean error of each group of rows.
+
+    Args:
+        actual (np.ndarray): true target values.
+        pred (np.ndarray): predictions.
+        keys (np.ndarray): group index of every row, in range(len(labels)).
+        labels (list): name of each group.
+
+    Returns:
+        dict: metrics per group label (groups without rows are left out)
+    """
+    actual = np.asarray(actual, dtype=np.float64)
+    errors = np.asarray(pred, dtype=np.float64) - actual
+    size = len(labels)
+
+    # One bincount per sum, all groups at once
+    count = np.bincount(keys, minlength=size)
+    sum_error = np.bincount(keys, weights=errors, minlength=size)
+    sse = np.bincount(keys, weights=errors ** 2, minlength=size)
+    sae = np.bincount(keys, weights=np.abs(errors), minlength=size)
+    sum_y = np.bincount(keys, weights=actual, minlength=size)
+    sum_y2 = np.bincount(keys, weights=actual ** 2, minlength=size)
+
+    slices = {}
+    for i, label in enumerate(labels):
+        if not count[i]:
+            continue
+        sst = sum_y2[i] - sum_y[i] ** 2 / count[i]
+        slices[str(label)] = {
+            "count": int(count[i]),
+            "rmse": float(np.sqrt(sse[i] / count[i])),
+            "mae": float(sae[i] / count[i]),
+            # undefined when the target is constant within the slice
+            "r2": float(1.0 - sse[i] / sst) if sst > 1e-12 else None,
+            "mean_error": float(sum_error[i] / count[i]),
+        }
+    return slices
+
+
+def value_slices(values) -> tuple:
+    """Group rows by their distinct values; returns (keys, labels)."""
+    labels, keys = np.unique(np.asarray(values), return_inverse=True)
+    return keys, [label.item() for label in labels]
+
+
+def quantile_slices(values, bins: int = 4) -> tuple:
+    """Group rows into quantile bins of a feature; returns (keys, labels)."""
+    values = np.asarray(values, dtype=np.float64)
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)))
+    keys = np.searchsorted(edges[1:-1], values, side="right")
+    labels = [f"[{low:.4g}, {high:.4g}{']' if i == len(edges) - 2 else ')'}"
+              for i, (low, high) in enumerate(zip(edges[:-1], edges[1:]))]
+    return keys, labels
@@ -0,0 +1,165 @@
+"""
+This module provides a server-side micro-batcher for single-row predictions.
+
+Concurrent requests that each score one sample are queued for a short window and scored
+together with one matrix ``predict`` call; results are then fanned back out to the
+waiting request threads. The window closes as soon as either ``max_batch_size`` rows are
+queued or ``max_wait_us`` microseconds have passed since the first row arrived, so the
+extra latency a request can pay is bounded by ``max_wait_us``.
+
+If the batch call raises, the rows are scored again one at a time, so that one bad row
+only fails its own request. A ``predict_fn`` returning the wrong number of predictions
+fails every request of the batch instead of leaving some of them waiting.
+
+Achieved batch sizes and queueing delays are recorded to tune that tradeoff.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from src.datascienceproject import logger
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+# Default time predict_one waits for its prediction
+RESULT_TIMEOUT_SECONDS = 30.0
+
+
+class _PendingRow:
+    __slots__ = ("row", "future", "enqueued_at")
+
+    def __init__(self, row):
+        self.row = row
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_us: int = 2000):
+        """
+        Args:
+            predict_fn (callable): scores a (n_rows, n_features) matrix and returns n_rows predictions.
+            max_batch_size (int): maximum number of rows scored in one call.
+            max_wait_us (int): maximum time in microseconds to hold the first queued row.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1e6
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        # Metrics exposed through stats()
+        self.batches = 0
+        self.rows = 0
+        self.max_batch_seen = 0
+        self.queue_delay_seconds_total = 0.0
+        self.queue_delay_seconds_max = 0.0
+        self.batch_size_histogram = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+    def _ensure_worker(self):
+        # Started lazily so the batcher survives being created before a worker fork
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, row) -> Future:
+        """Queue one feature row and return a Future resolving to its prediction."""
+        self._ensure_worker()
+        pending = _PendingRow(np.asarray(row, dtype=np.float64).ravel())
+        self._queue.put(pending)
+        return pending.future
+
+    def predict_one(self, row, timeout: float = RESULT_TIMEOUT_SECONDS):
+        """Queue one feature row and block until its prediction is available.
+
+        Raises:
+            concurrent.futures.TimeoutError: If no prediction arrives within timeout seconds.
+        """
+        return self.submit(row).result(timeout)
+
+    def _collect(self):
+        """Block for the first row, then gather more until the batch is full or the window closes."""
+        batch = [self._queue.get()]
+        deadline = batch[0].enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    # Window closed, but still take whatever is already waiting
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            dispatched_at = time.perf_counter()
+            try:
+                self._score(batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0].future.set_exception(e)
+                else:
+                    logger.error(f"Micro-batch prediction failed ({str(e)}), scoring its {len(batch)} rows one by one")
+                    for pending in batch:
+                        try:
+                            self._score([pending])
+                        except Exception as row_error:
+                            pending.future.set_exception(row_error)
+            self._record(batch, dispatched_at)
+
+    def _score(self, batch):
+        """Score the rows of batch in one call and resolve their futures."""
+        predictions = np.asarray(self.predict_fn(np.vstack([pending.row for pending in batch]))).ravel()
+        if len(predictions) != len(batch):
+            error = ValueError(f"predict_fn returned {len(predictions)} predictions for {len(batch)} rows")
+            # Not a problem of one row: rescoring one by one would not help
+            for pending in batch:
+                pending.future.set_exception(error)
+            return
+        for pending, value in zip(batch, predictions):
+            pending.future.set_result(value)
+
+    def _record(self, batch, dispatched_at):
+        size = len(batch)
+        delays = [dispatched_at - pending.enqueued_at for pending in batch]
+        bucket = next((i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if size <= bound), len(BATCH_SIZE_BUCKETS))
+        with self._stats_lock:
+            self.batches += 1
+            self.rows += size
+            self.max_batch_seen = max(self.max_batch_seen, size)
+            self.queue_delay_seconds_total += sum(delays)
+            self.queue_delay_seconds_max = max(self.queue_delay_seconds_max, max(delays))
+            self.batch_size_histogram[bucket] += 1
+
+    def stats(self) -> dict:
+        """Return a snapshot of the batching metrics."""
+        with self._stats_lock:
+            labels = [f"<={bound}" for bound in BATCH_SIZE_BUCKETS] + [f">{BATCH_SIZE_BUCKETS[-1]}"]
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_us": int(self.max_wait * 1e6),
+                "batches": self.batches,
+                "rows": self.rows,
+                "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+                "max_batch_seen": self.max_batch_seen,
+                "mean_queue_delay_us": self.queue_delay_seconds_total / self.rows * 1e6 if self.rows else 0.0,
+                "max_queue_delay_us": self.queue_delay_seconds_max * 1e6,
+                "batch_size_histogram": dict(zip(labels, self.batch_size_histogram)),
+                "queued": self._queue.qsize(),
+            }
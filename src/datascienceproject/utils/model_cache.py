@@ -0,0 +1,178 @@
+"""
+This module provides a process-wide, thread-safe cache for the trained model artifact.
+
+Instead of unpickling ``model.joblib`` on every prediction request, the model is loaded
+once per process and shared by all threads. Every lookup compares a cheap file signature
+(``st_mtime_ns``, ``st_size``, ``st_ino``) against the one recorded at load time, so a
+retrained artifact written by ``/train`` is picked up on the next request without a
+restart. The new model is swapped in atomically: readers either see the old
+``(signature, model)`` pair or the new one, never a half-loaded model.
+
+Hit/miss counters and load timings are kept so that the serving layer can expose them
+and show that request latency no longer includes deserialization.
+"""
+
+import functools
+import os
+import threading
+import time
+from pathlib import Path
+
+from src.datascienceproject import logger
+
+
+def _joblib_load(path, mmap_mode=None):
+    # joblib is imported on first load: processes serving the linear scorer never need it
+    import joblib
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+def mmap_joblib_load(path):
+    """Load a joblib artifact with its numpy arrays memory-mapped read-only.
+
+    The arrays are backed by the page cache, so every process serving the same artifact
+    shares their pages. The artifact must have been dumped without compression.
+    """
+    return _joblib_load(path, mmap_mode="r")
+
+
+class ModelCache:
+    def __init__(self, model_path, loader=_joblib_load):
+        """
+        Args:
+            model_path (str | Path): path to the serialized model artifact.
+            loader (callable): function used to deserialize the artifact. Defaults to joblib.load.
+        """
+        self.model_path = str(model_path)
+        self._loader = loader
+        # (signature, model) pair, replaced as a whole so reads never need the lock
+        self._entry = None
+        self._load_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        # Counters exposed through stats()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_seconds_total = 0.0
+        self.last_load_seconds = 0.0
+        self.last_loaded_at = None
+
+    def _signature(self):
+        """Return a cheap fingerprint of the artifact that changes whenever it is rewritten."""
+        st = os.stat(self.model_path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def get(self):
+        """
+        Return the cached model, (re)loading it if the artifact changed on disk.
+
+        Raises:
+            FileNotFoundError: If the model artifact does not exist and nothing was loaded yet.
+
+        Returns:
+            Any: the deserialized model
+        """
+        try:
+            signature = self._signature()
+        except FileNotFoundError:
+            # Keep serving the last good model if the artifact is briefly missing
+            entry = self._entry
+            if entry is None:
+                raise
+            self._count(hit=True)
+            return entry[1]
+
+        entry = self._entry
+        if entry is not None and entry[0] == signature:
+            self._count(hit=True)
+            return entry[1]
+
+        with self._load_lock:
+            # Another thread may have reloaded while we were waiting for the lock
+            entry = self._entry
+            if entry is not None and entry[0] == signature:
+                self._count(hit=True)
+                return entry[1]
+
+            self._count(hit=False)
+            start = time.perf_counter()
+            model = self._loader(self.model_path)
+            elapsed = time.perf_counter() - start
+
+            self._entry = (signature, model)
+            with self._stats_lock:
+                self.loads += 1
+                self.load_seconds_total += elapsed
+                self.last_load_seconds = elapsed
+                self.last_loaded_at = time.time()
+            logger.info(f"Model loaded from {self.model_path} in {elapsed * 1000:.2f} ms")
+            return model
+
+    def _count(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def signature(self):
+        """Signature of the currently cached model, or None if nothing is loaded."""
+        entry = self._entry
+        return None if entry is None else entry[0]
+
+    def invalidate(self):
+        """Drop the cached model so that the next get() reloads it from disk."""
+        with self._load_lock:
+            self._entry = None
+
+    def stats(self) -> dict:
+        """Return a snapshot of the cache counters."""
+        with self._stats_lock:
+            return {
+                "model_path": self.model_path,
+                "loaded": self._entry is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "load_seconds_total": self.load_seconds_total,
+                "last_load_seconds": self.last_load_seconds,
+                "last_loaded_at": self.last_loaded_at,
+            }
+
+
+# One cache per artifact path, loader and process
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _loader_key(loader):
+    """Hashable identity of a loader; equal partials (e.g. one per pipeline) share a key."""
+    if isinstance(loader, functools.partial):
+        keywords = tuple(sorted((name, tuple(value) if isinstance(value, list) else value)
+                                for name, value in loader.keywords.items()))
+        return loader.func, loader.args, keywords
+    return loader
+
+
+def get_model_cache(model_path, loader=_joblib_load) -> ModelCache:
+    """Return the process-wide ModelCache for the given artifact path and loader, creating it on first use.
+
+    Args:
+        model_path (str | Path): path to the serialized model artifact.
+        loader (callable): deserializer of the artifact. Defaults to joblib.load. Different
+            loaders of the same path (e.g. with and without mmap) get separate caches.
+
+    Returns:
+        ModelCache: the shared cache instance
+    """
+    key = (str(Path(model_path).resolve()), _loader_key(loader))
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = ModelCache(model_path, loader=loader)
+                _caches[key] = cache
+    return cache
@@ -0,0 +1,171 @@
+"""
+This module provides a bounded cache of predictions, keyed on the input feature vector.
+
+Dashboards and retried requests score the same wine profiles over and over. The cache
+maps the bytes of a feature row (float64, optionally rounded to ``decimals`` so that
+near-identical inputs share an entry) to its prediction. Entries are evicted in least
+recently used order once ``max_entries`` is reached, and expire ``ttl_seconds`` after
+they were stored.
+
+Every lookup carries the signature of the model that would score the misses (the
+artifact path and its ``ModelCache.signature``): when it differs from the one the entries were computed with,
+the whole cache is dropped, so a retrained artifact never serves stale predictions. In a
+batch, hits are answered from the cache and only the distinct missing rows are scored,
+in a single call.
+
+With quantization, a hit returns the prediction of the first row seen in the same
+rounding cell. The cache is per process: each server worker keeps its own.
+
+A lookup costs a few microseconds per row, so the cache pays off when the model call is
+the expensive part (sklearn's predict, about 200 us per call whatever the batch size) and
+whole requests hit. It does not speed up the npz linear scorer, which is about as cheap
+as a lookup.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: float = None, decimals: int = None):
+        """
+        Args:
+            max_entries (int): maximum number of cached predictions.
+            ttl_seconds (float): lifetime of an entry. None or 0 for no expiry.
+            decimals (int): round the features to this many decimals before keying. None for exact keys.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = int(max_entries)
+        self.ttl = float(ttl_seconds) if ttl_seconds else None
+        self.decimals = None if decimals is None else int(decimals)
+
+        # key -> (prediction, expires_at), least recently used first
+        self._entries = OrderedDict()
+        self._signature = None
+        self._entry_bytes = 0
+        self._lock = threading.Lock()
+
+        # Counters exposed through stats()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def keys(self, matrix: np.ndarray) -> list:
+        """Return the cache key of every row of a (n_rows, n_features) matrix."""
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if self.decimals is not None:
+            matrix = np.round(matrix, self.decimals)
+        # + 0.0 turns -0.0 into 0.0, so both signs of zero share a key
+        matrix = np.ascontiguousarray(matrix + 0.0)
+        # Slicing one bytes object is cheaper than a tobytes() call per row
+        buffer, width = matrix.tobytes(), matrix.strides[0]
+        return [buffer[start:start + width] for start in range(0, len(buffer), width)]
+
+    def _check_signature(self, signature):
+        # Called with the lock held
+        if signature != self._signature:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._entry_bytes = 0
+            self._signature = signature
+
+    def _entry_size(self, key: bytes, entry: tuple) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(entry) + sys.getsizeof(entry[0])
+
+    def _discard(self, key: bytes):
+        # Called with the lock held
+        self._entry_bytes -= self._entry_size(key, self._entries.pop(key))
+
+    def predict(self, matrix, predict_fn, signature) -> np.ndarray:
+        """
+        Return the predictions of a (n_rows, n_features) matrix, scoring only the cache misses.
+
+        Args:
+            matrix (np.ndarray): feature rows in training column order.
+            predict_fn (callable): scores a matrix of the missing rows, in one call.
+            signature (Any): identifies the model predict_fn uses; a new one invalidates the cache.
+
+        Returns:
+            np.ndarray: one prediction per row
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        keys = self.keys(matrix)
+        predictions = np.empty(len(keys), dtype=np.float64)
+        # key -> positions of the missing rows with that key
+        missing = {}
+
+        with self._lock:
+            self._check_signature(signature)
+            now = time.monotonic()
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl is not None and entry[1] <= now:
+                    self._discard(key)
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    missing.setdefault(key, []).append(i)
+                    continue
+                self._entries.move_to_end(key)
+                predictions[i] = entry[0]
+            n_missing = sum(len(positions) for positions in missing.values())
+            self.hits += len(keys) - n_missing
+            self.misses += n_missing
+
+        if not missing:
+            return predictions
+
+        # Score each distinct missing row once, outside the lock
+        first_rows = [positions[0] for positions in missing.values()]
+        scored = np.asarray(predict_fn(matrix[first_rows]), dtype=np.float64).ravel()
+        for positions, value in zip(missing.values(), scored):
+            predictions[positions] = value
+
+        with self._lock:
+            # The model changed while scoring: keep the results out of the new cache
+            if signature != self._signature:
+                return predictions
+            expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+            for key, value in zip(missing, scored):
+                if key in self._entries:
+                    self._discard(key)
+                entry = (float(value), expires_at)
+                self._entries[key] = entry
+                self._entry_bytes += self._entry_size(key, entry)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return predictions
+
+    def clear(self):
+        """Drop every cached prediction."""
+        with self._lock:
+            self._entries.clear()
+            self._entry_bytes = 0
+
+    def stats(self) -> dict:
+        """Return a snapshot of the cache counters and its approximate memory use."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "decimals": self.decimals,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                # keys, values and the dict itself; an estimate, not an exact count
+                "memory_bytes": self._entry_bytes + sys.getsizeof(self._entries),
+            }
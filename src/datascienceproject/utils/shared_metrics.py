@@ -0,0 +1,213 @@
+"""
+This module aggregates the serving metrics of several worker processes.
+
+Under gunicorn each worker keeps its own ``Histogram`` and ``Counter`` objects, and a
+scrape of /metrics reaches one worker at random. With ``SharedMetrics``, every process
+writes a snapshot of its metrics to ``<metrics_dir>/<pid>-<token>.json``: every
+``interval_seconds`` from a background thread, on every scrape, and when the worker
+exits. A scrape merges the snapshots of all processes: histogram buckets and counters
+are summed, gauges (memory, queue sizes...) are per process and get a ``pid`` label.
+Snapshots of other workers can be up to ``interval_seconds`` old.
+
+When a worker exits (e.g. recycled after max_requests), its last snapshot is folded into
+``archive.json`` under a lock file, so that the summed counters never go backwards. The
+token in the file name keeps a new process reusing a pid from overwriting the snapshot
+of the dead one before it is archived.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, where the app runs in a single process
+    fcntl = None
+
+from src.datascienceproject import logger
+
+ARCHIVE_NAME = "archive.json"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _write_json(path: str, document: dict):
+    # Write then rename, so readers never see a partially written snapshot
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(document, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _empty_totals() -> dict:
+    return {"histograms": {}, "counters": {}}
+
+
+def _add(totals: dict, snapshot: dict):
+    """Add the histograms and counters of a snapshot (or of the archive) to totals."""
+    for name, series in snapshot.get("histograms", {}).items():
+        merged = totals["histograms"].setdefault(name, {})
+        for labels, counts, total in series:
+            entry = merged.setdefault(tuple(labels), {"counts": [0] * len(counts), "sum": 0.0})
+            entry["counts"] = [a + b for a, b in zip(entry["counts"], counts)]
+            entry["sum"] += total
+    for name, (help_text, value) in snapshot.get("counters", {}).items():
+        previous = totals["counters"].get(name, (help_text, 0))[1]
+        totals["counters"][name] = (help_text, previous + value)
+
+
+def _serialize_totals(totals: dict) -> dict:
+    return {
+        "histograms": {name: [[list(labels), s["counts"], s["sum"]] for labels, s in series.items()]
+                       for name, series in totals["histograms"].items()},
+        "counters": {name: list(entry) for name, entry in totals["counters"].items()},
+    }
+
+
+class SharedMetrics:
+    def __init__(self, metrics_dir, metrics: list, collector=None, interval_seconds: float = 5.0):
+        """
+        Args:
+            metrics_dir (str | Path): directory shared by the processes of the server.
+            metrics (list): the Histogram and Counter objects of this process.
+            collector (callable): returns (gauges, counters), both name -> (help text, value),
+                for metrics kept elsewhere (caches, queues...).
+            interval_seconds (float): how often each process writes its snapshot.
+        """
+        self.metrics_dir = str(metrics_dir)
+        self.metrics = list(metrics)
+        self.collector = collector
+        self.interval = float(interval_seconds)
+        self._lock = threading.Lock()
+        # Per-process state, renewed in forked children by start()
+        self._pid = None
+        self._path = None
+
+    def start(self):
+        """Start the snapshot thread of this process; cheap to call again, e.g. on every request."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._path = os.path.join(self.metrics_dir, f"{self._pid}-{uuid.uuid4().hex[:8]}.json")
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            threading.Thread(target=self._write_periodically, name="shared-metrics", daemon=True).start()
+
+    def _write_periodically(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.write()
+            except Exception as e:
+                logger.warning(f"Could not write the metrics snapshot: {str(e)}")
+
+    def snapshot(self) -> dict:
+        """Return the metrics of this process as a JSON-serializable document."""
+        gauges, counters = self.collector() if self.collector is not None else ({}, {})
+        totals = _empty_totals()
+        for metric in self.metrics:
+            if hasattr(metric, "snapshot"):
+                totals["histograms"][metric.name] = metric.snapshot()
+            else:
+                totals["counters"][metric.name] = (metric.help_text, metric.value)
+        totals["counters"].update(counters)
+        return {"pid": os.getpid(), "written_at": time.time(),
+                "gauges": {name: list(entry) for name, entry in gauges.items()}, **_serialize_totals(totals)}
+
+    def write(self):
+        """Write the snapshot of this process."""
+        self.start()
+        _write_json(self._path, self.snapshot())
+
+    @contextmanager
+    def _dir_lock(self):
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.metrics_dir, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _snapshot_files(self) -> list:
+        return [os.path.join(self.metrics_dir, name) for name in os.listdir(self.metrics_dir)
+                if name.endswith(".json") and name != ARCHIVE_NAME]
+
+    def collect(self) -> tuple:
+        """
+        Write this process' snapshot, archive the snapshots of exited processes and merge the rest.
+
+        Returns:
+            tuple: (totals, gauges) where totals has the summed "histograms" and "counters"
+                and gauges maps a gauge name to (help text, {pid: value}) for live processes
+        """
+        self.write()
+        archive_path = os.path.join(self.metrics_dir, ARCHIVE_NAME)
+        with self._dir_lock():
+            archive, live = _empty_totals(), []
+            _add(archive, _read_json(archive_path) or {})
+            archived = False
+            for path in self._snapshot_files():
+                snapshot = _read_json(path)
+                if snapshot is None:
+                    continue
+                if snapshot["pid"] == os.getpid() or _pid_alive(snapshot["pid"]):
+                    live.append(snapshot)
+                    continue
+                _add(archive, snapshot)
+                archived = True
+                os.remove(path)
+            if archived:
+                _write_json(archive_path, _serialize_totals(archive))
+
+        totals, gauges = archive, {}
+        for snapshot in live:
+            _add(totals, snapshot)
+            for name, (help_text, value) in snapshot.get("gauges", {}).items():
+                gauges.setdefault(name, (help_text, {}))[1][snapshot["pid"]] = value
+        return totals, gauges
+
+    def render(self) -> str:
+        """Render the metrics of all the processes in the Prometheus text exposition format."""
+        totals, gauges = self.collect()
+        lines = []
+        for metric in self.metrics:
+            if hasattr(metric, "snapshot"):
+                lines.extend(metric.render(totals["histograms"].get(metric.name, {})))
+        for name, (help_text, value) in totals["counters"].items():
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {value}"])
+        for name, (help_text, values) in gauges.items():
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} gauge"])
+            lines.extend(f'{name}{{pid="{pid}"}} {value}' for pid, value in sorted(values.items()))
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Remove the snapshots and archive of a previous server run; call before forking the workers."""
+        with self._dir_lock():
+            for path in self._snapshot_files() + [os.path.join(self.metrics_dir, ARCHIVE_NAME)]:
+                if os.path.exists(path):
+                    os.remove(path)
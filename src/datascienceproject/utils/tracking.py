@@ -0,0 +1,272 @@
+"""
+Non-blocking, offline-capable MLflow tracking.
+
+``MlflowTracker.log_run`` returns immediately. A background thread then creates the run,
+sends every param and metric in one ``log_batch`` call, and uploads the model artifact.
+A slow or unreachable tracking server therefore never holds up the pipeline. The thread
+is not a daemon, so the interpreter still waits for the upload before exiting; scripts
+should call ``wait_for_runs`` before returning, since libraries used by MLflow refuse
+to start thread pools once interpreter shutdown has begun.
+
+Before talking to a remote (http/https) server, the tracker checks it can be reached with
+one short request; MLflow's own client would otherwise retry for minutes. When the server
+is unreachable, or logging to it fails, the run is written to a local file store under
+``spool_dir`` and listed in ``pending.json``. Spooled runs are replayed to the server
+(params, metrics, tags and artifacts) the next time it is reachable. The id of the run
+created on the server is recorded in the spool entry before anything is logged to it, so
+a replay that fails part way is resumed in that run on the next sync, not duplicated.
+
+The tracking URI comes from the ``MLFLOW_TRACKING_URI`` environment variable when set,
+else from config.yaml; it is resolved when the tracker is created.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib import request
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
+
+from src.datascienceproject import logger
+
+
+# Threads of every run being logged in this process
+_threads = []
+
+
+def wait_for_runs(timeout: float = None):
+    """Block until every run logged in this process is sent or spooled."""
+    for thread in list(_threads):
+        thread.join(timeout)
+
+
+def resolve_tracking_uri(configured_uri: str) -> str:
+    """Return the MLflow tracking URI, the MLFLOW_TRACKING_URI environment variable taking precedence."""
+    return os.environ.get("MLFLOW_TRACKING_URI") or configured_uri
+
+
+class MlflowTracker:
+    # Serializes access to pending.json between tracker threads
+    _spool_lock = threading.Lock()
+
+    def __init__(self, tracking_uri: str, spool_dir, timeout: float = 3.0, experiment_name: str = None):
+        """
+        Args:
+            tracking_uri (str): MLflow tracking server or store; MLFLOW_TRACKING_URI overrides it.
+            spool_dir (str | Path): local file store for runs that could not be sent.
+            timeout (float): seconds to wait for the server to answer the reachability check.
+            experiment_name (str): experiment to log into. Defaults to MLFLOW_EXPERIMENT_NAME, else "Default".
+        """
+        self.tracking_uri = resolve_tracking_uri(tracking_uri)
+        self.spool_dir = str(spool_dir)
+        self.spool_uri = Path(self.spool_dir, "mlruns").resolve().as_uri()
+        self.pending_path = os.path.join(self.spool_dir, "pending.json")
+        self.timeout = timeout
+        self.experiment_name = experiment_name or os.environ.get("MLFLOW_EXPERIMENT_NAME") or "Default"
+        self._threads = []
+
+    def is_reachable(self) -> bool:
+        """Whether the tracking server answers; local stores always count as reachable."""
+        if urlparse(self.tracking_uri).scheme not in ("http", "https"):
+            return True
+        try:
+            with request.urlopen(self.tracking_uri, timeout=self.timeout):
+                return True
+        except HTTPError:
+            # Any HTTP answer (even 401/404) means the server is up
+            return True
+        except (URLError, OSError) as e:
+            logger.warning(f"Tracking server {self.tracking_uri} unreachable: {e}")
+            return False
+
+    def log_run(self, params: dict, metrics: dict, model=None, tags: dict = None) -> threading.Thread:
+        """
+        Log a run in the background.
+
+        Args:
+            params (dict): run parameters.
+            metrics (dict): final metric values.
+            model: fitted scikit-learn model to store as the run's "model" artifact.
+            tags (dict): run tags.
+
+        Returns:
+            threading.Thread: the thread logging the run (see wait)
+        """
+        thread = threading.Thread(target=self._log_run, args=(params, metrics, model, tags or {}),
+                                  name="mlflow-tracker")
+        self._threads.append(thread)
+        _threads.append(thread)
+        thread.start()
+        return thread
+
+    def wait(self, timeout: float = None):
+        """Block until the runs logged by this tracker are sent or spooled."""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _log_run(self, params, metrics, model, tags):
+        try:
+            self._send_or_spool(params, metrics, model, tags)
+        finally:
+            _threads.remove(threading.current_thread())
+
+    def _send_or_spool(self, params, metrics, model, tags):
+        start = time.perf_counter()
+        # The run created on the server, if any, so that the sync resumes it
+        remote = {}
+        if self.is_reachable():
+            try:
+                run_id = self._log_to(self.tracking_uri, params, metrics, model, tags,
+                                      on_created=lambda run_id: remote.update(remote_uri=self.tracking_uri,
+                                                                              remote_run_id=run_id))
+                logger.info(f"Run {run_id} logged to {self.tracking_uri} in {time.perf_counter() - start:.2f}s")
+                self.sync_spool()
+                return
+            except Exception as e:
+                logger.warning(f"Logging to {self.tracking_uri} failed ({str(e)}), spooling the run locally")
+        try:
+            run_id = self._log_to(self.spool_uri, params, metrics, model, tags)
+            with self._spool_lock:
+                pending = self._load_pending()
+                pending.append({"run_id": run_id, **remote})
+                self._save_pending(pending)
+            logger.info(f"Run {run_id} spooled to {self.spool_dir}, it will be synced once the server is reachable")
+        except Exception as e:
+            logger.error(f"Error while spooling run: {str(e)}")
+
+    def _client(self, uri):
+        from mlflow.tracking import MlflowClient
+
+        if uri == self.spool_uri:
+            # The spool is deliberately a file store, which recent MLflow versions only open on request
+            os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+        return MlflowClient(tracking_uri=uri)
+
+    def _experiment_id(self, client) -> str:
+        experiment = client.get_experiment_by_name(self.experiment_name)
+        if experiment is not None:
+            return experiment.experiment_id
+        return client.create_experiment(self.experiment_name)
+
+    def _existing_run(self, client, run_id):
+        """Return the run to resume, or None if it was deleted from the store."""
+        from mlflow.exceptions import MlflowException
+
+        try:
+            run = client.get_run(run_id)
+        except MlflowException as e:
+            if e.error_code == "RESOURCE_DOES_NOT_EXIST":
+                return None
+            raise
+        return None if run.info.lifecycle_stage == "deleted" else run
+
+    def _log_to(self, uri, params, metrics, model, tags, artifacts_dir=None, run_id=None, on_created=None) -> str:
+        """
+        Log a run to the given store, with one batched call for params, metrics and tags.
+
+        Args:
+            run_id (str): a run an earlier attempt created and did not finish. It is resumed:
+                only the params and metrics it lacks are logged, the artifacts are uploaded again.
+            on_created (callable): called with the id of a new run, before anything is logged to it.
+
+        Returns:
+            str: the id of the run
+        """
+        from mlflow.entities import Metric, Param, RunTag
+
+        client = self._client(uri)
+        run = self._existing_run(client, run_id) if run_id is not None else None
+        if run is not None and run.info.status == "FINISHED":
+            return run_id
+        if run is None:
+            run_id = client.create_run(self._experiment_id(client)).info.run_id
+            if on_created is not None:
+                on_created(run_id)
+        logged_params = run.data.params if run is not None else {}
+        logged_metrics = run.data.metrics if run is not None else {}
+        try:
+            timestamp = int(time.time() * 1000)
+            client.log_batch(
+                run_id,
+                metrics=[Metric(key, float(value), timestamp, 0) for key, value in metrics.items()
+                         if key not in logged_metrics],
+                params=[Param(key, str(value)) for key, value in params.items() if key not in logged_params],
+                tags=[RunTag(key, str(value)) for key, value in tags.items()],
+            )
+            if model is not None:
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    self._save_model(model, os.path.join(tmp_dir, "model"))
+                    client.log_artifacts(run_id, tmp_dir)
+            if artifacts_dir is not None:
+                client.log_artifacts(run_id, artifacts_dir)
+        except Exception:
+            client.set_terminated(run_id, status="FAILED")
+            raise
+        client.set_terminated(run_id)
+        return run_id
+
+    @staticmethod
+    def _save_model(model, path):
+        import mlflow.sklearn
+
+        # cloudpickle works without the optional skops dependency
+        mlflow.sklearn.save_model(model, path,
+                                  serialization_format=mlflow.sklearn.SERIALIZATION_FORMAT_CLOUDPICKLE)
+
+    def _load_pending(self) -> list:
+        try:
+            with open(self.pending_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+    def _save_pending(self, pending: list):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        tmp_path = self.pending_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(pending, f, indent=4)
+        os.replace(tmp_path, self.pending_path)
+
+    def sync_spool(self) -> int:
+        """
+        Replay spooled runs to the tracking server.
+
+        Returns:
+            int: number of runs synced
+        """
+        with self._spool_lock:
+            # Entries were plain run ids before the remote run was recorded
+            pending = [entry if isinstance(entry, dict) else {"run_id": entry} for entry in self._load_pending()]
+            if not pending:
+                return 0
+            local = self._client(self.spool_uri)
+            synced = 0
+            for entry in list(pending):
+                run_id = entry["run_id"]
+
+                def record_remote_run(remote_run_id, entry=entry):
+                    entry.update(remote_uri=self.tracking_uri, remote_run_id=remote_run_id)
+                    self._save_pending(pending)
+
+                # A run left unfinished on this server by an earlier attempt is resumed
+                resume_id = entry.get("remote_run_id") if entry.get("remote_uri") == self.tracking_uri else None
+                try:
+                    run = local.get_run(run_id)
+                    tags = {key: value for key, value in run.data.tags.items() if not key.startswith("mlflow.")}
+                    tags["spooled_run_id"] = run_id
+                    with tempfile.TemporaryDirectory() as tmp_dir:
+                        artifacts_dir = local.download_artifacts(run_id, "", tmp_dir)
+                        remote_id = self._log_to(self.tracking_uri, run.data.params, run.data.metrics, None,
+                                                 tags, artifacts_dir=artifacts_dir, run_id=resume_id,
+                                                 on_created=record_remote_run)
+                except Exception as e:
+                    logger.warning(f"Could not sync spooled run {run_id}: {str(e)}")
+                    break
+                pending.remove(entry)
+                self._save_pending(pending)
+                synced += 1
+                logger.info(f"Spooled run {run_id} synced to {self.tracking_uri} as {remote_id}")
+            return synced
@@ -0,0 +1,43 @@
+import os
+import sys
+
+# Tests log to stdout only, never to the tracked logs/logging.log
+os.environ.setdefault("LOG_FILE", "")
+os.environ.setdefault("MLFLOW_DISABLE_AGENT_HINT", "1")
+
+# The package is imported as src.datascienceproject, from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="session")
+def feature_columns():
+    from src.datascienceproject.pipeline.pipeline_prediction import load_feature_columns
+    return load_feature_columns()
+
+
+@pytest.fixture(scope="session")
+def wine_data(feature_columns):
+    """Synthetic (X, y) with the schema's features and a linear target."""
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0.0, 20.0, size=(600, len(feature_columns)))
+    y = X @ rng.normal(0.0, 0.2, len(feature_columns)) + 5.0 + rng.normal(0.0, 0.1, len(X))
+    return X, y
+
+
+@pytest.fixture
+def model_artifacts(tmp_path, wine_data, feature_columns):
+    """An ElasticNet fitted on wine_data, saved as model.joblib, with its scorer.npz."""
+    import joblib
+    from sklearn.linear_model import ElasticNet
+    from src.datascienceproject.utils.linear_scorer import export_linear_scorer
+
+    X, y = wine_data
+    model = ElasticNet(alpha=0.1, l1_ratio=0.5, random_state=42).fit(X[:500], y[:500])
+    model_path = tmp_path / "model.joblib"
+    scorer_path = tmp_path / "scorer.npz"
+    joblib.dump(model, model_path)
+    export_linear_scorer(model, feature_columns, scorer_path)
+    return {"model": model, "model_path": model_path, "scorer_path": scorer_path, "X_test": X[500:]}
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from src.datascienceproject.pipeline.pipeline_prediction import PredictionPipeline
+
+
+@pytest.fixture
+def pipeline(model_artifacts, feature_columns):
+    return PredictionPipeline(model_path=model_artifacts["model_path"], feature_columns=feature_columns)
+
+
+def records(X, columns):
+    return [dict(zip(columns, map(float, row))) for row in X]
+
+
+def test_records_and_columnar_payloads_give_the_same_matrix(pipeline, model_artifacts, feature_columns):
+    X = model_artifacts["X_test"][:5]
+    columnar = {col: X[:, i].tolist() for i, col in enumerate(feature_columns)}
+
+    np.testing.assert_array_equal(pipeline.batch_to_matrix(records(X, feature_columns)), X)
+    np.testing.assert_array_equal(pipeline.batch_to_matrix(columnar), X)
+
+
+def test_predict_batch_matches_the_model(pipeline, model_artifacts, feature_columns):
+    X = model_artifacts["X_test"]
+    predictions = pipeline.predict_batch(records(X, feature_columns))
+    np.testing.assert_allclose(predictions, model_artifacts["model"].predict(X))
+
+
+@pytest.mark.parametrize("payload, message", [
+    ([], "Batch is empty"),
+    ("not a batch", "Payload must be"),
+    ([1, 2], "list of objects"),
+    ({"fixed acidity": [7.0]}, "Missing columns"),
+])
+def test_invalid_payloads(pipeline, payload, message):
+    with pytest.raises(ValueError, match=message):
+        pipeline.batch_to_matrix(payload)
+
+
+def test_columnar_payload_errors(pipeline, feature_columns):
+    columnar = {col: [1.0, 2.0] for col in feature_columns}
+
+    with pytest.raises(ValueError, match="different lengths"):
+        pipeline.batch_to_matrix({**columnar, feature_columns[0]: [1.0]})
+    with pytest.raises(ValueError, match="must be lists"):
+        pipeline.batch_to_matrix({col: 1.0 for col in feature_columns})
+    with pytest.raises(ValueError, match="Non-numeric"):
+        pipeline.batch_to_matrix({**columnar, feature_columns[0]: ["a", 1.0]})
+    with pytest.raises(ValueError, match=r"rows: \[1\]"):
+        pipeline.batch_to_matrix({**columnar, feature_columns[0]: [1.0, None]})
+
+
+def test_missing_keys_in_later_records_are_reported(pipeline, feature_columns):
+    batch = records(np.ones((3, len(feature_columns))), feature_columns)
+    del batch[2][feature_columns[3]]
+    with pytest.raises(ValueError, match=r"rows: \[2\]"):
+        pipeline.batch_to_matrix(batch)
+
+
+def test_endpoint_answers_invalid_batches_with_400(feature_columns):
+    import app
+
+    client = app.app.test_client()
+    response = client.post("/predict/batch", json={col: 7.4 for col in feature_columns})
+    assert response.status_code == 400
+    assert "must be lists" in response.get_json()["error"]
+    assert client.post("/predict/batch", data="not json").status_code == 400
+
+
+def test_predict_form_errors_are_not_answered_with_200(feature_columns, monkeypatch):
+    import app
+
+    client = app.app.test_client()
+    assert client.post("/predict", data={"fixed_acidity": "7.4"}).status_code == 400
+
+    form = {name: "1.0" for name in ["fixed_acidity", "volatile_acidity", "citric_acid", "residual_sugar",
+                                     "chlorides", "free_sulfur_dioxide", "total_sulfur_dioxide", "density",
+                                     "pH", "sulphates", "alcohol"]}
+
+    def broken(data):
+        raise RuntimeError("model file is corrupted")
+    monkeypatch.setattr(app.prediction_pipeline, "prediction", broken)
+    assert client.post("/predict", data=form).status_code == 500
@@ -0,0 +1,23 @@
+import dataclasses
+
+import pytest
+
+from src.datascienceproject.config.configuration import ConfigurationManager
+
+
+def test_a_stage_mutating_its_config_does_not_affect_later_ones():
+    config = ConfigurationManager().get_model_evaluation_config()
+    config.all_params["alpha"] = -1.0
+    config.slices.clear()
+    config.all_schema.clear()
+
+    fresh = ConfigurationManager().get_model_evaluation_config()
+    assert fresh.all_params["alpha"] != -1.0
+    assert fresh.slices and fresh.all_schema
+
+
+def test_configs_are_frozen():
+    config = ConfigurationManager().get_model_trainer_config()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.alpha = 1.0
+    assert ConfigurationManager().get_model_trainer_config() == config
@@ -0,0 +1,189 @@
+import hashlib
+import io
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.datascienceproject.components import data_ingestion
+from src.datascienceproject.components.data_ingestion import DataIngestion
+from src.datascienceproject.entity.config_entity import DataIngestionConfig
+
+
+def make_zip(content: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("winequality-white.csv", content)
+    return buffer.getvalue()
+
+
+class SourceState:
+    """What the stand-in server serves, and the requests it received."""
+
+    def __init__(self, payload: bytes, etag: str):
+        self.payload = payload
+        self.etag = etag
+        self.last_modified = "Sun, 18 Oct 2026 10:00:00 GMT"
+        # (method, headers) of every request
+        self.requests = []
+        # bytes of the body sent before dropping the connection, once
+        self.fail_after = None
+        # seconds to wait before answering
+        self.delay = 0.0
+
+
+class SourceHandler(BaseHTTPRequestHandler):
+    # HTTP/1.0: the connection is closed after every response
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def _respond(self, send_body: bool):
+        state = self.server.state
+        state.requests.append((self.command, dict(self.headers)))
+        if state.delay:
+            time.sleep(state.delay)
+        if self.headers.get("If-None-Match") == state.etag:
+            self.send_response(304)
+            self.send_header("ETag", state.etag)
+            self.end_headers()
+            return
+
+        start, status = 0, 200
+        range_header, if_range = self.headers.get("Range"), self.headers.get("If-Range")
+        # A Range is honoured only if the If-Range validator still matches
+        if range_header and if_range in (None, state.etag):
+            start, status = int(range_header.split("=")[1].rstrip("-")), 206
+        body = state.payload[start:]
+        self.send_response(status)
+        self.send_header("ETag", state.etag)
+        self.send_header("Last-Modified", state.last_modified)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{len(state.payload) - 1}/{len(state.payload)}")
+        self.end_headers()
+        if not send_body:
+            return
+        if state.fail_after is not None:
+            body, state.fail_after = body[:state.fail_after], None
+        self.wfile.write(body)
+
+
+class SourceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that timed out leave the handler writing to a closed socket
+        pass
+
+
+@pytest.fixture
+def source():
+    server = SourceServer(("127.0.0.1", 0), SourceHandler)
+    server.state = SourceState(make_zip(b"a;b\n" + b"1;2\n" * 5000), '"v1"')
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.state.url = f"http://127.0.0.1:{server.server_address[1]}/data.zip"
+    yield server.state
+    server.shutdown()
+    server.server_close()
+
+
+def ingestion(tmp_path, url, sha256=""):
+    return DataIngestion(DataIngestionConfig(root_dir=str(tmp_path), source_URL=url,
+                                             local_data_file=str(tmp_path / "data.zip"), unzip_dir=str(tmp_path),
+                                             source_sha256=sha256, ingestion_mode="extract"))
+
+
+def methods(state):
+    return [method for method, _ in state.requests]
+
+
+def test_full_download_is_verified_and_recorded(tmp_path, source):
+    sha256 = hashlib.sha256(source.payload).hexdigest()
+    component = ingestion(tmp_path, source.url, sha256=sha256)
+    component.download_file()
+
+    assert (tmp_path / "data.zip").read_bytes() == source.payload
+    assert not (tmp_path / "data.zip.part").exists()
+    meta = component._load_meta()
+    assert (meta["etag"], meta["sha256"], meta["size"]) == ('"v1"', sha256, len(source.payload))
+    assert methods(source) == ["GET"]
+
+
+def test_unchanged_source_costs_one_conditional_head(tmp_path, source):
+    ingestion(tmp_path, source.url).download_file()
+    source.requests.clear()
+
+    ingestion(tmp_path, source.url).download_file()
+    assert methods(source) == ["HEAD"]
+    assert source.requests[0][1]["If-None-Match"] == '"v1"'
+
+
+def test_changed_source_is_downloaded_again(tmp_path, source):
+    ingestion(tmp_path, source.url).download_file()
+    source.payload, source.etag = make_zip(b"a;b\n3;4\n"), '"v2"'
+    source.requests.clear()
+
+    ingestion(tmp_path, source.url).download_file()
+    assert methods(source) == ["HEAD", "GET"]
+    assert (tmp_path / "data.zip").read_bytes() == source.payload
+
+
+def test_interrupted_download_resumes_with_range(tmp_path, source):
+    source.fail_after = len(source.payload) // 3
+    ingestion(tmp_path, source.url).download_file()
+
+    assert (tmp_path / "data.zip").read_bytes() == source.payload
+    first, resumed = source.requests
+    assert "Range" not in first[1]
+    assert resumed[1]["Range"] == f"bytes={len(source.payload) // 3}-"
+    assert resumed[1]["If-Range"] == '"v1"'
+
+
+def test_mismatched_if_range_restarts_from_the_beginning(tmp_path, source):
+    # A partial download of an older version of the file
+    old_payload = make_zip(b"old;data\n" * 3000)
+    (tmp_path / "data.zip.part").write_bytes(old_payload[:1000])
+    component = ingestion(tmp_path, source.url, sha256=hashlib.sha256(source.payload).hexdigest())
+    component._save_meta({"url": source.url, "partial_etag": '"v0"'})
+
+    component.download_file()
+    assert source.requests[0][1]["If-Range"] == '"v0"'
+    assert (tmp_path / "data.zip").read_bytes() == source.payload
+
+
+def test_checksum_mismatch_is_rejected(tmp_path, source):
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        ingestion(tmp_path, source.url, sha256="0" * 64).download_file()
+    assert not (tmp_path / "data.zip").exists()
+    assert not (tmp_path / "data.zip.part").exists()
+
+
+def test_timeout_keeps_the_verified_local_copy(tmp_path, source, monkeypatch):
+    ingestion(tmp_path, source.url).download_file()
+    monkeypatch.setattr(data_ingestion, "TIMEOUT_SECONDS", 0.2)
+    source.delay = 1.0
+
+    component = ingestion(tmp_path, source.url)
+    assert component.is_up_to_date()
+    component.download_file()
+    assert (tmp_path / "data.zip").read_bytes() == source.payload
+
+
+def test_timeout_without_a_local_copy_fails(tmp_path, source, monkeypatch):
+    monkeypatch.setattr(data_ingestion, "TIMEOUT_SECONDS", 0.2)
+    monkeypatch.setattr(data_ingestion, "MAX_RETRIES", 2)
+    source.delay = 1.0
+
+    with pytest.raises(OSError):
+        ingestion(tmp_path, source.url).download_file()
+    assert methods(source) == ["GET", "GET"]
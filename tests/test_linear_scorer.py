@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import ElasticNet, SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeRegressor
+
+from src.datascienceproject.pipeline.pipeline_prediction import PredictionPipeline
+from src.datascienceproject.utils.linear_scorer import (LinearScorer, check_parity, export_linear_scorer,
+                                                        load_linear_scorer)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("model", [
+    ElasticNet(alpha=0.1, l1_ratio=0.5, random_state=42),
+    Pipeline([("scaler", StandardScaler()),
+              ("model", SGDRegressor(penalty="elasticnet", alpha=0.01, l1_ratio=0.5, random_state=42))]),
+    Pipeline([("scaler", StandardScaler(with_mean=False)), ("model", ElasticNet(alpha=0.1))]),
+], ids=["elasticnet", "scaler_sgd", "scaler_without_mean"])
+def test_exported_scorer_matches_predict_on_held_out_rows(tmp_path, wine_data, feature_columns, model):
+    X, y = wine_data
+    model.fit(X[:500], y[:500])
+    export_linear_scorer(model, feature_columns, tmp_path / "scorer.npz")
+    scorer = load_linear_scorer(tmp_path / "scorer.npz", feature_columns=feature_columns)
+
+    np.testing.assert_allclose(scorer.predict(X[500:]), model.predict(X[500:]), rtol=1e-9, atol=1e-9)
+    assert check_parity(model, scorer, X[500:]) < 1e-9
+
+
+def test_loading_checks_the_feature_order(model_artifacts, feature_columns):
+    with pytest.raises(ValueError, match="exported for columns"):
+        load_linear_scorer(model_artifacts["scorer_path"], feature_columns=feature_columns[::-1])
+
+
+def test_non_linear_models_are_not_exported(tmp_path, wine_data, feature_columns):
+    X, y = wine_data
+    with pytest.raises(ValueError, match="not a single-output linear model"):
+        export_linear_scorer(DecisionTreeRegressor().fit(X, y), feature_columns, tmp_path / "scorer.npz")
+    assert not (tmp_path / "scorer.npz").exists()
+
+
+def test_parity_failures_are_reported(model_artifacts, feature_columns):
+    model = model_artifacts["model"]
+    wrong = LinearScorer(model.coef_, model.intercept_ + 1.0, feature_columns)
+    with pytest.raises(ValueError):
+        check_parity(model, wrong, model_artifacts["X_test"])
+
+
+def test_prediction_with_the_scorer_does_not_import_sklearn(model_artifacts):
+    code = (
+        "import sys, numpy as np\n"
+        "from src.datascienceproject.pipeline.pipeline_prediction import PredictionPipeline\n"
+        f"pipeline = PredictionPipeline(model_path={str(model_artifacts['model_path'])!r}, "
+        f"scorer_path={str(model_artifacts['scorer_path'])!r})\n"
+        "print(pipeline.prediction(np.ones((2, 11)))[0])\n"
+        "assert 'sklearn' not in sys.modules, 'sklearn was imported'\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True,
+                            env={**os.environ, "PYTHONPATH": ROOT_DIR, "LOG_CONSOLE": "0"})
+    assert result.returncode == 0, result.stderr
+    expected = model_artifacts["model"].predict(np.ones((1, 11)))[0]
+    assert float(result.stdout.split()[-1]) == pytest.approx(expected)
+
+
+def set_mtime(path, seconds):
+    os.utime(path, ns=(seconds * 10**9, seconds * 10**9))
+
+
+def test_scorer_is_picked_up_once_exported(model_artifacts, feature_columns):
+    os.remove(model_artifacts["scorer_path"])
+    pipeline = PredictionPipeline(model_path=model_artifacts["model_path"], feature_columns=feature_columns,
+                                  scorer_path=model_artifacts["scorer_path"])
+    assert pipeline.model_cache is pipeline.joblib_cache
+
+    export_linear_scorer(model_artifacts["model"], feature_columns, model_artifacts["scorer_path"])
+    assert pipeline.model_cache is pipeline.scorer_cache
+    assert isinstance(pipeline.model, LinearScorer)
+
+
+def test_removed_scorer_falls_back_to_the_model(model_artifacts, feature_columns):
+    pipeline = PredictionPipeline(model_path=model_artifacts["model_path"], feature_columns=feature_columns,
+                                  scorer_path=model_artifacts["scorer_path"])
+    assert isinstance(pipeline.model, LinearScorer)
+
+    os.remove(model_artifacts["scorer_path"])
+    assert isinstance(pipeline.model, ElasticNet)
+    # The old coefficients are dropped, not kept as a fallback
+    assert pipeline.scorer_cache.signature is None
+
+
+def test_scorer_older_than_the_model_is_not_used(model_artifacts, feature_columns, wine_data):
+    X, y = wine_data
+    pipeline = PredictionPipeline(model_path=model_artifacts["model_path"], feature_columns=feature_columns,
+                                  scorer_path=model_artifacts["scorer_path"])
+    pipeline.prediction(X[:1])
+
+    # Retrained model, but the scorer export did not happen (yet)
+    retrained = ElasticNet(alpha=1.0).fit(X, y * 2)
+    joblib.dump(retrained, model_artifacts["model_path"])
+    set_mtime(model_artifacts["scorer_path"], 1_700_000_000)
+    set_mtime(model_artifacts["model_path"], 1_700_000_100)
+
+    np.testing.assert_allclose(pipeline.prediction(X[500:]), retrained.predict(X[500:]))
+    assert pipeline.model_cache is pipeline.joblib_cache
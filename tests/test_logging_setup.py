@@ -0,0 +1,38 @@
+import logging
+import os
+
+import pytest
+
+from src.datascienceproject.utils.logging_setup import configure_logging
+
+
+@pytest.fixture
+def log_settings(monkeypatch):
+    monkeypatch.delenv("LOG_FILE", raising=False)
+    yield
+    monkeypatch.undo()
+    configure_logging()
+
+
+def flush_and_close():
+    # Reconfiguring drains the queue and closes the file handlers
+    configure_logging({"file": None, "console": False})
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+@pytest.mark.parametrize("use_async", [True, False])
+def test_pid_placeholder_gives_each_process_its_own_file(tmp_path, log_settings, use_async):
+    configure_logging({"file": str(tmp_path / "app-{pid}.log"), "async": use_async, "console": False})
+    logging.getLogger("test").warning("from the parent")
+
+    pid = os.fork()
+    if pid == 0:
+        logging.getLogger("test").warning("from the child")
+        flush_and_close()
+        os._exit(0)
+    os.waitpid(pid, 0)
+    flush_and_close()
+
+    assert "from the parent" in (tmp_path / f"app-{os.getpid()}.log").read_text()
+    child_log = (tmp_path / f"app-{pid}.log").read_text()
+    assert "from the child" in child_log and "from the parent" not in child_log
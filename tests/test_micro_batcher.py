@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.datascienceproject.utils.micro_batcher import MicroBatcher
+
+
+class RecordingModel:
+    """Scores the sum of 2-feature rows, records the batch sizes and rejects rows containing -1."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def __call__(self, matrix):
+        with self.lock:
+            self.batch_sizes.append(len(matrix))
+        if matrix.shape[1] != 2:
+            raise ValueError(f"expected 2 features, got {matrix.shape[1]}")
+        if (matrix == -1).any():
+            raise ValueError("bad row")
+        return matrix.sum(axis=1)
+
+
+def predict_concurrently(batcher, rows):
+    """Submit all the rows at once and return (predictions or exceptions) in order."""
+    futures = [batcher.submit(row) for row in rows]
+    return [future.exception(timeout=5) or future.result() for future in futures]
+
+
+def test_concurrent_rows_are_scored_together():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=8, max_wait_us=200_000)
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda i: batcher.predict_one([i, 1.0]), range(8)))
+    assert results == [i + 1.0 for i in range(8)]
+    assert max(model.batch_sizes) > 1
+    stats = batcher.stats()
+    assert stats["rows"] == 8 and stats["batches"] == len(model.batch_sizes)
+
+
+def test_batches_are_capped_at_max_batch_size():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=3, max_wait_us=200_000)
+    assert predict_concurrently(batcher, [[i, 0.0] for i in range(7)]) == list(range(7))
+    assert max(model.batch_sizes) <= 3
+
+
+def test_a_failing_row_only_fails_its_own_request():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=4, max_wait_us=200_000)
+    results = predict_concurrently(batcher, [[1.0, 1.0], [-1.0, 0.0], [2.0, 2.0], [3.0, 0.0]])
+
+    assert isinstance(results[1], ValueError)
+    assert [results[0], results[2], results[3]] == [2.0, 4.0, 3.0]
+    # One batch call, then each row again
+    assert model.batch_sizes[0] == 4 and model.batch_sizes[1:] == [1, 1, 1, 1]
+
+
+def test_rows_of_the_wrong_width_only_fail_their_own_request():
+    batcher = MicroBatcher(RecordingModel(), max_batch_size=2, max_wait_us=200_000)
+    results = predict_concurrently(batcher, [[1.0, 1.0], [1.0, 1.0, 1.0]])
+    assert results[0] == 2.0
+    assert isinstance(results[1], Exception)
+
+
+def test_short_results_fail_every_request_instead_of_hanging():
+    batcher = MicroBatcher(lambda matrix: matrix.sum(axis=1)[:-1], max_batch_size=3, max_wait_us=200_000)
+    results = predict_concurrently(batcher, [[1.0], [2.0], [3.0]])
+    assert all(isinstance(result, ValueError) for result in results)
+    assert "2 predictions for 3 rows" in str(results[0])
+
+
+def test_predict_one_times_out():
+    release = threading.Event()
+
+    def slow_model(matrix):
+        release.wait(5)
+        return matrix.sum(axis=1)
+
+    batcher = MicroBatcher(slow_model, max_batch_size=1)
+    try:
+        with pytest.raises(TimeoutError):
+            batcher.predict_one([1.0], timeout=0.05)
+    finally:
+        release.set()
+    assert batcher.predict_one([1.0]) == 1.0
+
+
+def test_invalid_batch_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        MicroBatcher(np.sum, max_batch_size=0)
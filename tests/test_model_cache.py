@@ -0,0 +1,109 @@
+import functools
+import os
+import threading
+
+import pytest
+
+from src.datascienceproject.utils.model_cache import ModelCache, get_model_cache
+
+
+def write_artifact(path, content: str):
+    # Rename into place like the trainer does, so the inode changes with every write
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def read_text(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_loads_once_and_counts_hits(tmp_path):
+    path = tmp_path / "model.txt"
+    write_artifact(path, "v1")
+    cache = ModelCache(path, loader=read_text)
+
+    assert [cache.get() for _ in range(3)] == ["v1"] * 3
+    stats = cache.stats()
+    assert (stats["loads"], stats["misses"], stats["hits"]) == (1, 1, 2)
+    assert stats["loaded"] and stats["last_load_seconds"] >= 0
+
+
+def test_reloads_a_rewritten_artifact(tmp_path):
+    path = tmp_path / "model.txt"
+    write_artifact(path, "v1")
+    cache = ModelCache(path, loader=read_text)
+    cache.get()
+    first_signature = cache.signature
+
+    write_artifact(path, "version 2")
+    assert cache.get() == "version 2"
+    assert cache.signature != first_signature
+    assert cache.stats()["loads"] == 2
+
+
+def test_keeps_the_last_model_when_the_artifact_is_missing(tmp_path):
+    path = tmp_path / "model.txt"
+    cache = ModelCache(path, loader=read_text)
+    with pytest.raises(FileNotFoundError):
+        cache.get()
+
+    write_artifact(path, "v1")
+    cache.get()
+    os.remove(path)
+    assert cache.get() == "v1"
+
+
+def test_invalidate_forces_a_reload(tmp_path):
+    path = tmp_path / "model.txt"
+    write_artifact(path, "v1")
+    cache = ModelCache(path, loader=read_text)
+    cache.get()
+    cache.invalidate()
+    assert cache.signature is None
+    cache.get()
+    assert cache.stats()["loads"] == 2
+
+
+def test_concurrent_readers_share_one_load(tmp_path):
+    path = tmp_path / "model.txt"
+    write_artifact(path, "v1")
+    started = threading.Event()
+
+    def slow_loader(p):
+        started.wait(1)
+        return read_text(p)
+
+    cache = ModelCache(path, loader=slow_loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["v1"] * 8
+    assert cache.stats()["loads"] == 1
+
+
+def test_get_model_cache_is_shared_per_path_and_loader(tmp_path):
+    path = tmp_path / "model.txt"
+    write_artifact(path, "v1")
+    assert get_model_cache(path, loader=read_text) is get_model_cache(str(path), loader=read_text)
+    assert get_model_cache(path) is not get_model_cache(tmp_path / "other.txt")
+
+    # A different loader of the same path gets its own cache, not the first caller's loader
+    assert get_model_cache(path, loader=read_text) is not get_model_cache(path)
+    upper = functools.partial(read_text_as, case="upper")
+    assert get_model_cache(path, loader=upper).get() == "V1"
+    assert get_model_cache(path, loader=read_text).get() == "v1"
+    # Equal partials, e.g. created by each PredictionPipeline, share a cache
+    assert get_model_cache(path, loader=functools.partial(read_text_as, case="upper")) is \
+        get_model_cache(path, loader=upper)
+
+
+def read_text_as(path, case):
+    return getattr(read_text(path), case)()
@@ -0,0 +1,114 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from src.datascienceproject.pipeline.pipeline_prediction import PredictionPipeline
+from src.datascienceproject.utils.instrumentation import render_prometheus
+from src.datascienceproject.utils.prediction_cache import PredictionCache
+
+
+class CountingModel:
+    """Scores the sum of each row and records the rows it was asked to score."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, matrix):
+        self.calls.append(np.array(matrix))
+        return matrix.sum(axis=1)
+
+
+def rows(*values):
+    return np.array([[value, 1.0] for value in values])
+
+
+def test_only_distinct_missing_rows_are_scored():
+    cache, model = PredictionCache(), CountingModel()
+    np.testing.assert_array_equal(cache.predict(rows(1, 2, 1), model, "v1"), [2, 3, 2])
+    np.testing.assert_array_equal(model.calls[0], rows(1, 2))
+
+    np.testing.assert_array_equal(cache.predict(rows(2, 3), model, "v1"), [3, 4])
+    np.testing.assert_array_equal(model.calls[1], rows(3))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 4, 3)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache, model = PredictionCache(max_entries=2), CountingModel()
+    cache.predict(rows(1, 2), model, "v1")
+    cache.predict(rows(1), model, "v1")
+    cache.predict(rows(3), model, "v1")
+
+    cache.predict(rows(1, 2), model, "v1")
+    # 2 was the least recently used entry when 3 came in
+    np.testing.assert_array_equal(model.calls[-1], rows(2))
+    assert cache.stats()["evictions"] == 2
+
+
+def test_entries_expire(monkeypatch):
+    from src.datascienceproject.utils import prediction_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now[0])
+    cache, model = PredictionCache(ttl_seconds=10), CountingModel()
+    cache.predict(rows(1), model, "v1")
+    now[0] += 5
+    cache.predict(rows(1), model, "v1")
+    assert len(model.calls) == 1
+
+    now[0] += 10
+    cache.predict(rows(1), model, "v1")
+    assert len(model.calls) == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_quantized_keys_share_an_entry():
+    cache, model = PredictionCache(decimals=2), CountingModel()
+    first = cache.predict(rows(1.001), model, "v1")
+    assert cache.predict(rows(1.004), model, "v1")[0] == first[0]
+    assert len(model.calls) == 1
+    assert cache.keys(rows(1.004)) != PredictionCache().keys(rows(1.004))
+
+
+def test_both_signs_of_zero_share_a_key():
+    cache = PredictionCache()
+    assert cache.keys(np.array([[-0.0, 1.0]])) == cache.keys(np.array([[0.0, 1.0]]))
+
+
+def test_a_new_signature_drops_every_entry():
+    cache, model = PredictionCache(), CountingModel()
+    cache.predict(rows(1, 2), model, "v1")
+    cache.predict(rows(1), model, "v2")
+    assert len(model.calls) == 2
+    stats = cache.stats()
+    assert (stats["entries"], stats["invalidations"]) == (1, 1)
+
+
+def test_invalid_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        PredictionCache(max_entries=0)
+
+
+def test_removing_the_scorer_drops_its_predictions(model_artifacts, feature_columns, wine_data):
+    X, y = wine_data
+    pipeline = PredictionPipeline(model_path=model_artifacts["model_path"], feature_columns=feature_columns,
+                                  scorer_path=model_artifacts["scorer_path"])
+    cache = pipeline.enable_prediction_cache()
+    pipeline.prediction(X[:5])
+
+    # The scorer is removed, e.g. because the retrained model is not linear anymore
+    retrained = DecisionTreeRegressor(max_depth=3).fit(X, y)
+    joblib.dump(retrained, model_artifacts["model_path"])
+    os.remove(model_artifacts["scorer_path"])
+
+    np.testing.assert_allclose(pipeline.prediction(X[:5]), retrained.predict(X[:5]))
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_cache_counters_are_exposed_as_counters():
+    body = render_prometheus([], gauges={"entries": ("Entries", 3)}, counters={"hits": ("Hits", 7)})
+    assert "# TYPE entries gauge\nentries 3" in body
+    assert "# TYPE hits counter\nhits 7" in body
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.datascienceproject.utils.instrumentation import Counter, Histogram
+from src.datascienceproject.utils.shared_metrics import SharedMetrics
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER_SCRIPT = """
+import sys
+from src.datascienceproject.utils.instrumentation import Counter, Histogram
+from src.datascienceproject.utils.shared_metrics import SharedMetrics
+
+latency, rows = Histogram("latency_seconds", "Latency", labelnames=("endpoint",)), Counter("rows_total", "Rows")
+latency.observe(0.002, "/predict")
+rows.inc(5)
+metrics = SharedMetrics(sys.argv[1], [latency, rows],
+                        collector=lambda: ({"queue_size": ("Queued", 7)}, {"cache_hits": ("Hits", 2)}))
+metrics.write()
+print("written", flush=True)
+sys.stdin.readline()
+"""
+
+
+def make_metrics(metrics_dir):
+    latency, rows = Histogram("latency_seconds", "Latency", labelnames=("endpoint",)), Counter("rows_total", "Rows")
+    latency.observe(0.3, "/predict")
+    rows.inc(1)
+    return SharedMetrics(metrics_dir, [latency, rows],
+                         collector=lambda: ({"queue_size": ("Queued", 1)}, {"cache_hits": ("Hits", 10)}))
+
+
+@pytest.fixture
+def worker(tmp_path):
+    """A second process that wrote its metrics and waits for a line on stdin to exit."""
+    process = subprocess.Popen([sys.executable, "-c", WORKER_SCRIPT, str(tmp_path)], cwd=ROOT_DIR,
+                               env={**os.environ, "PYTHONPATH": ROOT_DIR, "LOG_CONSOLE": "0"},
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    assert process.stdout.readline().strip() == "written"
+    yield process
+    stop(process)
+
+
+def stop(process):
+    if process.returncode is None:
+        process.communicate("\n", timeout=30)
+
+
+def test_counters_and_histograms_are_summed_over_processes(tmp_path, worker):
+    body = make_metrics(tmp_path).render()
+    assert "rows_total 6.0" in body
+    assert "cache_hits 12" in body
+    assert 'latency_seconds_count{endpoint="/predict"} 2' in body
+    assert 'latency_seconds_bucket{endpoint="/predict",le="0.0025"} 1' in body
+    assert "# TYPE cache_hits counter" in body
+
+
+def test_gauges_are_labelled_by_process(tmp_path, worker):
+    body = make_metrics(tmp_path).render()
+    assert f'queue_size{{pid="{os.getpid()}"}} 1' in body
+    assert f'queue_size{{pid="{worker.pid}"}} 7' in body
+
+
+def test_exited_processes_are_archived(tmp_path, worker):
+    metrics = make_metrics(tmp_path)
+    stop(worker)
+
+    body = metrics.render()
+    assert "rows_total 6.0" in body
+    assert f'pid="{worker.pid}"' not in body
+    assert sorted(str(path) for path in tmp_path.glob("*.json")) == sorted([str(tmp_path / "archive.json"),
+                                                                            metrics._path])
+    # Archived once, not added again on the next scrape
+    assert "rows_total 6.0" in metrics.render()
+
+
+def test_reset_forgets_previous_runs(tmp_path, worker):
+    stop(worker)
+    metrics = make_metrics(tmp_path)
+    metrics.render()
+    metrics.reset()
+    assert not list(tmp_path.glob("*.json"))
+    assert "rows_total 1.0" in metrics.render()
+
+
+def test_every_counter_served_by_the_app_ends_in_total(monkeypatch):
+    import re
+
+    import app
+
+    monkeypatch.setattr(app.prediction_pipeline, "prediction_cache", None)
+    app.prediction_pipeline.enable_prediction_cache()
+    body = app.app.test_client().get("/metrics").get_data(as_text=True)
+
+    counters = re.findall(r"^# TYPE (\S+) counter$", body, flags=re.MULTILINE)
+    assert "prediction_cache_hits_total" in counters and "model_cache_loads_total" in counters
+    assert [name for name in counters if not name.endswith("_total")] == []
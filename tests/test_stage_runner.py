@@ -0,0 +1,253 @@
+import pytest
+import yaml
+
+from src.datascienceproject.config.configuration import ConfigurationManager
+from src.datascienceproject.constant import CONFIG_FILE_PATH
+from src.datascienceproject.pipeline.stage_runner import StageRunner
+from src.datascienceproject.pipeline.stages import Stage, get_stage
+from src.datascienceproject.utils.common import read_yaml
+from src.datascienceproject.utils.data_io import split_files
+
+# Names of the stages run, in order, across a test
+RUNS = []
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def write(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+
+
+class SourcePipeline:
+    def run(self, config=None, context=None):
+        RUNS.append("source")
+        files = config.config.files
+        write(files.a, f"value={config.config.source.value}")
+        if config.config.source.get("extra"):
+            write(files.extra, "extra")
+        return {"a": config.config.source.value}
+
+
+class DerivedPipeline:
+    def run(self, config=None, context=None):
+        RUNS.append("derived")
+        write(config.config.files.b, f"{read(config.config.files.a)} alpha={config.params.model.alpha}")
+        return {}
+
+
+STAGES = [
+    Stage(name="source", pipeline_cls=SourcePipeline, method_name="run", config_keys=["source"],
+          output_files=lambda config: [config.files.a, config.files.extra]),
+    Stage(name="derived", pipeline_cls=DerivedPipeline, method_name="run", depends_on=["source"],
+          params_keys=["model"], uses_schema=True,
+          input_files=lambda config: [config.files.a],
+          output_files=lambda config: [config.files.b]),
+]
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Write config, params and schema files under tmp_path; returns a function running the stages."""
+    RUNS.clear()
+    config = {
+        "artifacts_root": str(tmp_path / "artifacts"),
+        "pipeline_manifest": str(tmp_path / "manifest.json"),
+        "profiling": {"profile_dir": str(tmp_path / "profiles")},
+        "source": {"value": 1, "extra": False},
+        "files": {name: str(tmp_path / f"{name}.txt") for name in ("a", "b", "extra")},
+    }
+    paths = {name: tmp_path / f"{name}.yaml" for name in ("config", "params", "schema")}
+
+    def save(config=config, params={"model": {"alpha": 0.1}}):
+        write(paths["config"], yaml.safe_dump(config))
+        write(paths["params"], yaml.safe_dump(params))
+        write(paths["schema"], yaml.safe_dump({"COLUMNS": {"x": "float64"}, "TARGET_COLUMN": {"name": "x"}}))
+
+    def run(stages=STAGES, force=False, **kwargs):
+        RUNS.clear()
+        manager = ConfigurationManager(paths["config"], paths["params"], paths["schema"])
+        report = StageRunner(stages, config_manager=manager, **kwargs).run(force=force)
+        return {entry["stage"]: entry for entry in report}
+
+    save()
+    return {"config": config, "save": save, "run": run, "tmp_path": tmp_path}
+
+
+def statuses(report):
+    return {name: entry["status"] for name, entry in report.items()}
+
+
+def test_unchanged_stages_are_reused(project):
+    assert statuses(project["run"]()) == {"source": "ran", "derived": "ran"}
+    report = project["run"]()
+    assert statuses(report) == {"source": "reused", "derived": "reused"}
+    assert report["derived"]["reason"] == "inputs and outputs unchanged"
+    assert RUNS == []
+
+
+def test_a_config_change_reruns_the_stage_and_its_dependents(project):
+    project["run"]()
+    project["config"]["source"]["value"] = 2
+    project["save"]()
+
+    report = project["run"]()
+    assert statuses(report) == {"source": "ran", "derived": "ran"}
+    assert report["source"]["reason"] == "inputs changed: ['config:source']"
+    assert "file:" in report["derived"]["reason"]
+    assert read(project["config"]["files"]["b"]) == "value=2 alpha=0.1"
+
+
+def test_a_params_change_reruns_only_the_stage_using_it(project):
+    project["run"]()
+    project["save"](params={"model": {"alpha": 0.5}})
+
+    report = project["run"]()
+    assert statuses(report) == {"source": "reused", "derived": "ran"}
+    assert report["derived"]["reason"] == "inputs changed: ['params:model']"
+
+
+def test_missing_or_modified_outputs_rerun_the_stage(project, tmp_path):
+    project["run"]()
+    (tmp_path / "b.txt").unlink()
+    report = project["run"]()
+    assert report["derived"]["status"] == "ran"
+    assert report["derived"]["reason"].startswith("outputs missing")
+
+    write(tmp_path / "b.txt", "edited by hand")
+    report = project["run"]()
+    assert report["derived"]["reason"] == "outputs modified"
+
+
+def test_declared_outputs_the_stage_did_not_write_are_optional(project, tmp_path):
+    project["run"]()
+    assert not (tmp_path / "extra.txt").exists()
+    assert project["run"]()["source"]["status"] == "reused"
+
+    # Once written, such an output is required like the others
+    project["config"]["source"]["extra"] = True
+    project["save"]()
+    project["run"]()
+    (tmp_path / "extra.txt").unlink()
+    assert project["run"]()["source"]["reason"].startswith("outputs missing")
+
+
+def test_force_reruns_everything(project):
+    project["run"]()
+    report = project["run"](force=True)
+    assert statuses(report) == {"source": "ran", "derived": "ran"}
+    assert {entry["reason"] for entry in report.values()} == {"forced"}
+
+
+def test_split_files_lists_everything_save_split_writes(tmp_path):
+    import pandas as pd
+    from src.datascienceproject.utils.data_io import save_split
+
+    df = pd.DataFrame({"x": [1.0, 2.0], "y": [3.0, 4.0]})
+    for artifact_format in ("npy", "csv"):
+        directory = tmp_path / artifact_format
+        directory.mkdir()
+        save_split(df, directory / "train", artifact_format, "y", export_csv=True)
+        assert sorted(split_files(directory / "train", artifact_format, export_csv=True)) == \
+            sorted(str(path) for path in directory.iterdir())
+
+
+def test_training_stages_declare_every_file_they_write():
+    config = read_yaml(str(CONFIG_FILE_PATH))
+    training = config.model_training
+
+    transformation_outputs = get_stage("Data Transformation Stage").output_files(config)
+    for stem in (training.train_data_path, training.test_data_path):
+        assert set(split_files(stem, config.artifact_format)) <= set(transformation_outputs)
+    assert set(get_stage("Model Training Stage").input_files(config)) <= set(transformation_outputs)
+
+    training_outputs = get_stage("Model Training Stage").output_files(config)
+    for name in (training.model_name, training.scorer_name, training.leaderboard_name, training.cv_report_name,
+                 training.streaming_report_name):
+        assert f"{training.root_dir}/{name}" in training_outputs
+
+
+def pipeline_class(name, work=lambda config, context: {}):
+    """A stage pipeline class recording its run in RUNS and returning work's outputs."""
+    def run(self, config=None, context=None):
+        RUNS.append(name)
+        return work(config, context)
+    return type(f"{name.title()}Pipeline", (), {"run": run})
+
+
+def stage(name, work=lambda config, context: {}, depends_on=()):
+    return Stage(name=name, pipeline_cls=pipeline_class(name, work), method_name="run", depends_on=list(depends_on))
+
+
+def test_stages_start_after_their_dependencies(project):
+    stages = [stage("last", depends_on=["middle"]), stage("middle", depends_on=["first"]), stage("first")]
+    report = project["run"](stages, force=True)
+    assert RUNS == ["first", "middle", "last"]
+    # The report keeps the declaration order
+    assert list(report) == ["last", "middle", "first"]
+
+
+def test_independent_stages_run_concurrently(project):
+    import threading
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_the_other(config, context):
+        # Only passes if both stages are running at the same time
+        barrier.wait()
+        return {}
+
+    stages = [stage("left", wait_for_the_other), stage("right", wait_for_the_other),
+              stage("join", depends_on=["left", "right"])]
+    report = project["run"](stages, force=True, max_workers=2)
+    assert statuses(report) == {"left": "ran", "right": "ran", "join": "ran"}
+    assert RUNS[-1] == "join"
+
+
+def test_outputs_are_handed_to_downstream_stages_in_memory(project):
+    received = {}
+    stages = [stage("split", lambda config, context: {"train": [1, 2, 3]}),
+              stage("fit", lambda config, context: received.update(context) or {}, depends_on=["split"])]
+    project["run"](stages, force=True)
+    assert received == {"train": [1, 2, 3]}
+
+
+def test_a_failing_stage_stops_its_dependents(project):
+    def fail(config, context):
+        raise RuntimeError("boom")
+
+    stages = [stage("broken", fail), stage("after", depends_on=["broken"])]
+    manager = ConfigurationManager(*(project["tmp_path"] / f"{name}.yaml" for name in ("config", "params", "schema")))
+    ended = []
+    with pytest.raises(RuntimeError, match="boom"):
+        StageRunner(stages, config_manager=manager).run(on_stage_end=ended.append)
+    assert RUNS == ["broken"]
+    assert [(entry["stage"], entry["status"]) for entry in ended] == [("broken", "failed")]
+
+
+@pytest.mark.parametrize("stages, message", [
+    ([stage("a", depends_on=["missing"])], "unknown stages"),
+    ([stage("a", depends_on=["b"]), stage("b", depends_on=["a"])], "Dependency cycle"),
+])
+def test_invalid_graphs_are_rejected(project, stages, message):
+    with pytest.raises(ValueError, match=message):
+        project["run"](stages)
+
+
+@pytest.mark.parametrize("mode", ["extract", "stream"])
+def test_stages_and_configs_read_the_dataset_from_the_same_file(tmp_path, mode):
+    from src.datascienceproject.constant import PARAMS_FILE_PATH, SCHEMA_FILE_PATH
+
+    config = read_yaml(str(CONFIG_FILE_PATH)).to_dict()
+    config["data_ingestion"]["ingestion_mode"] = mode
+    write(tmp_path / "config.yaml", yaml.safe_dump(config))
+    manager = ConfigurationManager(tmp_path / "config.yaml", PARAMS_FILE_PATH, SCHEMA_FILE_PATH)
+
+    validation_input = get_stage("Data Validation Stage").input_files(manager.config)[0]
+    transformation_input = get_stage("Data Transformation Stage").input_files(manager.config)[0]
+    assert validation_input == manager.get_data_validation_config().unzip_data_dir
+    assert transformation_input == manager.get_data_transformation_config().data_path
+    assert (validation_input == config["data_ingestion"]["local_data_file"]) == (mode == "stream")
@@ -0,0 +1,89 @@
+import socket
+
+import pytest
+
+from src.datascienceproject.config.configuration import ConfigurationManager
+from src.datascienceproject.utils.tracking import MlflowTracker
+
+
+def test_tracking_uri_is_read_from_the_environment_when_the_tracker_is_built(tmp_path, monkeypatch):
+    monkeypatch.delenv("MLFLOW_TRACKING_URI", raising=False)
+    config = ConfigurationManager().get_model_evaluation_config()
+    assert MlflowTracker(config.mlflow_uri, tmp_path).tracking_uri == config.mlflow_uri
+
+    # Same YAML files: the cached config is reused, the new environment still applies
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", "file:///tmp/mlruns")
+    config = ConfigurationManager().get_model_evaluation_config()
+    assert MlflowTracker(config.mlflow_uri, tmp_path).tracking_uri == "file:///tmp/mlruns"
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """An unreachable server, a file:// store standing in for a reachable one, and a spool directory."""
+    monkeypatch.delenv("MLFLOW_TRACKING_URI", raising=False)
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return {"unreachable": f"http://127.0.0.1:{port}", "remote": (tmp_path / "remote").as_uri(),
+            "spool_dir": tmp_path / "spool"}
+
+
+def spool_a_run(stores):
+    tracker = MlflowTracker(stores["unreachable"], stores["spool_dir"], timeout=0.5)
+    tracker.log_run(params={"alpha": 0.1}, metrics={"rmse": 0.5}, tags={"stage": "evaluation"})
+    tracker.wait()
+    return tracker
+
+
+def remote_runs(stores):
+    from mlflow.tracking import MlflowClient
+
+    client = MlflowClient(tracking_uri=stores["remote"])
+    experiment = client.get_experiment_by_name("Default")
+    return client.search_runs([experiment.experiment_id]) if experiment is not None else []
+
+
+def test_runs_are_spooled_while_the_server_is_unreachable(stores):
+    tracker = spool_a_run(stores)
+    pending = tracker._load_pending()
+    assert len(pending) == 1 and "remote_run_id" not in pending[0]
+
+    run = tracker._client(tracker.spool_uri).get_run(pending[0]["run_id"])
+    assert run.data.params == {"alpha": "0.1"} and run.data.metrics == {"rmse": 0.5}
+    assert run.data.tags["stage"] == "evaluation"
+
+
+def test_spooled_runs_are_replayed_once(stores):
+    spooled_id = spool_a_run(stores)._load_pending()[0]["run_id"]
+    tracker = MlflowTracker(stores["remote"], stores["spool_dir"])
+    assert tracker.sync_spool() == 1
+    assert tracker.sync_spool() == 0
+
+    [run] = remote_runs(stores)
+    assert run.info.status == "FINISHED"
+    assert run.data.params == {"alpha": "0.1"} and run.data.metrics == {"rmse": 0.5}
+    assert run.data.tags["spooled_run_id"] == spooled_id
+    assert tracker._load_pending() == []
+
+
+def test_a_failed_replay_resumes_the_same_run(stores, monkeypatch):
+    from mlflow.tracking import MlflowClient
+
+    spool_a_run(stores)
+    tracker = MlflowTracker(stores["remote"], stores["spool_dir"])
+
+    def upload_fails(self, run_id, local_dir, artifact_path=None):
+        raise ConnectionError("connection reset")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(MlflowClient, "log_artifacts", upload_fails)
+        assert tracker.sync_spool() == 0
+    [failed] = remote_runs(stores)
+    assert failed.info.status == "FAILED"
+    assert tracker._load_pending()[0]["remote_run_id"] == failed.info.run_id
+
+    assert tracker.sync_spool() == 1
+    [run] = remote_runs(stores)
+    assert run.info.run_id == failed.info.run_id and run.info.status == "FINISHED"
+    assert run.data.metrics == {"rmse": 0.5}
@@ -0,0 +1,176 @@
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import Future
+
+import pytest
+
+from src.datascienceproject.pipeline import stage_runner, training_jobs
+from src.datascienceproject.pipeline.training_jobs import TrainingJobManager, run_training_job
+
+
+class PendingExecutor:
+    """Stands in for the worker process: jobs stay queued until the test finishes them."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Returns a function creating TrainingJobManagers that share tmp_path, as server workers do."""
+    monkeypatch.setattr(TrainingJobManager, "_get_executor", lambda self: self.__dict__.setdefault(
+        "_pending", PendingExecutor()))
+    return lambda: TrainingJobManager(tmp_path)
+
+
+def update_status(manager, job_id, **fields):
+    status = manager.status(job_id)
+    status.update(fields)
+    training_jobs._write_status(manager._status_path(job_id), status)
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_a_second_worker_gets_the_active_job(manager):
+    first, second = manager(), manager()
+    job_id, created = first.submit()
+    assert created
+    assert first.status(job_id)["status"] == "queued"
+
+    assert second.submit() == (job_id, False)
+    update_status(first, job_id, status="running", pid=os.getpid())
+    assert second.submit() == (job_id, False)
+
+
+def test_a_new_job_starts_once_the_previous_one_finished(manager):
+    first, second = manager(), manager()
+    job_id, _ = first.submit()
+    update_status(first, job_id, status="succeeded")
+
+    new_job_id, created = second.submit()
+    assert created and new_job_id != job_id
+
+
+def test_jobs_left_by_dead_processes_are_not_active(manager, tmp_path):
+    first, second = manager(), manager()
+    job_id, _ = first.submit()
+    # The worker process was killed mid-run
+    update_status(first, job_id, status="running", pid=dead_pid())
+    assert second.submit()[1]
+
+    # The web worker that queued the job exited before the job started
+    marker = json.loads((tmp_path / "active_job.json").read_text())
+    update_status(first, marker["job_id"], status="queued")
+    marker["submitter_pid"] = dead_pid()
+    (tmp_path / "active_job.json").write_text(json.dumps(marker))
+    assert first.submit()[1]
+
+
+class FakeStageRunner:
+    """Reports every training stage as ran, except the one named in fail_at."""
+
+    fail_at = None
+
+    def __init__(self):
+        self.config = {}
+
+    def run(self, force=False, on_stage_start=None, on_stage_end=None):
+        from src.datascienceproject.pipeline.stages import TRAINING_STAGES
+
+        for stage in TRAINING_STAGES:
+            on_stage_start(stage.name)
+            if stage.name == self.fail_at:
+                raise RuntimeError(f"{stage.name} failed")
+            on_stage_end({"stage": stage.name, "status": "ran", "reason": "forced", "duration_seconds": 0.1})
+
+
+@pytest.fixture
+def queued_job(manager, monkeypatch):
+    """Submit a job and return a function running it in this process with FakeStageRunner."""
+    monkeypatch.setattr(stage_runner, "StageRunner", FakeStageRunner)
+    jobs = manager()
+    job_id, _ = jobs.submit()
+
+    def run(fail_at=None):
+        monkeypatch.setattr(FakeStageRunner, "fail_at", fail_at)
+        run_training_job(job_id, jobs._status_path(job_id))
+        return jobs.status(job_id)
+    return run
+
+
+def test_a_job_records_the_progress_of_every_stage(queued_job):
+    status = queued_job()
+    assert status["status"] == "succeeded"
+    assert status["completed_stages"] == status["total_stages"]
+    assert {stage["status"] for stage in status["stages"]} == {"succeeded"}
+    assert status["current_stage"] is None and status["duration_seconds"] >= 0
+
+
+def test_a_failing_stage_is_recorded_in_the_status(queued_job):
+    from src.datascienceproject.pipeline.stages import TRAINING_STAGES
+
+    failing = TRAINING_STAGES[1].name
+    status = queued_job(fail_at=failing)
+    assert status["status"] == "failed"
+    assert status["error"] == f"{failing} failed"
+    assert "RuntimeError" in status["traceback"]
+    assert status["completed_stages"] == 1
+
+
+def test_train_endpoints(manager, monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, "training_jobs", manager())
+    client = app.app.test_client()
+    response = client.post("/train")
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    response = client.post("/train")
+    assert response.status_code == 409
+    assert response.get_json()["job_id"] == job_id
+    assert client.get(f"/train/{job_id}").get_json()["status"] == "queued"
+    assert client.get("/train/unknown0").status_code == 404
+
+
+def test_unknown_job_ids_have_no_status(manager):
+    assert manager().status("../config") is None
+    assert manager().status("abc123") is None
+
+
+SUBMIT_SCRIPT = """
+import sys, time
+from concurrent.futures import Future
+from src.datascienceproject.pipeline.training_jobs import TrainingJobManager
+
+class PendingExecutor:
+    def submit(self, fn, *args):
+        return Future()
+
+TrainingJobManager._get_executor = lambda self: PendingExecutor()
+print(TrainingJobManager(sys.argv[1]).submit()[1], flush=True)
+# Stay alive, the job stays queued in this process
+time.sleep(2)
+"""
+
+
+@pytest.mark.skipif(training_jobs.fcntl is None, reason="needs fcntl")
+def test_concurrent_submissions_from_several_processes_start_one_job(tmp_path):
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": root_dir, "LOG_CONSOLE": "0"}
+    processes = [subprocess.Popen([sys.executable, "-c", SUBMIT_SCRIPT, str(tmp_path)], cwd=root_dir, env=env,
+                                  stdout=subprocess.PIPE, text=True) for _ in range(4)]
+    created = [process.communicate(timeout=60)[0].split()[-1] for process in processes]
+    assert sorted(created) == ["False", "False", "False", "True"]
+    assert len(list(tmp_path.glob("*.json"))) == 2